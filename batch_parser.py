@@ -0,0 +1,165 @@
+"""
+Multi-process parsing of CardMarket pages.
+Spreads page parsing over a pool of processes so parsing is not limited to
+one core by the GIL, sending page HTML in and columnar listing batches back.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from data_parser import DataParser
+from listing import ListingBatch
+from stage_timer import StageTimer
+
+
+@dataclass
+class ParsedPage:
+    """Outcome of parsing one page in a worker process."""
+
+    key: Any
+    listings: ListingBatch = field(default_factory=ListingBatch)
+    layout: str = 'no_table'
+    seconds: float = 0.0
+    output: str = ''
+
+
+# Parser of the current worker process, created by _init_worker
+_worker_parser: Optional[DataParser] = None
+
+
+def _init_worker(backend: str):
+    """Create the worker's parser."""
+    global _worker_parser
+    _worker_parser = DataParser(backend)
+
+
+def _parse_in_worker(html: bytes) -> Tuple[ListingBatch, str, float, str]:
+    """
+    Parse one page in a worker process.
+
+    The parser's messages (layout changes, rows it could not parse) are
+    captured and sent back with the result, so the parent prints them next
+    to the card they belong to instead of the workers writing over each other.
+
+    Args:
+        html: Page HTML, UTF-8 encoded
+
+    Returns:
+        Tuple of (listings, layout, parse seconds, parser output)
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        listings, layout = _worker_parser.parse_page(html.decode('utf-8'))
+    return listings, layout, time.perf_counter() - start, output.getvalue()
+
+
+class BatchParser:
+    """
+    Parses pages on a pool of worker processes.
+
+    Listings are identical to DataParser's. The pool is started on first use
+    with the 'spawn' method, so it is safe next to the scraper's browser and
+    HTTP threads. Each page's parse time is measured in its worker and
+    recorded on the timer as the 'parse' stage.
+    """
+
+    def __init__(self, processes: int = 0, backend: str = 'html.parser',
+                 timer: Optional[StageTimer] = None):
+        """
+        Args:
+            processes: Number of worker processes (0 for one per CPU core)
+            backend: Parser backend used by the workers (see DataParser)
+            timer: Stage timer to record per-page parse times on
+        """
+        self.processes = processes if processes > 0 else (os.cpu_count() or 1)
+        self.backend = backend
+        self.timer = timer or StageTimer()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _submit(self, html: str) -> Future:
+        """Hand one page to the pool, starting it if needed."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.processes, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker, initargs=(self.backend,))
+            return self._executor.submit(_parse_in_worker, (html or '').encode('utf-8'))
+
+    def _collect(self, key: Any, future: Future) -> ParsedPage:
+        """Wait for a submitted page, print the parser's messages and record its parse time."""
+        try:
+            listings, layout, seconds, output = future.result()
+        except Exception as e:
+            print(f"    ⚠️ Parse worker failed: {e}")
+            return ParsedPage(key)
+
+        print(output, end='')
+        self.timer.record('parse', seconds)
+        return ParsedPage(key, listings, layout, seconds, output)
+
+    def parse_page(self, html_content: str) -> Tuple[ListingBatch, str]:
+        """
+        Parse one page on the pool, blocking the calling thread only.
+
+        Same contract as DataParser.parse_page, so several scraping threads
+        can parse on separate cores at the same time.
+
+        Args:
+            html_content: Raw HTML content from the page
+
+        Returns:
+            Tuple of (listings, layout)
+        """
+        parsed = self._collect(None, self._submit(html_content))
+        return parsed.listings, parsed.layout
+
+    def iter_parse(self, pages: Iterable[Tuple[Any, str]]) -> Iterator[ParsedPage]:
+        """
+        Parse many pages on the pool, yielding results in input order.
+
+        At most a few pages per process are in flight, so pages can come
+        from a generator without all of them being held in memory.
+
+        Args:
+            pages: (key, HTML) pairs; the key identifies the page in the result
+
+        Yields:
+            ParsedPage per input page, in the same order
+        """
+        window = self.processes * 4
+        pending = deque()
+        for key, html_content in pages:
+            pending.append((key, self._submit(html_content)))
+            if len(pending) >= window:
+                yield self._collect(*pending.popleft())
+        while pending:
+            yield self._collect(*pending.popleft())
+
+    def parse_batch(self, pages: Iterable[Tuple[Any, str]]) -> List[ParsedPage]:
+        """
+        Parse many pages on the pool.
+
+        Args:
+            pages: (key, HTML) pairs, e.g. (card name, page HTML)
+
+        Returns:
+            ParsedPage per input page, in input order, with its parse seconds
+        """
+        return list(self.iter_parse(pages))
+
+    def close(self):
+        """Shut the worker processes down."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,277 @@
+"""
+Offline end-to-end benchmark for the CardMarket scraper.
+Serves saved product pages from a local stand-in server with configurable
+latency and runs CardScraper against synthetic card lists of several sizes.
+
+HOW TO RUN:
+    python benchmark.py <pages_dir> [--sizes 10,100,1000] [--latency 0.05] [--jitter 0.02]
+
+To build a corpus from pages fetched by earlier runs:
+    python benchmark.py <pages_dir> --from-cache page_cache
+
+Each size runs in its own process, so peak RSS is measured per size. Results
+are printed as a table and saved to output/YYYY-MM-DD/benchmark_HHMMSS.json.
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+from urllib.parse import unquote, urlparse
+
+import yaml
+
+from local_cardmarket_server import LocalCardMarketServer
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as 0
+    resource = None
+
+
+def export_cache_pages(cache_dir: str, pages_dir: str) -> int:
+    """
+    Write every page in a page cache to a corpus directory as <card>.html.
+
+    Args:
+        cache_dir: Page cache directory of earlier runs
+        pages_dir: Corpus directory to write to
+
+    Returns:
+        Number of pages written
+    """
+    from page_cache import PageCache
+
+    cache = PageCache(cache_dir)
+    os.makedirs(pages_dir, exist_ok=True)
+    written = 0
+    try:
+        for url in cache.urls():
+            cached = cache.get(url)
+            card_name = os.path.basename(unquote(urlparse(url).path).rstrip('/'))
+            if not cached or not card_name:
+                continue
+            with open(os.path.join(pages_dir, f"{card_name}.html"), 'w', encoding='utf-8') as file:
+                file.write(cached[0])
+            written += 1
+    finally:
+        cache.close()
+    return written
+
+
+def build_card_list(size: int, base_url: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a synthetic card list configuration.
+
+    Args:
+        size: Number of cards
+        base_url: Stand-in server base URL
+        settings: Extra list settings (fetcher, workers, ...)
+
+    Returns:
+        Card list configuration dictionary
+    """
+    config = {
+        'name': f"benchmark_{size}",
+        'base_url': base_url,
+        'wait_time': 0,
+        'resume': False,
+        'cache_ttl_hours': 0,
+        'cards': {f"Bench-Card-{index:05d}": {'set': 'Bench-Set'} for index in range(size)},
+    }
+    config.update(settings)
+    return config
+
+
+def run_size(config_file: str, rate: float, verbose: bool, results) -> None:
+    """
+    Scrape one synthetic list and report throughput, peak RSS and stage times.
+
+    Runs in a child process so ru_maxrss only covers this list.
+
+    Args:
+        config_file: Synthetic card list to scrape
+        rate: Requests per second allowed by the rate limiter
+        verbose: Keep the scraper's output
+        results: Queue to put the measurement on
+    """
+    from card_scraper import CardScraper
+    from rate_limiter import AdaptiveRateLimiter
+
+    limiter = AdaptiveRateLimiter(initial_rate=rate, min_rate=rate, max_rate=rate, burst=max(1, int(rate)))
+    scraper = CardScraper(rate_limiter=limiter)
+
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+        start_time = time.perf_counter()
+        success = scraper.scrape_cards_from_config(config_file)
+        elapsed = time.perf_counter() - start_time
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    peak_rss_mb = peak_rss / 1024 / 1024 if sys.platform == 'darwin' else peak_rss / 1024
+
+    results.put({
+        'success': success,
+        'seconds': round(elapsed, 3),
+        'failed_pages': len(scraper.failed_urls),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'stages': scraper.timer.summary(),
+    })
+
+
+def run_benchmark(pages_dir: str, sizes: List[int], latency: float, jitter: float,
+                  settings: Dict[str, Any], rate: float, verbose: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run the scraper end to end against the stand-in server for each list size.
+
+    Args:
+        pages_dir: Corpus of saved product pages
+        sizes: Card list sizes to run
+        latency: Server response delay in seconds
+        jitter: Random extra delay of up to +/- this many seconds
+        settings: Extra list settings (fetcher, workers, ...)
+        rate: Requests per second allowed by the rate limiter
+        verbose: Show the scraper's own output
+
+    Returns:
+        One result dictionary per size
+    """
+    pages_dir = os.path.abspath(pages_dir)
+    work_dir = tempfile.mkdtemp(prefix="cardmarket_bench_")
+    original_dir = os.getcwd()
+    measurements = []
+
+    server = LocalCardMarketServer(pages_dir, latency=latency, jitter=jitter, cycle=True)
+    try:
+        server.start()
+        # Workbooks, journals and the page cache go to a scratch directory
+        os.chdir(work_dir)
+        for size in sizes:
+            config = build_card_list(size, server.base_url, settings)
+            config_file = os.path.join(work_dir, f"benchmark_{size}.yaml")
+            with open(config_file, 'w', encoding='utf-8') as file:
+                yaml.safe_dump(config, file)
+
+            print(f"🏁 Scraping {size} cards...")
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_size, args=(config_file, rate, verbose, results))
+            process.start()
+            measurement = None
+            try:
+                while measurement is None and process.is_alive():
+                    try:
+                        measurement = results.get(timeout=1)
+                    except queue.Empty:
+                        continue
+                if measurement is None and not results.empty():
+                    measurement = results.get()
+            except KeyboardInterrupt:
+                process.terminate()
+                raise
+            process.join()
+
+            if measurement is None:
+                print(f"   ❌ Benchmark process for {size} cards exited with code {process.exitcode}")
+                continue
+
+            measurement['cards'] = size
+            measurement['cards_per_second'] = round(size / measurement['seconds'], 2) \
+                if measurement['seconds'] else 0.0
+            measurements.append(measurement)
+            print(f"   {measurement['cards_per_second']:.2f} cards/s, "
+                  f"peak RSS {measurement['peak_rss_mb']:.0f} MB")
+    finally:
+        os.chdir(original_dir)
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return measurements
+
+
+def print_report(measurements: List[Dict[str, Any]]):
+    """Print the benchmark results as a table."""
+    print(f"\n📊 Benchmark results:")
+    print(f"  {'cards':>6}{'seconds':>10}{'cards/s':>10}{'peak MB':>10}{'failed':>8}  "
+          f"{'fetch p50':>10}{'parse p50':>10}{'parse p95':>10}")
+    for measurement in measurements:
+        stages = measurement['stages']
+        fetch = stages.get('fetch', {})
+        parse = stages.get('parse', {})
+        print(f"  {measurement['cards']:>6}{measurement['seconds']:>10.2f}"
+              f"{measurement['cards_per_second']:>10.2f}{measurement['peak_rss_mb']:>10.0f}"
+              f"{measurement['failed_pages']:>8}  {fetch.get('p50', 0):>10.3f}"
+              f"{parse.get('p50', 0):>10.3f}{parse.get('p95', 0):>10.3f}")
+
+
+def save_report(measurements: List[Dict[str, Any]], options: Dict[str, Any]) -> str:
+    """
+    Save the benchmark results as JSON in today's output folder.
+
+    Args:
+        measurements: Results from run_benchmark
+        options: Benchmark options to record with the results
+
+    Returns:
+        Path of the report
+    """
+    now = datetime.now()
+    output_dir = os.path.join("output", now.strftime("%Y-%m-%d"))
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"benchmark_{now.strftime('%H%M%S')}.json")
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'started_at': now.isoformat(timespec='seconds'), 'options': options,
+                   'results': measurements}, file, indent=2)
+    print(f"\n📈 Benchmark saved to {path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the CardMarket scraper")
+    parser.add_argument('pages_dir', help="Directory of saved product pages (.html)")
+    parser.add_argument('--sizes', default="10,100,1000", help="Comma separated card list sizes")
+    parser.add_argument('--latency', type=float, default=0.05, help="Server response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.02, help="Random extra delay (+/- seconds)")
+    parser.add_argument('--fetcher', default='http', choices=['http', 'selenium'])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--browser', default='launch', choices=['attach', 'launch'],
+                        help="Browser mode for the selenium fetcher")
+    parser.add_argument('--rate', type=float, default=1000,
+                        help="Requests per second allowed by the rate limiter")
+    parser.add_argument('--from-cache', metavar='CACHE_DIR',
+                        help="First export the pages of this page cache into pages_dir")
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's output")
+    args = parser.parse_args()
+
+    if args.from_cache:
+        print(f"💾 Exported {export_cache_pages(args.from_cache, args.pages_dir)} cached pages "
+              f"to {args.pages_dir}")
+
+    if not os.path.isdir(args.pages_dir) or not LocalCardMarketServer.list_pages(args.pages_dir):
+        print(f"❌ No saved pages (.html) found in {args.pages_dir}")
+        sys.exit(1)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    settings = {'fetcher': args.fetcher, 'workers': args.workers, 'browser': args.browser}
+    print(f"🧪 Benchmark: {len(LocalCardMarketServer.list_pages(args.pages_dir))} saved pages, "
+          f"latency {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms, "
+          f"{args.fetcher} fetcher, {args.workers} worker(s)")
+
+    measurements = run_benchmark(args.pages_dir, sizes, args.latency, args.jitter,
+                                 settings, args.rate, args.verbose)
+    print_report(measurements)
+    save_report(measurements, {**vars(args), 'sizes': sizes})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+In-browser listing extraction for the CardMarket scraper.
+Reads the article rows inside the page with JavaScript and returns compact
+listing records, so the full page source never crosses the WebDriver wire.
+"""
+
+import threading
+from typing import Optional
+
+from data_parser import DataParser
+from listing import LISTING_FIELDS, ListingBatch
+
+
+# Port of DataParser's row extraction. Class lookups use exact attribute
+# matches to behave like BeautifulSoup's class_='a b c' and every field
+# mirrors the same field in DataParser._parse_single_row. Returns null when
+# the listing table is missing or the script itself fails, so the caller
+# falls back to the page source and the parser can tell a page without a
+# listing table from a card without offers.
+LISTING_EXTRACTION_SCRIPT = r"""
+try {
+    function text(el) {
+        var parts = [];
+        var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            var value = walker.currentNode.nodeValue.trim();
+            if (value) { parts.push(value); }
+        }
+        return parts.join('');
+    }
+    function byClass(root, tag, classes) {
+        return root.querySelector(tag + '[class="' + classes + '"]');
+    }
+    function attr(el, name) {
+        var value = el.getAttribute(name);
+        return value === null ? '' : value;
+    }
+    function containsAny(value, words) {
+        value = value.toLowerCase();
+        return words.some(function (word) { return value.indexOf(word) !== -1; });
+    }
+
+    var container = document.querySelector('main[class~="container"]');
+    var mainContent = container && container.querySelector('div#mainContent');
+    var tableSection = mainContent && mainContent.querySelector('section#table');
+    var tableDiv = tableSection && byClass(tableSection, 'div', 'table article-table table-striped');
+    var tableBody = tableDiv && tableDiv.querySelector('div[class~="table-body"]');
+    if (!tableBody) { return null; }
+
+    var rows = Array.prototype.filter.call(tableBody.querySelectorAll('div[id]'), function (el) {
+        return /articleRow\d+/.test(el.id);
+    });
+
+    var listings = [];
+    rows.forEach(function (row) {
+        try {
+            var result = {
+                seller_username: '', seller_sales_count: 0, condition: '',
+                condition_badge: '', language: '', edition: '', price: '', quantity: 1
+            };
+
+            var seller = byClass(row, 'div', 'col-seller col-12 col-lg-auto');
+            var sellerInfo = seller && byClass(seller, 'span', 'seller-info d-flex align-items-center');
+            if (sellerInfo) {
+                var badges = Array.prototype.filter.call(sellerInfo.querySelectorAll('span[class]'), function (el) {
+                    return attr(el, 'class').indexOf('sell-count') !== -1;
+                });
+                salesLoop:
+                for (var b = 0; b < badges.length; b++) {
+                    var sources = [attr(badges[b], 'data-bs-original-title'), text(badges[b])];
+                    for (var s = 0; s < sources.length; s++) {
+                        var sales = sources[s] && sources[s].match(/(\d+)/);
+                        if (sales) { result.seller_sales_count = parseInt(sales[1], 10); break salesLoop; }
+                    }
+                }
+
+                var links = sellerInfo.querySelectorAll('a');
+                for (var l = 0; l < links.length; l++) {
+                    var href = attr(links[l], 'href');
+                    var linkText = text(links[l]);
+                    if (href.indexOf('/Users/') !== -1) {
+                        var user = href.match(/\/Users\/([^\/?]+)/);
+                        if (user) { result.seller_username = user[1]; break; }
+                    }
+                    if (linkText && linkText.length > 2) { result.seller_username = linkText; break; }
+                }
+            }
+
+            var product = byClass(row, 'div', 'col-product col-12 col-lg');
+            var attributes = product && byClass(product, 'div', 'product-attributes col');
+            if (attributes) {
+                var titled = attributes.querySelectorAll('[data-bs-original-title]');
+                for (var c = 0; c < titled.length; c++) {
+                    var title = attr(titled[c], 'data-bs-original-title');
+                    if (containsAny(title, ['mint', 'played', 'damaged', 'excellent', 'good', 'poor'])) {
+                        result.condition = title;
+                        result.condition_badge = text(titled[c]);
+                        break;
+                    }
+                }
+
+                var labelled = attributes.querySelectorAll('[aria-label]');
+                for (var g = 0; g < labelled.length; g++) {
+                    var ariaLabel = attr(labelled[g], 'aria-label');
+                    var dataTitle = attr(labelled[g], 'data-bs-original-title');
+                    if (ariaLabel && ariaLabel.length > 2) { result.language = ariaLabel; break; }
+                    if (dataTitle && dataTitle.length > 2 && !containsAny(dataTitle, ['mint', 'played', 'damaged'])) {
+                        result.language = dataTitle;
+                        break;
+                    }
+                }
+
+                for (var e = 0; e < titled.length && !result.edition; e++) {
+                    if (containsAny(attr(titled[e], 'data-bs-original-title'), ['first edition']) ||
+                            containsAny(attr(titled[e], 'aria-label'), ['first edition'])) {
+                        result.edition = '1st';
+                    }
+                }
+                var hovers = attributes.querySelectorAll('span[onmouseover]');
+                for (var h = 0; h < hovers.length && !result.edition; h++) {
+                    if (containsAny(attr(hovers[h], 'onmouseover'), ['first edition'])) {
+                        result.edition = '1st';
+                    }
+                }
+            }
+
+            var offer = byClass(row, 'div', 'col-offer col-auto');
+            if (offer) {
+                var priceSpan = byClass(offer, 'span', 'color-primary small text-end text-nowrap fw-bold');
+                if (priceSpan) {
+                    var priceText = text(priceSpan);
+                    var price = priceText.match(/([\d,\.]+)/);
+                    result.price = price ? price[1] : priceText.replace(/€/g, '').trim();
+                }
+                var amount = byClass(offer, 'div', 'amount-container d-none d-md-flex justify-content-end me-3');
+                var countSpan = amount && byClass(amount, 'span', 'item-count small text-end');
+                var quantity = countSpan && text(countSpan).match(/(\d+)/);
+                if (quantity) { result.quantity = parseInt(quantity[1], 10); }
+            }
+
+            listings.push(result);
+        } catch (rowError) {
+            // Same as DataParser: a broken row is skipped
+        }
+    });
+    return listings;
+} catch (error) {
+    return null;
+}
+"""
+
+
+class BrowserExtraction:
+    """
+    Shared state for in-browser extraction during a run.
+
+    Every parity_check_every-th page (and the first one) is also parsed from
+    the page source with BeautifulSoup. If the two disagree, in-browser
+    extraction is switched off for the rest of the run and the BeautifulSoup
+    result is used.
+    """
+
+    def __init__(self, data_parser: DataParser, parity_check_every: int = 10):
+        self.data_parser = data_parser
+        self.parity_check_every = max(1, parity_check_every)
+        self.enabled = True
+        self._pages = 0
+        self._lock = threading.Lock()
+
+    def needs_parity_check(self) -> bool:
+        """Count a page and tell whether it should be cross-checked."""
+        with self._lock:
+            self._pages += 1
+            return (self._pages - 1) % self.parity_check_every == 0
+
+    def verify(self, listings: ListingBatch, html_content: str) -> Optional[ListingBatch]:
+        """
+        Compare in-browser listings with the BeautifulSoup parse of the same page.
+
+        Args:
+            listings: Listings returned by the extraction script
+            html_content: Page source of the same page
+
+        Returns:
+            None if they match, otherwise the BeautifulSoup listings to use instead
+        """
+        expected = self.data_parser.parse_page_data(html_content)
+        if listings == expected:
+            print(f"    🔍 Parity check passed ({len(listings)} listings)")
+            return None
+
+        with self._lock:
+            self.enabled = False
+        print(f"    ⚠️ Parity check failed: browser extraction found {len(listings)} listings, "
+              f"BeautifulSoup found {len(expected)}")
+        for index, (got, want) in enumerate(zip(listings, expected)):
+            if got != want:
+                fields = [key for key in LISTING_FIELDS if got[key] != want[key]]
+                print(f"    ⚠️ First difference in listing {index + 1}: {', '.join(fields)}")
+                break
+        print(f"    ⚠️ Falling back to BeautifulSoup parsing for the rest of the run")
+        return expected
@@ -1,12 +1,18 @@
 import pandas as pd
 import numpy as np
+import itertools
 import os
 from pathlib import Path
 import re
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable
 from difflib import SequenceMatcher
 from datetime import datetime
 import warnings
+from openpyxl import load_workbook
+
+from excel_exporter import HEADER_ROW
+from listing import ListingBatch, listing_price_cents, parse_price_cents
+from snapshot_history import NOT_SCRAPED_MARKER, SCRAPE_FAILED_MARKER
 
 warnings.filterwarnings('ignore')
 
@@ -27,34 +33,17 @@ class CardPriceAnalyzer:
         """
         Convert euro price string to float
 
+        Only needed for workbooks written before prices were stored in
+        cents (the price_cents column).
+
         Args:
             price_str: Price string like "265,00" or "1.234,56"
 
         Returns:
-            float: Price as decimal number
+            float: Price as decimal number, 0.0 if it cannot be read
         """
-        if pd.isna(price_str) or price_str == '':
-            return 0.0
-
-        # Convert to string and clean
-        price_str = str(price_str).strip()
-
-        # Handle European number format (comma as decimal separator)
-        # Remove any currency symbols
-        price_str = re.sub(r'[€$£]', '', price_str)
-
-        # If there's both dot and comma, dot is thousands separator
-        if '.' in price_str and ',' in price_str:
-            price_str = price_str.replace('.', '')
-            price_str = price_str.replace(',', '.')
-        elif ',' in price_str:
-            # Only comma - it's the decimal separator
-            price_str = price_str.replace(',', '.')
-
-        try:
-            return float(price_str)
-        except ValueError:
-            return 0.0
+        cents = parse_price_cents(price_str)
+        return cents / 100 if cents is not None else 0.0
 
     def analyze_card_data(self, df: pd.DataFrame, card_name: str) -> Dict[str, Any]:
         """
@@ -71,6 +60,19 @@ class CardPriceAnalyzer:
         print(f"\n--- Debugging sheet: {card_name} ---")
         print(f"Sheet shape: {df.shape}")
 
+        # A failed scrape says nothing about availability, keep it apart from empty cards
+        marker = df.iloc[0, 0] if df.shape[0] and df.shape[1] else None
+        if isinstance(marker, str) and marker.startswith(SCRAPE_FAILED_MARKER):
+            print(f"Scrape failed for {card_name}, no listing data: {marker}")
+            analysis = self._empty_card_analysis(card_name)
+            analysis['scrape_failed'] = True
+            return analysis
+        if isinstance(marker, str) and marker.startswith(NOT_SCRAPED_MARKER):
+            print(f"{card_name} was not scraped yet, no listing data: {marker}")
+            analysis = self._empty_card_analysis(card_name)
+            analysis['not_scraped'] = True
+            return analysis
+
         # Skip header rows and get actual data
         if len(df) < 5:
             print(f"Sheet too small (less than 5 rows), skipping {card_name}")
@@ -94,6 +96,7 @@ class CardPriceAnalyzer:
         # Find relevant columns (case insensitive)
         language_col = None
         price_col = None
+        cents_col = None
         quantity_col = None
 
         print("Looking for columns containing:")
@@ -103,6 +106,9 @@ class CardPriceAnalyzer:
             if 'language' in col_lower:
                 language_col = col
                 print(f"    Found LANGUAGE column: {col}")
+            elif col_lower == 'price_cents':
+                cents_col = col
+                print(f"    Found PRICE CENTS column: {col}")
             elif 'price' in col_lower:
                 price_col = col
                 print(f"    Found PRICE column: {col}")
@@ -119,12 +125,121 @@ class CardPriceAnalyzer:
         # Clean the data
         data_df = data_df.dropna(subset=[language_col, price_col, quantity_col])
 
-        # Convert prices
-        data_df['price_numeric'] = data_df[price_col].apply(self.parse_euro_price)
+        # Convert prices: whole cents when the sheet has them, else parse the text
+        if cents_col:
+            data_df['price_numeric'] = pd.to_numeric(data_df[cents_col], errors='coerce').fillna(0) / 100
+        else:
+            data_df['price_numeric'] = data_df[price_col].apply(self.parse_euro_price)
 
         # Convert quantities
         data_df['quantity_numeric'] = pd.to_numeric(data_df[quantity_col], errors='coerce').fillna(0)
 
+        return self._analyze_offers(data_df, card_name, language_col)
+
+    def analyze_listings(self, listings: Iterable[Any], card_name: str) -> Dict[str, Any]:
+        """
+        Analyze a card straight from its listings, e.g. DataParser.parse_page or iter_listings
+
+        A ListingBatch is read column by column; other listings are consumed
+        one at a time and only their language, price and quantity are kept.
+        Gives the same result as analyzing the card's exported sheet.
+
+        Args:
+            listings: ListingBatch, or Listing records or listing dictionaries
+                (any iterable, including generators)
+            card_name: Name of the card
+
+        Returns:
+            Dict containing analysis results
+        """
+        if isinstance(listings, ListingBatch):
+            offers = zip(listings.language, listings.price, listings.price_cents, listings.quantity)
+        else:
+            offers = ((listing.get('language'), listing.get('price'), listing_price_cents(listing),
+                       listing.get('quantity')) for listing in listings)
+
+        languages, cents, quantities = [], [], []
+        for language, price, price_cents, quantity in offers:
+            # Blank cells are dropped from sheets, skip the same listings here
+            if any(value is None or value == '' for value in (language, price, quantity)):
+                continue
+            languages.append(language)
+            cents.append(price_cents)
+            quantities.append(quantity)
+
+        data_df = pd.DataFrame({
+            'language': pd.Series(languages, dtype=object),
+            'price_numeric': pd.Series(cents, dtype=float).fillna(0) / 100,
+            'quantity_numeric': pd.to_numeric(pd.Series(quantities, dtype=object), errors='coerce').fillna(0),
+        })
+        return self._analyze_offers(data_df, card_name, 'language')
+
+    def analyze_sheet(self, worksheet, card_name: str) -> Dict[str, Any]:
+        """
+        Analyze a card's sheet row by row through analyze_listings
+
+        Rows are read from the (read-only) worksheet as the analysis consumes
+        them, so only the card's language, price and quantity values are kept.
+        Columns are matched like analyze_card_data does.
+
+        Args:
+            worksheet: Worksheet of a workbook opened with load_workbook(read_only=True)
+            card_name: Name of the card
+
+        Returns:
+            Dict containing analysis results
+        """
+        rows = worksheet.iter_rows(values_only=True)
+        # URL, marker, blank and header rows
+        top_rows = list(itertools.islice(rows, HEADER_ROW))
+
+        # A failed scrape says nothing about availability, keep it apart from empty cards
+        marker = top_rows[1][0] if len(top_rows) > 1 and top_rows[1] else None
+        if isinstance(marker, str) and marker.startswith(SCRAPE_FAILED_MARKER):
+            print(f"Scrape failed for {card_name}, no listing data: {marker}")
+            analysis = self._empty_card_analysis(card_name)
+            analysis['scrape_failed'] = True
+            return analysis
+        if isinstance(marker, str) and marker.startswith(NOT_SCRAPED_MARKER):
+            print(f"{card_name} was not scraped yet, no listing data: {marker}")
+            analysis = self._empty_card_analysis(card_name)
+            analysis['not_scraped'] = True
+            return analysis
+
+        if len(top_rows) < HEADER_ROW:
+            print(f"Sheet has no header row, skipping {card_name}")
+            return self._empty_card_analysis(card_name)
+
+        header = [self._listing_key(cell, index) for index, cell in enumerate(top_rows[-1])]
+        return self.analyze_listings((dict(zip(header, row)) for row in rows), card_name)
+
+    @staticmethod
+    def _listing_key(column: Any, index: int) -> str:
+        """Map a sheet column header to the listing field analyze_listings reads"""
+        name = str(column).strip() if column is not None else f'col_{index}'
+        lower = name.lower()
+        if 'language' in lower:
+            return 'language'
+        if lower == 'price_cents':
+            return 'price_cents'
+        if 'price' in lower:
+            return 'price'
+        if 'quantity' in lower:
+            return 'quantity'
+        return name
+
+    def _analyze_offers(self, data_df: pd.DataFrame, card_name: str, language_col: str) -> Dict[str, Any]:
+        """
+        Summarize a card's offers per language
+
+        Args:
+            data_df: Offers with a language column, price_numeric and quantity_numeric
+            card_name: Name of the card
+            language_col: Name of the language column
+
+        Returns:
+            Dict containing analysis results
+        """
         # Filter out zero quantities and prices
         data_df = data_df[(data_df['quantity_numeric'] > 0) & (data_df['price_numeric'] > 0)]
 
@@ -187,9 +302,9 @@ class CardPriceAnalyzer:
             Dict containing analysis of all cards in the file
         """
         try:
-            # Get all sheet names
-            excel_file = pd.ExcelFile(excel_path)
-            sheet_names = excel_file.sheet_names
+            # Sheets are streamed one at a time from the same open file
+            workbook = load_workbook(excel_path, read_only=True)
+            sheet_names = workbook.sheetnames
 
             list_results = {
                 'file_name': excel_path.name,
@@ -199,15 +314,17 @@ class CardPriceAnalyzer:
                 'list_summary': {}
             }
 
-            # Analyze each sheet (card)
-            for sheet_name in sheet_names:
-                try:
-                    df = pd.read_excel(excel_path, sheet_name=sheet_name)
-                    card_analysis = self.analyze_card_data(df, sheet_name)
-                    list_results['cards'][sheet_name] = card_analysis
-                except Exception as e:
-                    print(f"Error analyzing sheet {sheet_name} in {excel_path.name}: {e}")
-                    list_results['cards'][sheet_name] = self._empty_card_analysis(sheet_name)
+            # Analyze each sheet (card), keeping only its analysis
+            try:
+                for sheet_name in sheet_names:
+                    try:
+                        card_analysis = self.analyze_sheet(workbook[sheet_name], sheet_name)
+                        list_results['cards'][sheet_name] = card_analysis
+                    except Exception as e:
+                        print(f"Error analyzing sheet {sheet_name} in {excel_path.name}: {e}")
+                        list_results['cards'][sheet_name] = self._empty_card_analysis(sheet_name)
+            finally:
+                workbook.close()
 
             # Calculate list summary
             list_results['list_summary'] = self._calculate_list_summary(list_results['cards'])
@@ -229,6 +346,8 @@ class CardPriceAnalyzer:
         """Calculate summary statistics for entire list"""
         summary = {
             'total_cards_with_data': 0,
+            'total_cards_failed': 0,
+            'total_cards_not_scraped': 0,
             'languages': {},
             'foreign_combined': {}
         }
@@ -255,6 +374,10 @@ class CardPriceAnalyzer:
 
         # Aggregate data from all cards
         for card_name, card_data in cards_data.items():
+            if card_data.get('scrape_failed'):
+                summary['total_cards_failed'] += 1
+            if card_data.get('not_scraped'):
+                summary['total_cards_not_scraped'] += 1
             if card_data['total_listings'] > 0:
                 summary['total_cards_with_data'] += 1
 
@@ -353,6 +476,10 @@ class CardPriceAnalyzer:
             if 'list_summary' in file_data:
                 summary = file_data['list_summary']
                 print(f"Cards with data: {summary['total_cards_with_data']}")
+                if summary.get('total_cards_failed'):
+                    print(f"Cards not scraped (failed, prices unknown): {summary['total_cards_failed']}")
+                if summary.get('total_cards_not_scraped'):
+                    print(f"Cards not scraped yet (left for a later run): {summary['total_cards_not_scraped']}")
 
                 # Print language summaries
                 for language in self.languages:
@@ -457,8 +584,12 @@ def save_analysis_to_file(analysis_results: Dict, output_path: Path):
             f.write("\n")
 
 
-def main():
-    """Main function to analyze today's Excel files and save results"""
+def main() -> bool:
+    """Main function to analyze today's Excel files and save results
+
+    Returns:
+        True if the analysis was saved, False if it failed
+    """
     from datetime import datetime
     import sys
 
@@ -498,7 +629,7 @@ def main():
             f.write(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
         print(f"Error details saved to: {error_file}")
-        return
+        return False
 
     # Save overall summary
     summary_file = output_date_folder / f"summary_{today}.txt"
@@ -536,6 +667,7 @@ def main():
         print(f"Details: {output_date_folder / f'detailed_{clean_filename}.txt'}")
 
     print(f"\nAll analysis files saved to: {output_date_folder}")
+    return True
 
 
 if __name__ == "__main__":
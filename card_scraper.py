@@ -1,165 +1,1122 @@
 """
 Main scraper class that coordinates all scraping operations.
-Handles the sequential scraping of individual cards.
+Handles planning a run over one or more card lists and the sequential or
+parallel scraping of individual cards.
 """
 
 import time
-from typing import Dict, Any, List, Tuple
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from collections import OrderedDict
 
 from config_manager import ConfigManager
 from url_builder import URLBuilder
 from web_driver_manager import WebDriverManager
+from fetcher import Fetcher, FetchResult, SeleniumFetcher, create_fetcher
+from browser_extractor import BrowserExtraction
+from driver_pool import DriverPool
+from page_cache import PageCache, CacheFetcher
+from scrape_journal import ScrapeJournal
+from work_queue import WorkQueue, open_work_queue
+from rate_limiter import AdaptiveRateLimiter, RateLimitedFetcher
+from scraper_pool import ScraperPool, DomainLimiter, StagePipeline
+from stage_timer import StageTimer
+from retry_policy import (RetryPolicy, CircuitBreaker, PARSE_FAILURE, NOT_COUNTED,
+                          classify_fetch_result, classify_exception)
+from snapshot_history import SnapshotHistory
+from refresh_planner import RefreshPlanner
 from data_parser import DataParser
+from listing import ListingBatch
+from batch_parser import BatchParser
 from excel_exporter import ExcelExporter
 
 
+# Marks that _scrape_single_card has to make the first fetch itself
+_NOT_FETCHED = object()
+
+
 class CardScraper:
     """Main scraper that coordinates all scraping operations."""
     
-    def __init__(self):
+    def __init__(self, rate_limiter: AdaptiveRateLimiter = None, keep_browser: bool = False):
+        """
+        Args:
+            rate_limiter: Scheduler shared by every list in a run (a private one is created if omitted)
+            keep_browser: Leave the browser session open after a run for the next one
+                (call close_browser() when done)
+        """
         self.config_manager = ConfigManager()
         self.url_builder = URLBuilder()
         self.web_driver = WebDriverManager()
+        self.fetcher: Fetcher = SeleniumFetcher(self.web_driver)
         self.data_parser = DataParser()
+        self.batch_parser: Optional[BatchParser] = None
         self.excel_exporter = ExcelExporter()
+        self.domain_limiter = None
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.page_cache = None
+        self.failed_urls: Dict[str, str] = {}
+        self.page_wait_times = OrderedDict()
+        self.page_transfers = OrderedDict()
+        self.readiness = 'rows'
+        self.quiet_period = 0.5
+        self.timer = StageTimer()
+        self.deadline = None
+        self.deferred_urls = set()
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker: Optional[CircuitBreaker] = CircuitBreaker()
+        self.keep_browser = keep_browser
+        self.driver_pool = None
     
-    def scrape_cards_from_config(self, config_file: str) -> bool:
+    def scrape_cards_from_config(self, config_file: str, reparse: bool = False) -> bool:
         """
         Main method to scrape cards based on configuration file.
         
         Args:
             config_file: Path to YAML configuration file
+            reparse: Rebuild the output from cached pages only, without any network calls
             
         Returns:
             True if scraping completed successfully, False otherwise
         """
+        return self.scrape_lists([config_file], reparse).get(config_file, False)
+    
+    def scrape_lists(self, config_files: List[str], reparse: bool = False,
+                     resume: Optional[bool] = None) -> Dict[str, bool]:
+        """
+        Scrape several card lists in one run.
+        
+        All lists are planned up front: cards that resolve to the same URL in
+        several lists are fetched once, through a single fetch backend (one
+        browser session) for the whole run, and the parsed listings are fanned
+        back out to every list's workbook. Run-wide settings (fetcher, workers,
+        readiness, cache) are taken from the first valid list.
+        
+        Args:
+            config_files: Paths to YAML configuration files
+            reparse: Rebuild the output from cached pages only, without any network calls
+            resume: Whether to skip cards already in today's journal (defaults to each list's resume setting)
+            
+        Returns:
+            Dictionary of config file to whether its workbook was produced
+        """
+        outcomes = OrderedDict((config_file, False) for config_file in config_files)
+        
         # Load and validate configuration
-        config = self.config_manager.load_config(config_file)
-        if not config or not self.config_manager.validate_config(config):
+        list_runs = []
+        for config_file in config_files:
+            config = self.config_manager.load_config(config_file)
+            if not config or not self.config_manager.validate_config(config):
+                continue
+            list_runs.append(self._plan_list(config_file, config, reparse, resume))
+        
+        if not list_runs:
+            return outcomes
+        
+        run_config = list_runs[0]['config']
+        jobs = self._plan_jobs(list_runs, run_config)
+        workers = min(self.config_manager.get_workers(run_config), len(jobs))
+        
+        self.readiness = self.config_manager.get_readiness(run_config)
+        self.quiet_period = self.config_manager.get_quiet_period(run_config)
+        self.web_driver.configure_readiness(self.readiness, self.quiet_period)
+        self.web_driver.configure_resource_blocking(self.config_manager.get_blocked_patterns(run_config))
+        self.page_wait_times = OrderedDict()
+        self.page_transfers = OrderedDict()
+        self.failed_urls = {}
+        self.deferred_urls = set()
+        self._configure_failure_handling(run_config)
+        self.data_parser.set_backend(self.config_manager.get_parser(run_config))
+        self.timer = StageTimer()
+        self.data_parser.timer = self.timer
+        self.excel_exporter.timer = self.timer
+        self.page_cache = PageCache(self.config_manager.get_cache_dir(run_config),
+                                    self.config_manager.get_cache_max_mb(run_config))
+        
+        total_cards = sum(len(list_run['pending']) for list_run in list_runs)
+        print(f"📋 Lists: {', '.join(list_run['list_name'] for list_run in list_runs)}")
+        print(f"🃏 Cards to scrape: {total_cards} ({len(jobs)} unique pages)")
+        
+        # Hand the pages to queue workers instead of fetching them here
+        queue_url = self.config_manager.get_queue(run_config)
+        if queue_url and jobs and not reparse:
+            return self._scrape_distributed(list_runs, jobs, run_config, queue_url, outcomes)
+        
+        self.fetcher = self._create_fetcher(run_config, workers, jobs, reparse)
+        print(f"🌐 Fetch backend: {self.fetcher.name}")
+        
+        parse_processes = self.config_manager.get_parse_processes(run_config)
+        if parse_processes > 1:
+            self.batch_parser = BatchParser(parse_processes, self.data_parser.backend, self.timer)
+            print(f"🧩 Parsing pages on {parse_processes} processes")
+        
+        # Initialize fetch backend (not needed when every card is journaled)
+        if jobs and not self.fetcher.open():
+            print("❌ Failed to initialize fetch backend")
+            self._close_run(list_runs, opened=False)
+            return outcomes
+        
+        incremental = self.config_manager.get_incremental(run_config)
+        self.deadline = None
+        if incremental and incremental['max_minutes'] and not reparse:
+            self.deadline = time.time() + float(incremental['max_minutes']) * 60
+        
+        try:
+            if not jobs:
+                results = []
+            elif reparse and self.batch_parser:
+                results = self._reparse_all_cards(jobs)
+            elif workers > 1:
+                results = self._scrape_all_cards_parallel(jobs, run_config, workers)
+            else:
+                results = self._scrape_all_cards(jobs, self.config_manager.get_prefetch(run_config))
+            
+            for list_run in list_runs:
+                outcomes[list_run['config_file']] = self._export_list(list_run, jobs, results)
+            
+            self.retry_policy.print_summary()
+            if self.circuit_breaker:
+                self.circuit_breaker.print_summary()
+            self.timer.print_summary()
+            self._write_timings(list_runs, jobs, workers)
+            return outcomes
+            
+        finally:
+            # Always clean up the fetch backend
+            self._close_run(list_runs, opened=bool(jobs))
+    
+    def _export_list(self, list_run: Dict[str, Any], jobs: List[Dict[str, Any]],
+                     results: List[Optional[ListingBatch]]) -> bool:
+        """
+        Assemble a list's data and write its workbook.
+        
+        Args:
+            list_run: Planned list
+            jobs: Fetch jobs of this run
+            results: Listings per job, aligned with jobs (None for journaled pages)
+            
+        Returns:
+            True if the workbook was saved, False otherwise
+        """
+        # Sheets are assembled one at a time while the workbook is written
+        scraped_data = self._assemble_list(list_run, jobs, results)
+        summary = OrderedDict()
+        
+        # Export to Excel
+        print(f"\n📋 Exporting list: {list_run['list_name']}")
+        success = self.excel_exporter.save_to_excel(scraped_data, list_run['list_name'], summary)
+        if success:
+            self.excel_exporter.print_summary(summary)
+            print(f"\n🎉 Scraping completed successfully!")
+        return success
+    
+    def _scrape_distributed(self, list_runs: List[Dict[str, Any]], jobs: List[Dict[str, Any]],
+                            run_config: Dict[str, Any], queue_url: str,
+                            outcomes: Dict[str, bool]) -> Dict[str, bool]:
+        """
+        Coordinate a run through a work queue served by worker processes.
+        
+        Every job is queued with the run's settings, then results are
+        collected as workers finish them. Each list's workbook is written as
+        soon as all of its pages are done, without waiting for the other lists.
+        Leases of dead workers are expired on every poll; if no page finishes
+        for queue_timeout_minutes (no workers left), the remaining pages are
+        marked failed and the workbooks are written with what arrived.
+        
+        Args:
+            list_runs: Planned lists
+            jobs: Fetch jobs, one per unique URL
+            run_config: Configuration providing run-wide settings
+            queue_url: Work queue to use
+            outcomes: Outcome per config file (updated in place)
+            
+        Returns:
+            Dictionary of config file to whether its workbook was produced
+        """
+        work_queue = open_work_queue(queue_url)
+        if work_queue is None:
+            self._close_run(list_runs, opened=False)
+            return outcomes
+        
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        settings = {key: value for key, value in run_config.items() if key != 'cards'}
+        queued = [{
+            'url': job['url'],
+            'card_name': job['card_name'],
+            'wait_time': job['wait_time'],
+            'ttl': job['ttl'],
+            'card_config': job['targets'][0][0]['cards'][job['card_name']],
+            'lists': [list_run['list_name'] for list_run, _ in job['targets']],
+        } for job in jobs]
+        
+        try:
+            work_queue.add_run(run_id, settings, queued,
+                               self.config_manager.get_lease_seconds(run_config),
+                               self.config_manager.get_max_attempts(run_config))
+            print(f"📬 Queued {len(jobs)} pages on {work_queue.name} queue {queue_url} (run {run_id})")
+            print(f"   Start workers with: python scrape_worker.py {queue_url}")
+            
+            jobs_by_url = {job['url']: job for job in jobs}
+            listings_by_url: Dict[str, Optional[ListingBatch]] = {}
+            waiting = list(list_runs)
+            cursor = 0
+            start_time = time.time()
+            timeout = self.config_manager.get_queue_timeout(run_config)
+            last_progress = start_time
+            
+            while waiting:
+                # Workers only expire leases when they claim; with all of them gone nobody would
+                work_queue.expire_leases()
+                finished, cursor = work_queue.results(run_id, cursor)
+                for result in finished:
+                    url = result['url']
+                    # At-least-once delivery: the first result for a page wins
+                    if url in listings_by_url or url not in jobs_by_url:
+                        continue
+                    job = jobs_by_url[url]
+                    if result['status'] == 'done':
+                        # Journaled listings are read back from the journal at export
+                        listings = ListingBatch(result['listings'])
+                        journaled = self._record_card(job, listings)
+                        listings_by_url[url] = None if journaled else listings
+                    else:
+                        print(f"  ❌ {job['card_name']} failed on {result['worker'] or 'a worker'}: "
+                              f"{result['error']}")
+                        self.failed_urls[url] = result['error']
+                        listings_by_url[url] = []
+                
+                if timeout and not finished and time.time() - last_progress > timeout:
+                    missing = [url for url in jobs_by_url if url not in listings_by_url]
+                    print(f"⏰ No page finished for {timeout / 60:.0f} minutes, giving up on "
+                          f"{len(missing)} remaining pages (are any workers running?)")
+                    for url in missing:
+                        self.failed_urls[url] = "queue_timeout"
+                        listings_by_url[url] = []
+                
+                if finished:
+                    last_progress = time.time()
+                    done = len(listings_by_url)
+                    elapsed = time.time() - start_time
+                    eta = (len(jobs) - done) * elapsed / done if done else 0
+                    print(f"📊 Progress: {done}/{len(jobs)} ({done/len(jobs)*100:.1f}%) "
+                          f"- {len(self.failed_urls)} failed - ETA: {eta:.1f}s")
+                
+                for list_run in list(waiting):
+                    urls = [list_run['urls'][card_name] for card_name in list_run['pending']]
+                    if all(url in listings_by_url for url in urls):
+                        results = [listings_by_url.get(job['url']) for job in jobs]
+                        outcomes[list_run['config_file']] = self._export_list(list_run, jobs, results)
+                        waiting.remove(list_run)
+                
+                if waiting:
+                    time.sleep(self.config_manager.get_queue_poll_seconds(run_config))
+            
+            work_queue.delete_run(run_id)
+            self.timer.print_summary()
+            return outcomes
+        
+        except KeyboardInterrupt:
+            # Finished cards are journaled; withdraw the rest so workers do not scrape for nobody
+            print(f"\n⏹️ Scraping cancelled, withdrawing run {run_id} from the queue")
+            work_queue.delete_run(run_id)
+            return outcomes
+        
+        finally:
+            work_queue.close()
+            self._close_run(list_runs, opened=False)
+    
+    def work_queue_jobs(self, work_queue: WorkQueue, worker_id: str,
+                        idle_exit: float = 0, poll_seconds: float = 2) -> int:
+        """
+        Run as a queue worker: claim jobs, scrape them and report the listings back.
+        
+        Each run's settings (fetcher, readiness, cache, ...) come from the
+        queue, so one worker serves any list; the fetch backend is rebuilt
+        when a job of another run comes up.
+        
+        Args:
+            work_queue: Queue to take jobs from
+            worker_id: Unique id of this worker (e.g. host and process id)
+            idle_exit: Stop after this many seconds without jobs (0 to wait forever)
+            poll_seconds: Pause between claims while the queue is empty
+            
+        Returns:
+            Number of jobs processed
+        """
+        print(f"👷 Worker {worker_id} waiting for jobs on the {work_queue.name} queue...")
+        run_id = None
+        processed = 0
+        idle_since = time.time()
+        self.deadline = None
+        
+        try:
+            while True:
+                job = work_queue.claim(worker_id)
+                if job is None:
+                    if idle_exit and time.time() - idle_since > idle_exit:
+                        print(f"💤 No jobs for {idle_exit:.0f}s, stopping")
+                        break
+                    time.sleep(poll_seconds)
+                    continue
+                
+                if job['run_id'] != run_id:
+                    if run_id is not None:
+                        self._close_run([], opened=True)
+                        run_id = None
+                    if not self._open_worker_run(work_queue.run_settings(job['run_id'])):
+                        work_queue.fail(job, worker_id, "fetch backend unavailable")
+                        time.sleep(poll_seconds)
+                        continue
+                    run_id = job['run_id']
+                
+                processed += 1
+                self._work_job(work_queue, worker_id, job, processed)
+                idle_since = time.time()
+        
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Worker stopped")
+        
+        finally:
+            if run_id is not None:
+                self._close_run([], opened=True)
+            self.retry_policy.print_summary()
+            self.timer.print_summary()
+        
+        return processed
+    
+    def _configure_failure_handling(self, config: Dict[str, Any]):
+        """
+        Set up the retry policy and circuit breaker for a run.
+        
+        Args:
+            config: Configuration providing run-wide settings
+        """
+        self.retry_policy = RetryPolicy.from_settings(self.config_manager.get_retries(config))
+        breaker = self.config_manager.get_circuit_breaker(config)
+        self.circuit_breaker = CircuitBreaker.from_settings(breaker) if breaker is not None else None
+    
+    def _open_worker_run(self, config: Optional[Dict[str, Any]]) -> bool:
+        """
+        Set up the fetch stack for the settings of a queued run.
+        
+        Args:
+            config: Run settings from the queue (None if the run was withdrawn)
+            
+        Returns:
+            True if the fetch backend is ready, False otherwise
+        """
+        if config is None:
+            return False
+        
+        self.readiness = self.config_manager.get_readiness(config)
+        self.quiet_period = self.config_manager.get_quiet_period(config)
+        self.web_driver.configure_readiness(self.readiness, self.quiet_period)
+        self.web_driver.configure_resource_blocking(self.config_manager.get_blocked_patterns(config))
+        self._configure_failure_handling(config)
+        self.data_parser.set_backend(self.config_manager.get_parser(config))
+        self.page_cache = PageCache(self.config_manager.get_cache_dir(config),
+                                    self.config_manager.get_cache_max_mb(config))
+        self.fetcher = self._create_fetcher(config, 1, [], False)
+        print(f"🌐 Fetch backend: {self.fetcher.name}")
+        
+        if not self.fetcher.open():
+            print("❌ Failed to initialize fetch backend")
+            self.page_cache.close()
             return False
+        return True
+    
+    def _work_job(self, work_queue: WorkQueue, worker_id: str, job: Dict[str, Any], card_number: int):
+        """
+        Scrape one claimed job and report the outcome to the queue.
+        
+        Args:
+            work_queue: Queue the job came from
+            worker_id: Id of this worker
+            job: Claimed job
+            card_number: Card number for logging
+        """
+        url = job['url']
+        print(f"\n🔄 [{card_number}] Processing: {job['card_name']} (attempt {job['attempts']})")
+        self.fetcher.ttls[url] = job['ttl']
+        
+        result = self._fetch_card(job['card_name'], url, job['wait_time'], card_number)
+        # Parsing can take a while on large pages, keep the lease
+        if not work_queue.renew(job, worker_id):
+            print(f"  ⚠️ [{card_number}] Lease lost, another worker has taken this page")
+            return
+        listings = self._scrape_single_card(job['card_name'], url, job['wait_time'], card_number,
+                                            prefetched=result,
+                                            before_retry=lambda: work_queue.renew(job, worker_id))
+        
+        if url in self.failed_urls:
+            work_queue.fail(job, worker_id, self.failed_urls.pop(url))
+        elif not work_queue.complete(job, worker_id, listings):
+            print(f"  ⚠️ [{card_number}] Lease expired before the result was saved")
+    
+    def _plan_list(self, config_file: str, config: Dict[str, Any], reparse: bool,
+                   resume: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Work out which cards of a list still need scraping.
         
-        # Extract configuration data
+        Args:
+            config_file: Path to the list's YAML file
+            config: Loaded configuration
+            reparse: Whether this is a cache-only reparse (no journal)
+            resume: Whether to resume from today's journal (None for the list's setting)
+            
+        Returns:
+            Dictionary describing the list for this run
+        """
         list_name = self.config_manager.get_list_name(config)
         cards = self.config_manager.get_cards(config)
-        wait_time = self.config_manager.get_wait_time(config)
+        url_builder = URLBuilder(self.config_manager.get_base_url(config))
         
-        print(f"📋 List: {list_name}")
-        print(f"🃏 Cards to scrape: {len(cards)}")
-        print(f"⏱️ Wait time per card: {wait_time} seconds")
+        list_run = {
+            'config_file': config_file,
+            'config': config,
+            'list_name': list_name,
+            'cards': cards,
+            'urls': OrderedDict((card_name, url_builder.build_url(card_name, card_config))
+                                for card_name, card_config in cards.items()),
+            'journal': None,
+            'pending': list(cards.keys()),
+            'snapshots': {},
+        }
         
-        # Initialize web driver
-        if not self.web_driver.create_driver():
-            print("❌ Failed to initialize web driver")
-            return False
+        # Resume from today's journal, skipping cards that already succeeded
+        if not reparse:
+            journal = ScrapeJournal(self.excel_exporter.get_journal_path(list_name))
+            if resume is None:
+                resume = self.config_manager.get_resume(config)
+            if resume:
+                finished = journal.index()
+                list_run['pending'] = [card_name for card_name in cards if card_name not in finished]
+                if finished:
+                    print(f"♻️ {list_name}: {len(cards) - len(list_run['pending'])} "
+                          f"cards already scraped today")
+            else:
+                journal.reset()
+            list_run['journal'] = journal
+            
+            incremental = self.config_manager.get_incremental(config)
+            if incremental:
+                self._plan_incremental(list_run, incremental)
         
-        try:
-            # Scrape all cards sequentially
-            scraped_data = self._scrape_all_cards(cards, wait_time)
+        return list_run
+    
+    def _plan_incremental(self, list_run: Dict[str, Any], settings: Dict[str, Any]):
+        """
+        Narrow a list's pending cards to the ones that are due for a refresh.
+        
+        Cards left out are filled from their latest snapshot when the list is assembled.
+        
+        Args:
+            list_run: Planned list (updated in place)
+            settings: Incremental settings from ConfigManager.get_incremental
+        """
+        pending = list_run['pending']
+        sheet_names = {card_name: self.excel_exporter.clean_sheet_name(card_name)
+                       for card_name in list_run['cards']}
+        history = SnapshotHistory(history_days=int(settings['history_days'])).load(
+            list_run['list_name'], pending, sheet_names)
+        planner = RefreshPlanner(float(settings['refresh_after_days']),
+                                 float(settings['volatility_weight']),
+                                 int(settings['max_cards']))
+        due, scores = planner.plan(pending, history)
+        
+        list_run['pending'] = due
+        list_run['snapshots'] = {card_name: snapshots[0]
+                                 for card_name, snapshots in history.items() if snapshots}
+        
+        overdue = sum(1 for card_name in pending if scores[card_name] >= planner.refresh_after_days)
+        never = sum(1 for card_name in pending if not history[card_name])
+        print(f"📅 {list_run['list_name']}: {overdue} of {len(pending)} cards due "
+              f"({never} never scraped), scraping {len(due)}")
+    
+    def _plan_jobs(self, list_runs: List[Dict[str, Any]],
+                   run_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Collapse the pending cards of all lists into one fetch per unique URL.
+        
+        Args:
+            list_runs: Planned lists
+            run_config: Configuration providing run-wide defaults
+            
+        Returns:
+            List of fetch jobs in first-seen order
+        """
+        jobs = OrderedDict()
+        for list_run in list_runs:
+            config = list_run['config']
+            for card_name in list_run['pending']:
+                card_config = list_run['cards'][card_name]
+                url = list_run['urls'][card_name]
+                ttl = self.config_manager.get_cache_ttl(config, card_config)
+                
+                if url not in jobs:
+                    jobs[url] = {
+                        'url': url,
+                        'card_name': card_name,
+                        'wait_time': self.config_manager.get_wait_time(config),
+                        'ttl': ttl,
+                        'targets': [],
+                    }
+                job = jobs[url]
+                # Shared cards get the most demanding settings of their lists
+                job['wait_time'] = max(job['wait_time'], self.config_manager.get_wait_time(config))
+                job['ttl'] = min(job['ttl'], ttl)
+                job['targets'].append((list_run, card_name))
+        
+        shared = sum(1 for job in jobs.values() if len(job['targets']) > 1)
+        if shared:
+            print(f"🔗 {shared} cards are shared between lists and will be fetched once")
+        
+        return list(jobs.values())
+    
+    def _assemble_list(self, list_run: Dict[str, Any], jobs: List[Dict[str, Any]],
+                       results: List[Optional[ListingBatch]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Build a list's export data in YAML order, one sheet at a time.
+        
+        Journaled cards (including earlier runs today) are read back from the
+        journal when their sheet is due, so only one card's listings are in
+        memory at a time; in incremental mode cards not scraped come from
+        their latest snapshot; cards that failed in this run are marked with
+        their failure class, and cards left for a later run (over max_cards
+        or the time budget) without a snapshot are marked as not scraped, so
+        neither is mistaken for a card without offers.
+        
+        Args:
+            list_run: Planned list
+            jobs: Fetch jobs of this run
+            results: Listings per job, aligned with jobs (None for journaled pages)
+            
+        Yields:
+            Tuples of (sheet name, sheet data)
+        """
+        journal = list_run['journal']
+        finished = journal.index() if journal else {}
+        listings_by_url = {job['url']: listings for job, listings in zip(jobs, results)}
+        
+        for card_name, url in list_run['urls'].items():
+            sheet_name = self.excel_exporter.clean_sheet_name(card_name)
+            if card_name in finished:
+                record = journal.read(finished[card_name])
+                yield sheet_name, {'listings': ListingBatch(record['listings']), 'url': record['url']}
+            elif card_name in list_run['snapshots']:
+                # Not refreshed in this run (not due, over budget or failed)
+                snapshot = list_run['snapshots'][card_name]
+                yield sheet_name, {'listings': snapshot['listings'], 'url': snapshot['url'] or url,
+                                   'last_scraped': snapshot['date']}
+            else:
+                sheet_data = {'listings': listings_by_url.get(url) or ListingBatch(), 'url': url}
+                if url in self.failed_urls:
+                    sheet_data['failure'] = self.failed_urls[url]
+                elif url in self.deferred_urls:
+                    sheet_data['not_scraped'] = "out of time budget"
+                elif url not in listings_by_url:
+                    sheet_data['not_scraped'] = "over max_cards"
+                yield sheet_name, sheet_data
+    
+    def _record_card(self, job: Dict[str, Any], listings: ListingBatch) -> bool:
+        """
+        Checkpoint a scraped page to the journal of every list that needs it, unless it failed.
+        
+        Args:
+            job: Fetch job that finished
+            listings: Parsed listings for the page
             
-            # Export to Excel
-            success = self.excel_exporter.save_to_excel(scraped_data, list_name)
-            if success:
-                self.excel_exporter.print_summary(scraped_data)
-                print(f"\n🎉 Scraping completed successfully!")
+        Returns:
+            True if every list that needs the page has it journaled (the
+            listings need not be kept in memory), False otherwise
+        """
+        if job['url'] in self.failed_urls or job['url'] in self.deferred_urls:
+            return False
+        journaled = True
+        for list_run, card_name in job['targets']:
+            if list_run['journal']:
+                list_run['journal'].append(card_name, job['url'], listings)
+            else:
+                journaled = False
+        return journaled
+    
+    def _close_run(self, list_runs: List[Dict[str, Any]], opened: bool):
+        """Release the fetch backend, page cache and journals of a run."""
+        # A kept browser session is reused by the next run and closed by close_browser()
+        if opened and not (self.keep_browser and self.fetcher.uses_browser):
+            self.fetcher.close()
+        if self.batch_parser:
+            self.batch_parser.close()
+            self.batch_parser = None
+        self.page_cache.close()
+        for list_run in list_runs:
+            if list_run['journal']:
+                list_run['journal'].close()
+    
+    def _write_timings(self, list_runs: List[Dict[str, Any]], jobs: List[Dict[str, Any]], workers: int):
+        """
+        Save the run's stage timings next to each list's workbook.
+        
+        Args:
+            list_runs: Planned lists of the run
+            jobs: Fetch jobs of the run
+            workers: Number of parallel workers
+        """
+        details = {
+            'lists': [list_run['list_name'] for list_run in list_runs],
+            'fetcher': self.fetcher.name,
+            'workers': workers,
+            'pages': len(jobs),
+            'failed_pages': len(self.failed_urls),
+        }
+        for list_run in list_runs:
+            self.timer.write_report(self.excel_exporter.get_timings_path(list_run['list_name']), details)
+    
+    def _create_fetcher(self, config: Dict[str, Any], workers: int,
+                        jobs: List[Dict[str, Any]], reparse: bool) -> Fetcher:
+        """
+        Create the fetch backend selected in the configuration, behind the page cache.
+        
+        Args:
+            config: Configuration providing run-wide settings
+            workers: Number of parallel workers
+            jobs: Fetch jobs (for per-card TTLs)
+            reparse: Serve cached pages only
             
-            return success
+        Returns:
+            Fetcher instance
+        """
+        if reparse:
+            return CacheFetcher(self.page_cache)
+        
+        ttls = {job['url']: job['ttl'] for job in jobs}
+        driver_pool = None
+        if self.config_manager.get_browser(config) == 'launch':
+            driver_pool = self._get_driver_pool(config, workers)
+        inner = create_fetcher(
+            self.config_manager.get_fetcher(config),
+            self.web_driver,
+            worker_mode=self.config_manager.get_worker_mode(config),
+            debugger_ports=self.config_manager.get_debugger_ports(config, workers),
+            max_per_domain=self.config_manager.get_max_per_domain(config),
+            http_concurrency=self.config_manager.get_http_concurrency(config),
+            timer=self.timer,
+            extraction=self._create_extraction(config),
+            driver_pool=driver_pool,
+        )
+        # Cache hits skip the rate limiter, only real requests are paced
+        return CacheFetcher(self.page_cache, RateLimitedFetcher(inner, self.rate_limiter), ttls)
+    
+    def _get_driver_pool(self, config: Dict[str, Any], workers: int) -> DriverPool:
+        """
+        Get the pool of launched Chrome instances, reusing a kept pool of the same size.
+        
+        Args:
+            config: Configuration providing run-wide settings
+            workers: Number of parallel workers
             
-        finally:
-            # Always clean up the web driver
+        Returns:
+            DriverPool instance
+        """
+        if self.driver_pool and self.keep_browser and self.driver_pool.size == max(1, workers):
+            return self.driver_pool
+        if self.driver_pool:
+            self.driver_pool.close()
+        
+        self.driver_pool = DriverPool(self.web_driver, workers,
+                                      self.config_manager.get_profile_dir(config),
+                                      self.config_manager.get_max_browser_memory_mb(config))
+        return self.driver_pool
+    
+    def close_browser(self):
+        """Close a browser session kept open with keep_browser."""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+        else:
             self.web_driver.close_driver()
     
-    def _scrape_all_cards(self, cards: Dict[str, Any], wait_time: int) -> Dict[str, Dict[str, Any]]:
+    def _create_extraction(self, config: Dict[str, Any]) -> Optional[BrowserExtraction]:
+        """
+        Set up in-browser listing extraction if the configuration asks for it.
+        
+        Args:
+            config: Configuration providing run-wide settings
+            
+        Returns:
+            BrowserExtraction instance, None to parse page sources
+        """
+        if self.config_manager.get_extraction(config) != 'browser':
+            return None
+        if self.config_manager.get_fetcher(config) != 'selenium':
+            print("⚠️ In-browser extraction needs the selenium fetcher, parsing page sources instead")
+            return None
+        return BrowserExtraction(self.data_parser, self.config_manager.get_parity_check_every(config))
+    
+    def _scrape_all_cards(self, jobs: List[Dict[str, Any]], prefetch: int = 0) -> List[ListingBatch]:
         """
         Scrape all cards sequentially.
         
+        With prefetch, the next pages are fetched on a background thread while
+        the current one is parsed. Both share one fetcher (one browser
+        session), so a retry made while parsing waits for the background
+        fetch in flight and holds the prefetch back until it is done.
+        
         Args:
-            cards: Dictionary of card names and configurations
-            wait_time: Wait time between requests
+            jobs: Fetch jobs, one per unique URL
+            prefetch: How many pages the fetcher may run ahead of the parser (0 to not overlap)
             
         Returns:
-            Dictionary containing all scraped data organized by sheet name
+            Listings per job, in the same order as jobs (empty for pages kept in the journal)
         """
-        scraped_data = OrderedDict()
-        total_cards = len(cards)
+        total_cards = len(jobs)
         
-        print(f"\n🚀 Starting sequential scraping...")
+        if prefetch > 0:
+            print(f"\n🚀 Starting sequential scraping (prefetching {prefetch} page(s) ahead)...")
+        else:
+            print(f"\n🚀 Starting sequential scraping...")
         start_time = time.time()
         
-        for i, (card_name, card_config) in enumerate(cards.items(), 1):
-            print(f"\n🔄 [{i}/{total_cards}] Processing: {card_name}")
-            
-            # Scrape individual card
-            listings = self._scrape_single_card(card_name, card_config, wait_time, i)
-            
-            # Prepare data for export
-            url = self.url_builder.build_url(card_name, card_config)
-            sheet_name = self.excel_exporter.clean_sheet_name(card_name)
-            scraped_data[sheet_name] = {
-                'listings': listings,
-                'url': url
-            }
+        fetch_lock = threading.Lock() if prefetch > 0 else None
+        
+        def fetch_job(index, job):
+            card_number = index + 1
+            print(f"\n🔄 [{card_number}/{total_cards}] Processing: {job['card_name']}")
+            if fetch_lock:
+                with fetch_lock:
+                    return self._fetch_card(job['card_name'], job['url'], job['wait_time'], card_number)
+            return self._fetch_card(job['card_name'], job['url'], job['wait_time'], card_number)
+        
+        def parse_job(index, job, result):
+            card_number = index + 1
+            listings = self._scrape_single_card(job['card_name'], job['url'], job['wait_time'],
+                                                card_number, prefetched=result, fetch_lock=fetch_lock)
+            journaled = self._record_card(job, listings)
             
             # Progress update
             elapsed = time.time() - start_time
-            avg_time = elapsed / i
-            remaining = total_cards - i
+            avg_time = elapsed / card_number
+            remaining = total_cards - card_number
             eta = remaining * avg_time
             
-            print(f"📊 Progress: {i}/{total_cards} ({i/total_cards*100:.1f}%) - ETA: {eta:.1f}s")
+            print(f"📊 Progress: {card_number}/{total_cards} ({card_number/total_cards*100:.1f}%) - ETA: {eta:.1f}s")
+            # Journaled listings are read back from the journal at export
+            return None if journaled else listings
+        
+        if prefetch > 0:
+            results = StagePipeline(prefetch).run(jobs, fetch_job, parse_job, self._record_job_error)
+        else:
+            results = [parse_job(index, job, fetch_job(index, job)) for index, job in enumerate(jobs)]
         
         elapsed_total = time.time() - start_time
         print(f"\n⏱️ Total time: {elapsed_total:.1f}s (avg: {elapsed_total/total_cards:.1f}s per card)")
+        self._print_wait_summary()
         
-        return scraped_data
+        return [listings or ListingBatch() for listings in results]
     
-    def _scrape_single_card(self, card_name: str, card_config: Dict[str, Any], 
-                           wait_time: int, card_number: int) -> List[Dict[str, Any]]:
+    def _reparse_all_cards(self, jobs: List[Dict[str, Any]]) -> List[ListingBatch]:
         """
-        Scrape a single card and return its listings.
+        Rebuild all cards from cached pages, parsing them on the batch parser's processes.
+        
+        Cached pages are read in order and parsed a few pages per process
+        ahead; results come back in job order. A page whose listing table is
+        not recognized goes through _parse_card as usual so it is marked failed.
+        
+        Args:
+            jobs: Fetch jobs, one per unique URL
+            
+        Returns:
+            Listings per job, in the same order as jobs
+        """
+        total_cards = len(jobs)
+        print(f"\n🚀 Reparsing {total_cards} cached pages on {self.batch_parser.processes} processes...")
+        start_time = time.time()
+        
+        def cached_pages():
+            for index, job in enumerate(jobs):
+                result = self._fetch_card(job['card_name'], job['url'], job['wait_time'], index + 1)
+                if result is not None:
+                    yield (index, result), result.html
+        
+        results = [ListingBatch() for _ in jobs]
+        for parsed in self.batch_parser.iter_parse(cached_pages()):
+            index, result = parsed.key
+            job = jobs[index]
+            if parsed.layout in ('ok', 'no_rows'):
+                result.listings = parsed.listings
+            results[index] = self._parse_card(job['card_name'], job['url'], result, index + 1)
+            self._record_card(job, results[index])
+        
+        elapsed_total = time.time() - start_time
+        print(f"\n⏱️ Total time: {elapsed_total:.1f}s (avg: {elapsed_total/total_cards:.1f}s per card)")
+        return results
+    
+    def _scrape_all_cards_parallel(self, jobs: List[Dict[str, Any]], config: Dict[str, Any],
+                                   workers: int) -> List[ListingBatch]:
+        """
+        Scrape all cards with a pool of workers, each with its own fetcher
+        (a browser tab or driver session, or a shared HTTP client).
+        
+        Args:
+            jobs: Fetch jobs, one per unique URL
+            config: Configuration providing worker settings
+            workers: Number of parallel workers
+            
+        Returns:
+            Listings per job, in the same order as jobs (empty for pages kept in the journal)
+        """
+        worker_mode = self.config_manager.get_worker_mode(config)
+        max_per_domain = self.config_manager.get_max_per_domain(config)
+        
+        fetchers, cleanup = self.fetcher.worker_fetchers(workers)
+        if len(fetchers) < 2:
+            cleanup()
+            print("⚠️ Could not start parallel workers, falling back to sequential scraping")
+            return self._scrape_all_cards(jobs, self.config_manager.get_prefetch(config))
+        
+        self.domain_limiter = DomainLimiter(max_per_domain)
+        total_cards = len(jobs)
+        completed = [0]
+        progress_lock = threading.Lock()
+        
+        if not self.fetcher.uses_browser:
+            worker_kind = f"{self.fetcher.name} workers"
+        elif self.config_manager.get_browser(config) == 'launch':
+            worker_kind = "headless Chrome instances"
+        else:
+            worker_kind = worker_mode
+        print(f"\n🚀 Starting parallel scraping with {len(fetchers)} {worker_kind} "
+              f"(max {max_per_domain} per domain)...")
+        start_time = time.time()
+        
+        def scrape_job(fetcher, index, job):
+            card_number = index + 1
+            print(f"\n🔄 [{card_number}/{total_cards}] Processing: {job['card_name']}")
+            listings = self._scrape_single_card(job['card_name'], job['url'], job['wait_time'],
+                                                card_number, fetcher)
+            journaled = self._record_card(job, listings)
+            
+            with progress_lock:
+                completed[0] += 1
+                done = completed[0]
+                elapsed = time.time() - start_time
+                eta = (total_cards - done) * elapsed / done
+                print(f"📊 Progress: {done}/{total_cards} ({done/total_cards*100:.1f}%) - ETA: {eta:.1f}s")
+            
+            return None if journaled else listings
+        
+        try:
+            results = ScraperPool(fetchers).map(jobs, scrape_job, self._record_job_error)
+        finally:
+            self.domain_limiter = None
+            cleanup()
+        
+        elapsed_total = time.time() - start_time
+        print(f"\n⏱️ Total time: {elapsed_total:.1f}s (avg: {elapsed_total/total_cards:.1f}s per card)")
+        self._print_wait_summary()
+        
+        return [listings or ListingBatch() for listings in results]
+    
+    def _record_job_error(self, index: int, job: Dict[str, Any], error: Exception) -> None:
+        """
+        Mark a card failed after its worker or pipeline stage raised.
+        
+        Without this the card would be exported as a sheet without offers.
+        
+        Args:
+            index: Position of the job
+            job: Fetch job whose stage raised
+            error: Exception raised
+            
+        Returns:
+            None, so the card has no listings in memory
+        """
+        self.failed_urls.setdefault(job['url'], classify_exception(error))
+        return None
+    
+    def _print_wait_summary(self):
+        """Print how long pages actually took to become ready."""
+        if not self.page_wait_times:
+            return
+        
+        waits = list(self.page_wait_times.values())
+        mode = self.readiness if self.fetcher.uses_browser else self.fetcher.name
+        print(f"⏱️ Page ready wait ({mode}): avg {sum(waits)/len(waits):.2f}s, "
+              f"min {min(waits):.2f}s, max {max(waits):.2f}s")
+        
+        if self.page_transfers:
+            total_bytes = sum(size for size, _ in self.page_transfers.values())
+            loads = [load for _, load in self.page_transfers.values()]
+            print(f"📦 Transferred {total_bytes / 1024 / 1024:.2f} MB over {len(loads)} pages "
+                  f"(avg {total_bytes / len(loads) / 1024:.1f} KB, load {sum(loads)/len(loads):.2f}s per page)")
+    
+    def _scrape_single_card(self, card_name: str, url: str, wait_time: int, card_number: int,
+                           fetcher: Fetcher = None, prefetched: Any = _NOT_FETCHED,
+                           before_retry: Optional[Callable[[], bool]] = None,
+                           fetch_lock: Optional[threading.Lock] = None) -> ListingBatch:
+        """
+        Scrape a single card and return its listings, retrying failed attempts.
+        
+        Each failed attempt is retried after the backoff of its failure class
+        until the retry policy gives up; the card then stays in failed_urls
+        with the class of its last failure. Each card counts once towards the
+        circuit breaker, with the outcome of its last attempt, so a card that
+        keeps failing is not counted once per retry.
         
         Args:
             card_name: Name of the card to scrape
-            card_config: Configuration for the card
+            url: URL of the card's product page
             wait_time: Wait time for page loading
             card_number: Card number for logging
+            fetcher: Fetcher to use (defaults to the main fetch backend)
+            prefetched: Result of an already made first fetch (from _fetch_card)
+            before_retry: Called before each retry; returning False stops retrying
+            fetch_lock: Held around retry fetches when another thread fetches with the same fetcher
             
         Returns:
-            List of listing dictionaries
+            ListingBatch of the listings (empty if the card failed)
         """
-        try:
-            # Build URL for the card
-            url = self.url_builder.build_url(card_name, card_config)
+        attempt = 0
+        while True:
+            if attempt == 0 and prefetched is not _NOT_FETCHED:
+                result = prefetched
+            elif fetch_lock:
+                with fetch_lock:
+                    result = self._fetch_card(card_name, url, wait_time, card_number, fetcher)
+            else:
+                result = self._fetch_card(card_name, url, wait_time, card_number, fetcher)
+            listings = self._parse_card(card_name, url, result, card_number)
+            if url in self.deferred_urls:
+                return listings
             
-            # Navigate to the page
-            if not self.web_driver.navigate_to_url(url, wait_time):
-                print(f"  ❌ [{card_number}] Failed to navigate to page")
-                return []
+            failure = self.failed_urls.get(url)
+            if failure is None:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record(True)
+                return listings
             
-            # Verify we're on the right page
-            if not self.web_driver.is_on_cardmarket():
-                current_url = self.web_driver.get_current_url()
-                print(f"  ⚠️ [{card_number}] Not on CardMarket page: {current_url}")
-                return []
+            delay = self.retry_policy.delay(failure, attempt)
+            if delay is None:
+                print(f"  ❌ [{card_number}] Giving up on {card_name} after {attempt + 1} "
+                      f"attempt(s): {failure}")
+                if self.circuit_breaker and failure not in NOT_COUNTED:
+                    self.circuit_breaker.record(False)
+                return ListingBatch()
+            print(f"  🔁 [{card_number}] {failure}, retry {attempt + 1}/"
+                  f"{self.retry_policy.max_retries(failure)} in {delay:.1f}s")
+            time.sleep(delay)
+            if before_retry and not before_retry():
+                return ListingBatch()
+            if failure == PARSE_FAILURE:
+                # The page came back but could not be parsed; a cached copy would fail the same way
+                (fetcher or self.fetcher).invalidate(url)
+            del self.failed_urls[url]
+            attempt += 1
+    
+    def _fetch_card(self, card_name: str, url: str, wait_time: int, card_number: int,
+                    fetcher: Fetcher = None) -> Optional[FetchResult]:
+        """
+        Fetch a single card's page.
+        
+        Args:
+            card_name: Name of the card to scrape
+            url: URL of the card's product page
+            wait_time: Wait time for page loading
+            card_number: Card number for logging
+            fetcher: Fetcher to use (defaults to the main fetch backend)
             
-            # Get page source and parse data
-            html_content = self.web_driver.get_page_source()
-            if not html_content:
+        Returns:
+            FetchResult with the page, or None if the fetch failed
+        """
+        fetcher = fetcher or self.fetcher
+        if self.circuit_breaker:
+            self.circuit_breaker.wait_if_open()
+        if self.deadline and time.time() > self.deadline:
+            # Out of time budget; the card keeps its latest snapshot
+            if not self.deferred_urls:
+                print(f"⏳ Time budget for this run used up, deferring the remaining cards")
+            self.deferred_urls.add(url)
+            return None
+        
+        try:
+            # Fetch the page (holding a per-domain slot in parallel mode)
+            with self.timer.time('fetch'):
+                if self.domain_limiter:
+                    with self.domain_limiter.limit(url):
+                        result = fetcher.fetch(url, wait_time)
+                else:
+                    result = fetcher.fetch(url, wait_time)
+            self.page_wait_times[url] = result.wait_seconds
+            print(f"  ⏱️ [{card_number}] Page ready after {result.wait_seconds:.2f}s "
+                  f"({result.wait_mode})")
+            if result.wait_mode != 'cache' and result.bytes_transferred:
+                self.page_transfers[url] = (result.bytes_transferred, result.load_seconds)
+                print(f"  📦 [{card_number}] {result.bytes_transferred / 1024:.1f} KB transferred, "
+                      f"load time {result.load_seconds:.2f}s")
+            
+            if result.status == 'navigation_failed':
+                print(f"  ❌ [{card_number}] Failed to navigate to page {result.error}".rstrip())
+            elif result.status == 'wrong_site':
+                # Verify we're on the right page
+                print(f"  ⚠️ [{card_number}] Not on CardMarket page: {result.final_url}")
+            elif result.status == 'not_cached':
+                print(f"  ❌ [{card_number}] Page not in cache, nothing to reparse")
+            elif not result.ok:
                 print(f"  ❌ [{card_number}] Failed to get page content")
-                return []
             
-            print(f"  ✅ [{card_number}] Page loaded, extracting data...")
-            listings = self.data_parser.parse_page_data(html_content)
+            failure = classify_fetch_result(result)
+            if failure:
+                self.failed_urls[url] = failure
+                return None
+            return result
+            
+        except Exception as e:
+            print(f"❌ [{card_number}] Error scraping {card_name}: {e}")
+            self.failed_urls[url] = classify_exception(e)
+            return None
+    
+    def _parse_card(self, card_name: str, url: str, result: Optional[FetchResult],
+                    card_number: int) -> ListingBatch:
+        """
+        Extract the listings from a fetched card page.
+        
+        Args:
+            card_name: Name of the card
+            url: URL of the card's product page
+            result: Result of _fetch_card (None if the fetch failed)
+            card_number: Card number for logging
+            
+        Returns:
+            ListingBatch of the listings (empty for a page without offers)
+        """
+        if result is None:
+            return ListingBatch()
+        
+        try:
+            if result.listings is not None:
+                # Already extracted inside the page
+                listings = result.listings
+            else:
+                print(f"  ✅ [{card_number}] Page loaded, extracting data...")
+                listings, layout = (self.batch_parser or self.data_parser).parse_page(result.html)
+                if layout == 'no_table':
+                    # Not the same as a card without offers
+                    print(f"  ❌ [{card_number}] Listing table not found on the page")
+                    self.failed_urls[url] = PARSE_FAILURE
+                    return ListingBatch()
             
             print(f"✅ [{card_number}] Completed: {card_name} ({len(listings)} listings)")
             return listings
             
         except Exception as e:
             print(f"❌ [{card_number}] Error scraping {card_name}: {e}")
-            return []
+            self.failed_urls[url] = PARSE_FAILURE
+            return ListingBatch()
     
     def scrape_single_url(self, url: str, card_name: str = "Manual", 
-                         wait_time: int = 3) -> List[Dict[str, Any]]:
+                         wait_time: int = 3) -> ListingBatch:
         """
         Scrape a single URL manually (useful for testing).
         
@@ -169,7 +1126,7 @@ class CardScraper:
             wait_time: Wait time for page loading
             
         Returns:
-            List of listing dictionaries
+            ListingBatch of the listings
         """
         print(f"🔄 Manual scraping: {card_name}")
         print(f"📍 URL: {url}")
@@ -178,18 +1135,18 @@ class CardScraper:
         if not self.web_driver.driver:
             if not self.web_driver.create_driver():
                 print("❌ Failed to initialize web driver")
-                return []
+                return ListingBatch()
         
         try:
             # Navigate and scrape
             if not self.web_driver.navigate_to_url(url, wait_time):
                 print("❌ Failed to navigate to URL")
-                return []
+                return ListingBatch()
             
             html_content = self.web_driver.get_page_source()
             if not html_content:
                 print("❌ Failed to get page content")
-                return []
+                return ListingBatch()
             
             listings = self.data_parser.parse_page_data(html_content)
             print(f"✅ Manual scraping completed: {len(listings)} listings found")
@@ -198,7 +1155,7 @@ class CardScraper:
             
         except Exception as e:
             print(f"❌ Error in manual scraping: {e}")
-            return []
+            return ListingBatch()
         
         finally:
             # Close driver after manual scraping
@@ -3,8 +3,12 @@ Configuration management for the CardMarket scraper.
 Handles loading and validating YAML configuration files.
 """
 
+import os
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+
+from url_builder import URLBuilder
+from web_driver_manager import BLOCKED_URL_PATTERNS
 
 
 class ConfigManager:
@@ -83,6 +87,413 @@ class ConfigManager:
         """
         return config.get('wait_time', 3)
     
+    def get_readiness(self, config: Dict[str, Any]) -> str:
+        """
+        Get page readiness mode, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'rows' to wait for listing rows to settle, 'fixed' to always sleep wait_time
+        """
+        return str(config.get('readiness', 'rows')).lower()
+    
+    def get_quiet_period(self, config: Dict[str, Any]) -> float:
+        """
+        Get how long the listing row count must stay unchanged, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Quiet period in seconds
+        """
+        return float(config.get('quiet_period', 0.5))
+    
+    def get_fetcher(self, config: Dict[str, Any]) -> str:
+        """
+        Get the page fetch backend, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'selenium' for the attached Chrome, 'http' for the asyncio HTTP client
+        """
+        backend = str(config.get('fetcher', 'selenium')).lower()
+        if backend not in ('selenium', 'http'):
+            print(f"⚠️ Unknown fetcher '{backend}', using 'selenium'")
+            return 'selenium'
+        return backend
+    
+    def get_http_concurrency(self, config: Dict[str, Any]) -> int:
+        """
+        Get the maximum number of in-flight requests for the HTTP fetcher.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Maximum concurrent HTTP requests
+        """
+        return max(1, int(config.get('http_concurrency', 4)))
+    
+    def get_extraction(self, config: Dict[str, Any]) -> str:
+        """
+        Get where listings are extracted, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'soup' to parse the page source, 'browser' to extract inside the page
+        """
+        return str(config.get('extraction', 'soup')).lower()
+    
+    def get_parser(self, config: Dict[str, Any]) -> str:
+        """
+        Get the HTML parser backend, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'html.parser' (default) or 'lxml' for the faster lxml backend
+        """
+        return str(config.get('parser', 'html.parser')).lower()
+    
+    def get_parse_processes(self, config: Dict[str, Any]) -> int:
+        """
+        Get how many processes parse pages, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Number of parser processes (0 or 1 to parse in the scraping process,
+            'auto' in the configuration gives one per CPU core)
+        """
+        processes = config.get('parse_processes', 0)
+        if str(processes).lower() == 'auto':
+            return os.cpu_count() or 1
+        return max(0, int(processes))
+    
+    def get_parity_check_every(self, config: Dict[str, Any]) -> int:
+        """
+        Get how often in-browser extraction is checked against BeautifulSoup.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Check every Nth page (the first page is always checked)
+        """
+        return max(1, int(config.get('parity_check_every', 10)))
+    
+    def get_prefetch(self, config: Dict[str, Any]) -> int:
+        """
+        Get how many pages sequential scraping fetches ahead of parsing.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Pages to fetch ahead (0 fetches and parses strictly one after the other)
+        """
+        return max(0, int(config.get('prefetch', 1)))
+    
+    def get_base_url(self, config: Dict[str, Any]) -> str:
+        """
+        Get the product base URL, with default fallback.
+        
+        Lets a list point at a local stand-in server instead of CardMarket.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Base URL that card paths are appended to
+        """
+        return config.get('base_url', URLBuilder.BASE_URL)
+    
+    def get_cache_ttl(self, config: Dict[str, Any], card_config: Dict[str, Any]) -> float:
+        """
+        Get how long a cached page stays fresh for a card.
+        
+        A card's own cache_ttl_hours overrides the list's.
+        
+        Args:
+            config: Configuration dictionary
+            card_config: Configuration for the card
+            
+        Returns:
+            TTL in seconds (0 means always fetch, but still store the page)
+        """
+        hours = card_config.get('cache_ttl_hours', config.get('cache_ttl_hours', 0))
+        return float(hours) * 3600
+    
+    def get_cache_dir(self, config: Dict[str, Any]) -> str:
+        """
+        Get the page cache directory, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Directory path for cached pages
+        """
+        return config.get('cache_dir', 'page_cache')
+    
+    def get_cache_max_mb(self, config: Dict[str, Any]) -> float:
+        """
+        Get the page cache size limit, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Maximum cache size in megabytes
+        """
+        return float(config.get('cache_max_mb', 500))
+    
+    def get_resume(self, config: Dict[str, Any]) -> bool:
+        """
+        Get whether to resume from today's scrape journal, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            True to skip cards already scraped today, False to start over
+        """
+        return bool(config.get('resume', True))
+    
+    def get_incremental(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get the incremental scraping settings, with defaults for missing keys.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Dictionary with refresh_after_days, volatility_weight, max_cards,
+            max_minutes and history_days, or None to scrape every card
+        """
+        settings = config.get('incremental')
+        if not settings:
+            return None
+        if not isinstance(settings, dict):
+            settings = {}
+        
+        defaults = {
+            'refresh_after_days': 3,
+            'volatility_weight': 10,
+            'max_cards': 0,
+            'max_minutes': 0,
+            'history_days': 60,
+        }
+        return {key: settings.get(key, default) for key, default in defaults.items()}
+    
+    def get_blocked_patterns(self, config: Dict[str, Any]) -> List[str]:
+        """
+        Get URL patterns the browser should not download.
+        
+        With block_resources enabled, images, fonts and third-party scripts are
+        blocked, plus any extra blocked_url_patterns from the config.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            List of URL patterns (empty when blocking is disabled)
+        """
+        if not config.get('block_resources', False):
+            return []
+        return BLOCKED_URL_PATTERNS + list(config.get('blocked_url_patterns') or [])
+    
+    def get_retries(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get per failure class retry overrides, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Failure class to {max_retries, base_delay}, plus optional max_delay (empty for defaults)
+        """
+        return dict(config.get('retries') or {})
+    
+    def get_circuit_breaker(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get the circuit breaker settings, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Circuit breaker settings (empty for defaults), None if turned off
+        """
+        settings = config.get('circuit_breaker', {})
+        if settings is False:
+            return None
+        return dict(settings) if isinstance(settings, dict) else {}
+    
+    def get_workers(self, config: Dict[str, Any]) -> int:
+        """
+        Get number of parallel scraping workers, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Number of workers (1 means sequential scraping)
+        """
+        return max(1, int(config.get('workers', 1)))
+    
+    def get_browser(self, config: Dict[str, Any]) -> str:
+        """
+        Get how the Selenium fetcher gets its browser, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'attach' for a Chrome started by hand with remote debugging,
+            'launch' for headless Chrome instances started by the scraper
+        """
+        browser = str(config.get('browser', 'attach')).lower()
+        if browser not in ('attach', 'launch'):
+            print(f"⚠️ Unknown browser mode '{browser}', using 'attach'")
+            return 'attach'
+        return browser
+    
+    def get_profile_dir(self, config: Dict[str, Any]) -> str:
+        """
+        Get the directory holding launched Chrome profiles, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Directory path (each instance gets its own subdirectory)
+        """
+        return config.get('profile_dir', 'chrome_profiles')
+    
+    def get_max_browser_memory_mb(self, config: Dict[str, Any]) -> float:
+        """
+        Get the memory limit after which a launched Chrome is restarted.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Limit in megabytes (0 for no limit)
+        """
+        return float(config.get('max_browser_memory_mb', 1500))
+    
+    def get_worker_mode(self, config: Dict[str, Any]) -> str:
+        """
+        Get how parallel workers are backed, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            'tabs' for tabs in one attached Chrome, 'drivers' for separate sessions
+        """
+        mode = str(config.get('worker_mode', 'tabs')).lower()
+        if mode not in ('tabs', 'drivers'):
+            print(f"⚠️ Unknown worker_mode '{mode}', using 'tabs'")
+            return 'tabs'
+        return mode
+    
+    def get_max_per_domain(self, config: Dict[str, Any]) -> int:
+        """
+        Get the cap on concurrent requests per domain, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Maximum number of in-flight requests to the same domain
+        """
+        return max(1, int(config.get('max_per_domain', 2)))
+    
+    def get_debugger_ports(self, config: Dict[str, Any], workers: int) -> List[int]:
+        """
+        Get Chrome remote debugging ports for 'drivers' worker mode.
+        
+        Args:
+            config: Configuration dictionary
+            workers: Number of workers that need a port
+            
+        Returns:
+            One debugging port per worker, counting up from 9222 by default
+        """
+        ports = config.get('debugger_ports') or []
+        return [int(ports[i]) if i < len(ports) else 9222 + i for i in range(workers)]
+    
+    def get_queue(self, config: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the distributed work queue URL, if any.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Queue URL (sqlite:///path.db or redis://host:port/db), None to scrape locally
+        """
+        return config.get('queue') or None
+    
+    def get_lease_seconds(self, config: Dict[str, Any]) -> float:
+        """
+        Get how long a worker may hold a queued job, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Lease duration in seconds (an expired job is handed to another worker)
+        """
+        return float(config.get('lease_seconds', 120))
+    
+    def get_max_attempts(self, config: Dict[str, Any]) -> int:
+        """
+        Get how often a queued job is tried before it counts as failed, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Maximum number of attempts per job
+        """
+        return max(1, int(config.get('max_attempts', 3)))
+    
+    def get_queue_poll_seconds(self, config: Dict[str, Any]) -> float:
+        """
+        Get how often the coordinator checks the work queue for results, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Poll interval in seconds
+        """
+        return float(config.get('queue_poll_seconds', 2))
+    
+    def get_queue_timeout(self, config: Dict[str, Any]) -> float:
+        """
+        Get how long the coordinator waits without any page finishing, with default fallback.
+        
+        Args:
+            config: Configuration dictionary
+            
+        Returns:
+            Timeout in seconds (0 to wait forever)
+        """
+        return max(0.0, float(config.get('queue_timeout_minutes', 30))) * 60
+    
     def get_list_name(self, config: Dict[str, Any]) -> str:
         """
         Get list name from config.
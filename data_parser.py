@@ -3,18 +3,100 @@ Data parsing functionality for CardMarket listings.
 Handles extracting and parsing card listing data from HTML.
 """
 
+import hashlib
+import itertools
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from listing import Listing, ListingBatch, parse_price_cents
+from stage_timer import StageTimer
+
+try:
+    import lxml
+except ImportError:
+    # Only needed for the 'lxml' parser backend
+    lxml = None
+
+
+# 'html.parser' builds the whole page, 'lxml' only the main container holding the listing table
+PARSER_BACKENDS = ('html.parser', 'lxml')
+
+# Part of the page the lxml backend turns into a tree
+MAIN_CONTAINER = SoupStrainer('main', class_='container')
+
+# Patterns used for every row, compiled once
+ROW_ID = re.compile(r'articleRow\d+')
+FIRST_NUMBER = re.compile(r'(\d+)')
+USER_PATH = re.compile(r'/Users/([^/?]+)')
+PRICE_TEXT = re.compile(r'([\d,\.]+)')
+CONDITION_WORDS = ('mint', 'played', 'damaged', 'excellent', 'good', 'poor')
+NOT_LANGUAGE_WORDS = ('mint', 'played', 'damaged')
+
+# Most page layouts (table plans) remembered per parser
+MAX_TABLE_PLANS = 8
+
+# Sections of a listing row, as scope bits
+SELLER, SELLER_INFO, PRODUCT, ATTRIBUTES, OFFER, AMOUNT, PRICE, ITEM_COUNT = (1 << bit for bit in range(8))
+
+# Extraction plan: (tag, exact class attribute) -> (section it opens, section it must be inside).
+# Only the first element of each section counts, like a find() from its parent.
+ROW_SECTIONS = {
+    ('div', 'col-seller col-12 col-lg-auto'): (SELLER, 0),
+    ('span', 'seller-info d-flex align-items-center'): (SELLER_INFO, SELLER),
+    ('div', 'col-product col-12 col-lg'): (PRODUCT, 0),
+    ('div', 'product-attributes col'): (ATTRIBUTES, PRODUCT),
+    ('div', 'col-offer col-auto'): (OFFER, 0),
+    ('span', 'color-primary small text-end text-nowrap fw-bold'): (PRICE, OFFER),
+    ('div', 'amount-container d-none d-md-flex justify-content-end me-3'): (AMOUNT, OFFER),
+    ('span', 'item-count small text-end'): (ITEM_COUNT, AMOUNT),
+}
 
 
 class DataParser:
     """Parses CardMarket listing data from HTML content."""
     
-    def __init__(self):
-        pass
+    def __init__(self, backend: str = 'html.parser'):
+        """
+        Args:
+            backend: Parser backend, one of PARSER_BACKENDS
+        """
+        self.timer = StageTimer()
+        self.backend = 'html.parser'
+        self._table_plans: List[_TablePlan] = []
+        self._plans_lock = threading.Lock()
+        self.set_backend(backend)
     
-    def parse_page_data(self, html_content: str) -> List[Dict[str, Any]]:
+    def set_backend(self, backend: str) -> str:
+        """
+        Choose how pages are turned into a tree.
+        
+        Both backends give identical listings. 'lxml' parses with the lxml C
+        parser and only builds the page's main container, skipping the
+        header, footer and scripts around it.
+        
+        Args:
+            backend: Parser backend, one of PARSER_BACKENDS
+            
+        Returns:
+            Backend in use ('html.parser' if the requested one is unavailable)
+        """
+        if backend not in PARSER_BACKENDS:
+            print(f"⚠️ Unknown parser backend '{backend}', using 'html.parser'")
+            backend = 'html.parser'
+        elif backend == 'lxml' and lxml is None:
+            print("⚠️ lxml is not installed (pip install lxml), using 'html.parser'")
+            backend = 'html.parser'
+        if backend != self.backend:
+            # Paths into the tree differ between backends
+            with self._plans_lock:
+                self._table_plans = []
+        self.backend = backend
+        return backend
+    
+    def parse_page_data(self, html_content: str) -> ListingBatch:
         """
         Parse all listing data from HTML page content.
         
@@ -22,36 +104,152 @@ class DataParser:
             html_content: Raw HTML content from the page
             
         Returns:
-            List of dictionaries containing listing data
+            ListingBatch of the page's listings
         """
-        if not html_content:
-            print("    ❌ No HTML content provided")
-            return []
+        return self.parse_page(html_content)[0]
+    
+    def parse_page(self, html_content: str) -> Tuple[ListingBatch, str]:
+        """
+        Parse all listing data from HTML page content and report how the page looked.
+        
+        Args:
+            html_content: Raw HTML content from the page
+            
+        Returns:
+            Tuple of (ListingBatch; 'ok', 'no_rows' for a listing table without
+            offers, or 'no_table' when no listing table was recognized)
+        """
+        with self.timer.time('parse'):
+            return self._parse_page_data(html_content)
+    
+    def iter_listings(self, html_content: str) -> Iterator[Listing]:
+        """
+        Parse listings one at a time as the caller consumes them.
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        Rows are found and extracted lazily, so a consumer that writes or
+        aggregates each listing as it arrives never holds the whole list.
+        Gives the same listings as parse_page_data.
         
-        # Navigate to the listings table
-        table_body = self._find_listings_table(soup)
+        Args:
+            html_content: Raw HTML content from the page
+            
+        Yields:
+            Listing records, in page order
+        """
+        # Only time spent in here counts as parsing, not the consumer's work
+        elapsed = 0.0
+        start = time.perf_counter()
+        try:
+            table_body, plan = self._parse_table_body(html_content)
+            if not table_body:
+                return
+            
+            for row in self._iter_product_rows(table_body, plan):
+                listing = self._parse_single_row(row)
+                if listing:
+                    elapsed += time.perf_counter() - start
+                    start = None
+                    yield listing
+                    start = time.perf_counter()
+        finally:
+            if start is not None:
+                elapsed += time.perf_counter() - start
+            self.timer.record('parse', elapsed)
+    
+    def _parse_page_data(self, html_content: str) -> Tuple[ListingBatch, str]:
+        """Parse listings without timing (see parse_page)."""
+        table_body, plan = self._parse_table_body(html_content)
         if not table_body:
-            return []
+            return ListingBatch(), 'no_table'
         
         # Find all product rows
-        product_rows = self._find_product_rows(table_body)
+        product_rows = self._find_product_rows(table_body, plan)
         if not product_rows:
             print("    ❌ No product rows found")
-            return []
+            return ListingBatch(), 'no_rows'
         
         print(f"    🔍 Found {len(product_rows)} product rows")
         
         # Parse each row
-        listings = []
+        listings = ListingBatch()
         for i, row in enumerate(product_rows):
             listing = self._parse_single_row(row)
             if listing:
                 listings.append(listing)
         
         print(f"    ✅ Successfully parsed {len(listings)} listings")
-        return listings
+        return listings, 'ok'
+    
+    def _parse_table_body(self, html_content: str) -> Tuple[Optional[Any], Optional['_TablePlan']]:
+        """
+        Build the page tree with the current backend and find the listings table body.
+        
+        Pages with a layout seen before are resolved through its table plan
+        (a path into the tree); other pages are searched and their layout
+        is learned.
+        
+        Args:
+            html_content: Raw HTML content from the page
+            
+        Returns:
+            Tuple of (table body element or None if not found, table plan of the page's layout)
+        """
+        if not html_content:
+            print("    ❌ No HTML content provided")
+            return None, None
+        
+        if self.backend == 'lxml':
+            soup = BeautifulSoup(html_content, 'lxml', parse_only=MAIN_CONTAINER)
+        else:
+            soup = BeautifulSoup(html_content, 'html.parser')
+        
+        for plan in list(self._table_plans):
+            table_body = plan.resolve(soup)
+            if table_body is not None:
+                return table_body, plan
+        
+        # Unknown layout: navigate to the listings table
+        table_body = self._find_listings_table(soup)
+        if not table_body:
+            return None, None
+        return table_body, self._learn_table_plan(soup, table_body)
+    
+    def _learn_table_plan(self, root, table_body) -> Optional['_TablePlan']:
+        """
+        Remember how the table body was reached, so pages with the same layout skip the search.
+        
+        Args:
+            root: Tree the table body was found in
+            table_body: Table body found by the search
+            
+        Returns:
+            Table plan of the layout, None if the table body is not inside root
+        """
+        steps = []
+        element = table_body
+        while element is not root:
+            parent = element.parent
+            if parent is None:
+                return None
+            index = next(i for i, child in enumerate(_tag_children(parent)) if child is element)
+            steps.append((index, _element_signature(element)))
+            element = parent
+        steps.reverse()
+        plan = _TablePlan(tuple(index for index, _ in steps), tuple(signature for _, signature in steps))
+        
+        with self._plans_lock:
+            known = any(existing.fingerprint == plan.fingerprint for existing in self._table_plans)
+            if not known:
+                first = not self._table_plans
+                self._table_plans = [plan] + self._table_plans[:MAX_TABLE_PLANS - 1]
+        if not known:
+            where = (' > '.join(_describe_signature(signature) for signature in plan.signature) +
+                     f" (child positions {'/'.join(str(index) for index in plan.path)})")
+            if first:
+                print(f"    🧭 Page layout {plan.fingerprint}: listing table at {where}")
+            else:
+                print(f"    🧭 Page layout changed, new layout {plan.fingerprint}: listing table at {where}")
+        return plan
     
     def _find_listings_table(self, soup: BeautifulSoup) -> Optional[Any]:
         """
@@ -74,7 +272,19 @@ class DataParser:
             print("    ❌ No mainContent found")
             return None
         
-        table_section = main_content.find('section', id='table')
+        return self._find_table_body(main_content)
+    
+    def _find_table_body(self, root) -> Optional[Any]:
+        """
+        Find the listings table body below the table section.
+        
+        Args:
+            root: Element containing the table section
+            
+        Returns:
+            Table body element or None if not found
+        """
+        table_section = root.find('section', id='table')
         if not table_section:
             print("    ❌ No table section found")
             return None
@@ -91,227 +301,291 @@ class DataParser:
         
         return table_body
     
-    def _find_product_rows(self, table_body) -> List[Any]:
+    def _find_product_rows(self, table_body, plan: Optional['_TablePlan'] = None) -> List[Any]:
         """
         Find all product rows in the table body.
         
         Args:
             table_body: Table body element
+            plan: Table plan of the page's layout; once a page showed that its
+                rows are the table body's children, only the children are checked
             
         Returns:
             List of product row elements
         """
-        return table_body.find_all('div', {'id': re.compile(r'articleRow\d+')})
+        if plan is not None and plan.rows_are_children:
+            rows = self._child_rows(table_body)
+            if rows is not None:
+                return rows
+        
+        rows = table_body.find_all('div', {'id': ROW_ID})
+        if plan is not None and not plan.rows_are_children and rows:
+            children = self._child_rows(table_body)
+            if children is not None and len(children) == len(rows) and all(
+                    child is row for child, row in zip(children, rows)):
+                plan.rows_are_children = True
+        return rows
     
-    def _parse_single_row(self, row) -> Optional[Dict[str, Any]]:
+    def _child_rows(self, table_body) -> Optional[List[Any]]:
+        """Get the table body's children if every one of them is a product row, else None."""
+        rows = []
+        for child in table_body.contents:
+            if type(child) is Tag:
+                if child.name != 'div' or not ROW_ID.search(child.get('id') or ''):
+                    return None
+                rows.append(child)
+        return rows
+    
+    def _iter_product_rows(self, table_body, plan: Optional['_TablePlan'] = None) -> Iterator[Any]:
+        """
+        Yield the product rows of the table body in document order, without collecting them.
+        
+        Args:
+            table_body: Table body element
+            plan: Table plan of the page's layout (see _find_product_rows)
+            
+        Yields:
+            Product row elements (the same ones _find_product_rows returns)
+        """
+        if plan is not None and plan.rows_are_children:
+            rows = self._child_rows(table_body)
+            if rows is not None:
+                yield from rows
+                return
+        for element in table_body.descendants:
+            if type(element) is Tag and element.name == 'div' and ROW_ID.search(element.get('id') or ''):
+                yield element
+    
+    def _parse_single_row(self, row) -> Optional[Listing]:
         """
         Parse a single listing row and extract all data.
         
+        The row's descendants are visited once. Each element is looked up in
+        ROW_SECTIONS to track which section of the row it belongs to, and
+        fills the listing fields that section holds:
+        
+        - seller info: sales count (first number in a sell-count badge's
+          tooltip or text) and username (from a /Users/ link, else link text)
+        - product attributes: condition and its badge (tooltip naming a
+          condition), language (aria-label, else a non-condition tooltip)
+          and edition ('1st' if a tooltip, aria-label or onmouseover says
+          first edition)
+        - offer: price (number in the price text, also as integer cents)
+          and quantity (item count)
+        
         Args:
             row: HTML element representing a single listing row
             
         Returns:
-            Dictionary containing listing data or None if parsing failed
+            Listing record or None if parsing failed
         """
         try:
-            result = self._create_empty_listing()
-            
-            # Extract seller information
-            self._extract_seller_info(row, result)
-            
-            # Extract product information
-            self._extract_product_info(row, result)
-            
-            # Extract offer information (price and quantity)
-            self._extract_offer_info(row, result)
-            
-            return result
+            state = _RowState(self._create_empty_listing())
+            self._visit_row(row, 0, state)
+            return state.result
             
         except Exception as e:
             print(f"    ⚠️ Error parsing row: {e}")
             return None
     
-    def _create_empty_listing(self) -> Dict[str, Any]:
+    def _create_empty_listing(self) -> Listing:
         """
-        Create an empty listing dictionary with default values.
+        Create an empty listing with default values.
         
         Returns:
-            Dictionary with default listing structure
-        """
-        return {
-            'seller_username': '',
-            'seller_sales_count': 0,
-            'condition': '',
-            'condition_badge': '',
-            'language': '',
-            'edition': '',
-            'price': '',
-            'quantity': 1
-        }
+            Listing record with default values
+        """
+        return Listing()
     
-    def _extract_seller_info(self, row, result: Dict[str, Any]):
+    def _visit_row(self, element, scope: int, state: '_RowState'):
         """
-        Extract seller information from the row.
+        Visit the children of an element and fill the listing from them.
         
         Args:
-            row: HTML row element
-            result: Dictionary to store extracted data
+            element: Element whose children are visited
+            scope: Row sections the children are inside
+            state: Listing being filled and the sections already seen
         """
-        seller_section = row.find('div', class_='col-seller col-12 col-lg-auto')
-        if not seller_section:
-            return
-        
-        seller_info_span = seller_section.find('span', class_='seller-info d-flex align-items-center')
-        if not seller_info_span:
-            return
-        
-        # Extract sales count
-        self._extract_sales_count(seller_info_span, result)
-        
-        # Extract username
-        self._extract_username(seller_info_span, result)
-    
-    def _extract_sales_count(self, seller_info_span, result: Dict[str, Any]):
-        """Extract seller sales count."""
-        sales_badges = seller_info_span.find_all('span', class_=re.compile(r'.*sell-count.*'))
-        for badge in sales_badges:
-            tooltip = badge.get('data-bs-original-title', '')
-            text = badge.get_text(strip=True)
+        for child in element.contents:
+            if type(child) is not Tag:
+                continue
+            attrs = child.attrs
+            if scope:
+                self._extract_fields(child, attrs, scope, state)
             
-            for source in [tooltip, text]:
-                if source:
-                    sales_match = re.search(r'(\d+)', source)
-                    if sales_match:
-                        result['seller_sales_count'] = int(sales_match.group(1))
-                        return
-    
-    def _extract_username(self, seller_info_span, result: Dict[str, Any]):
-        """Extract seller username."""
-        all_links = seller_info_span.find_all('a')
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            # Try to extract from URL
-            if '/Users/' in href:
-                username_match = re.search(r'/Users/([^/?]+)', href)
-                if username_match:
-                    result['seller_username'] = username_match.group(1)
-                    return
+            child_scope = scope
+            classes = attrs.get('class')
+            if classes:
+                section = ROW_SECTIONS.get((child.name, ' '.join(classes)))
+                if section and not state.seen & section[0] and scope & section[1] == section[1]:
+                    state.seen |= section[0]
+                    child_scope |= section[0]
+                    if section[0] in (PRICE, ITEM_COUNT):
+                        self._extract_offer_field(child, section[0], state.result)
             
-            # Use link text as fallback
-            if text and len(text) > 2:
-                result['seller_username'] = text
-                return
+            if child.contents:
+                self._visit_row(child, child_scope, state)
     
-    def _extract_product_info(self, row, result: Dict[str, Any]):
+    def _extract_fields(self, element, attrs: Dict[str, Any], scope: int, state: '_RowState'):
         """
-        Extract product information from the row.
+        Fill seller and product fields from one element inside those sections.
         
         Args:
-            row: HTML row element
-            result: Dictionary to store extracted data
+            element: Element inside the row
+            attrs: Attributes of the element
+            scope: Row sections the element is inside
+            state: Listing being filled
         """
-        product_section = row.find('div', class_='col-product col-12 col-lg')
-        if not product_section:
-            return
+        result = state.result
+        if scope & SELLER_INFO:
+            if element.name == 'a':
+                if not state.username_done:
+                    state.username_done = self._extract_username(element, attrs, result)
+            elif element.name == 'span' and not state.sales_done:
+                classes = attrs.get('class')
+                if classes and 'sell-count' in ' '.join(classes):
+                    state.sales_done = self._extract_sales_count(element, attrs, result)
         
-        attributes_section = product_section.find('div', class_='product-attributes col')
-        if not attributes_section:
-            return
+        if scope & ATTRIBUTES:
+            title = attrs.get('data-bs-original-title')
+            aria_label = attrs.get('aria-label')
+            if title is not None:
+                title_lower = title.lower()
+                if not state.condition_done and any(word in title_lower for word in CONDITION_WORDS):
+                    result.condition = title
+                    result.condition_badge = element.get_text(strip=True)
+                    state.condition_done = True
+                if 'first edition' in title_lower or 'first edition' in (aria_label or '').lower():
+                    result.edition = '1st'
+            if aria_label is not None and not state.language_done:
+                state.language_done = self._extract_language(aria_label, title or '', result)
+            if element.name == 'span' and 'first edition' in attrs.get('onmouseover', '').lower():
+                result.edition = '1st'
+    
+    def _extract_sales_count(self, badge, attrs: Dict[str, Any], result: Listing) -> bool:
+        """Extract seller sales count from a sell-count badge; True once found."""
+        for source in (attrs.get('data-bs-original-title', ''), badge.get_text(strip=True)):
+            if source:
+                sales_match = FIRST_NUMBER.search(source)
+                if sales_match:
+                    result.seller_sales_count = int(sales_match.group(1))
+                    return True
+        return False
+    
+    def _extract_username(self, link, attrs: Dict[str, Any], result: Listing) -> bool:
+        """Extract seller username from a seller link; True once found."""
+        href = attrs.get('href', '')
         
-        # Extract condition
-        self._extract_condition(attributes_section, result)
+        # Try to extract from URL
+        if '/Users/' in href:
+            username_match = USER_PATH.search(href)
+            if username_match:
+                result.seller_username = username_match.group(1)
+                return True
         
-        # Extract language
-        self._extract_language(attributes_section, result)
+        # Use link text as fallback
+        text = link.get_text(strip=True)
+        if text and len(text) > 2:
+            result.seller_username = text
+            return True
+        return False
+    
+    def _extract_language(self, aria_label: str, data_title: str, result: Listing) -> bool:
+        """Extract card language from an element with an aria-label; True once found."""
+        if aria_label and len(aria_label) > 2:
+            result.language = aria_label
+            return True
+        if (data_title and len(data_title) > 2 and
+                not any(word in data_title.lower() for word in NOT_LANGUAGE_WORDS)):
+            result.language = data_title
+            return True
+        return False
+    
+    def _extract_offer_field(self, element, section: int, result: Listing):
+        """
+        Extract the price or quantity from its element.
         
-        # Extract edition
-        self._extract_edition(attributes_section, result)
+        Args:
+            element: Price span or item count span of the offer
+            section: PRICE or ITEM_COUNT
+            result: Listing to store extracted data
+        """
+        text = element.get_text(strip=True)
+        if section == PRICE:
+            price_match = PRICE_TEXT.search(text)
+            if price_match:
+                result.price = price_match.group(1)
+            else:
+                result.price = text.replace('€', '').strip()
+            result.price_cents = parse_price_cents(result.price)
+        else:
+            quantity_match = FIRST_NUMBER.search(text)
+            if quantity_match:
+                result.quantity = int(quantity_match.group(1))
+
+
+def _element_signature(element) -> Tuple[str, str, Tuple[str, ...]]:
+    """Get the tag name, id and classes that identify an element on a table path."""
+    return element.name, element.get('id') or '', tuple(element.get('class') or ())
+
+
+def _describe_signature(signature: Tuple[str, str, Tuple[str, ...]]) -> str:
+    """Write an element signature like a CSS selector (main.container, div#mainContent)."""
+    name, element_id, classes = signature
+    return name + (f"#{element_id}" if element_id else '') + ''.join(f".{cls}" for cls in classes)
+
+
+def _tag_children(element) -> Iterator[Tag]:
+    """Iterate an element's child elements, skipping text, comments and whitespace between tags."""
+    return (child for child in element.contents if type(child) is Tag)
+
+
+class _TablePlan:
+    """
+    Resolved path from the page tree to the listings table body, for one page layout.
     
-    def _extract_condition(self, attributes_section, result: Dict[str, Any]):
-        """Extract card condition information."""
-        condition_elements = attributes_section.find_all(attrs={'data-bs-original-title': True})
-        for elem in condition_elements:
-            title = elem.get('data-bs-original-title', '')
-            text = elem.get_text(strip=True)
-            
-            if any(word in title.lower() for word in ['mint', 'played', 'damaged', 'excellent', 'good', 'poor']):
-                result['condition'] = title
-                result['condition_badge'] = text
-                return
+    The path is an element index per level, counting child elements only
+    so whitespace and comments between tags do not matter, checked against
+    the tag name, id and classes seen when the layout was learned; path and
+    signature hashed give the layout's fingerprint. rows_are_children is set once a
+    page of the layout had exactly its table body's children as rows.
+    """
     
-    def _extract_language(self, attributes_section, result: Dict[str, Any]):
-        """Extract card language information."""
-        language_elements = attributes_section.find_all(attrs={'aria-label': True})
-        for elem in language_elements:
-            aria_label = elem.get('aria-label', '')
-            data_title = elem.get('data-bs-original-title', '')
-            
-            if aria_label and len(aria_label) > 2:
-                result['language'] = aria_label
-                return
-            elif (data_title and len(data_title) > 2 and 
-                  not any(word in data_title.lower() for word in ['mint', 'played', 'damaged'])):
-                result['language'] = data_title
-                return
+    __slots__ = ('path', 'signature', 'rows_are_children', 'fingerprint')
     
-    def _extract_edition(self, attributes_section, result: Dict[str, Any]):
-        """Extract card edition information (1st edition only)."""
-        # Check data-bs-original-title attributes
-        edition_elements = attributes_section.find_all(attrs={'data-bs-original-title': True})
-        for elem in edition_elements:
-            title = elem.get('data-bs-original-title', '')
-            aria_label = elem.get('aria-label', '')
-            
-            if 'first edition' in title.lower() or 'first edition' in aria_label.lower():
-                result['edition'] = '1st'
-                return
-        
-        # Check onmouseover attributes
-        first_ed_spans = attributes_section.find_all('span', attrs={'onmouseover': True})
-        for span in first_ed_spans:
-            onmouseover = span.get('onmouseover', '')
-            if 'first edition' in onmouseover.lower():
-                result['edition'] = '1st'
-                return
+    def __init__(self, path: Tuple[int, ...], signature: Tuple[Tuple[str, str, Tuple[str, ...]], ...]):
+        self.path = path
+        self.signature = signature
+        self.rows_are_children = False
+        self.fingerprint = hashlib.sha1(repr((path, signature)).encode()).hexdigest()[:8]
     
-    def _extract_offer_info(self, row, result: Dict[str, Any]):
+    def resolve(self, root) -> Optional[Any]:
         """
-        Extract offer information (price and quantity) from the row.
+        Follow the path in a page tree.
         
         Args:
-            row: HTML row element
-            result: Dictionary to store extracted data
+            root: Page tree built by the same backend
+            
+        Returns:
+            Table body element, None if the page does not have this layout
         """
-        offer_section = row.find('div', class_='col-offer col-auto')
-        if not offer_section:
-            return
-        
-        # Extract price
-        self._extract_price(offer_section, result)
-        
-        # Extract quantity
-        self._extract_quantity(offer_section, result)
+        element = root
+        for index, signature in zip(self.path, self.signature):
+            element = next(itertools.islice(_tag_children(element), index, None), None)
+            if element is None or _element_signature(element) != signature:
+                return None
+        return element
+
+
+class _RowState:
+    """Listing being filled while a row is visited."""
     
-    def _extract_price(self, offer_section, result: Dict[str, Any]):
-        """Extract price information."""
-        price_span = offer_section.find('span', class_='color-primary small text-end text-nowrap fw-bold')
-        if price_span:
-            price_text = price_span.get_text(strip=True)
-            price_match = re.search(r'([\d,\.]+)', price_text)
-            if price_match:
-                result['price'] = price_match.group(1)
-            else:
-                result['price'] = price_text.replace('€', '').strip()
+    __slots__ = ('result', 'seen', 'sales_done', 'username_done', 'condition_done', 'language_done')
     
-    def _extract_quantity(self, offer_section, result: Dict[str, Any]):
-        """Extract quantity information."""
-        quantity_container = offer_section.find('div', class_='amount-container d-none d-md-flex justify-content-end me-3')
-        if quantity_container:
-            item_count_span = quantity_container.find('span', class_='item-count small text-end')
-            if item_count_span:
-                quantity_text = item_count_span.get_text(strip=True)
-                quantity_match = re.search(r'(\d+)', quantity_text)
-                if quantity_match:
-                    result['quantity'] = int(quantity_match.group(1))
+    def __init__(self, result: Listing):
+        self.result = result
+        self.seen = 0
+        self.sales_done = False
+        self.username_done = False
+        self.condition_done = False
+        self.language_done = False
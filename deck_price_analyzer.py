@@ -11,6 +11,15 @@ import warnings
 
 from card_price_analyzer import CardPriceAnalyzer
 
+# Unit price statistic behind each deck total
+TOTAL_PRICES = {
+    'min_price': 'price_min',
+    'max_price': 'price_max',
+    'mean_price': 'price_mean',
+    'median_price': 'price_median',
+    'optimized_price': 'price_min',
+}
+
 
 class DeckPriceEstimator:
     def __init__(self, base_output_path: str = "./output", decks_folder: str = "./decks"):
@@ -287,6 +296,9 @@ class DeckPriceEstimator:
         total_cards_needed = sum(sum(cards.values()) for cards in deck_list.values())
         estimation_results['total_estimation']['total_cards_needed'] = total_cards_needed
 
+        # Totals are summed in whole cents and converted once, so they carry no float drift
+        total_cents = dict.fromkeys(TOTAL_PRICES, 0)
+
         # Process each category
         for category, cards in deck_list.items():
             category_results = {
@@ -299,6 +311,7 @@ class DeckPriceEstimator:
                     'optimized_price': 0
                 }
             }
+            category_cents = dict.fromkeys(TOTAL_PRICES, 0)
 
             for card_name, quantity in cards.items():
                 # Find matching card
@@ -345,8 +358,10 @@ class DeckPriceEstimator:
                     if price_data:
                         # Simple approach: just use minimum price * quantity
                         # This assumes you can get all copies at the minimum price
+                        line_cents = {key: self._to_cents(price_data[stat]) * quantity
+                                      for key, stat in TOTAL_PRICES.items()}
                         optimized_unit_price = price_data['price_min']
-                        optimized_total = optimized_unit_price * quantity
+                        optimized_total = line_cents['optimized_price'] / 100
                         available_quantity = price_data.get('total_quantity', 0)
                         purchase_feasible = available_quantity >= quantity
 
@@ -358,10 +373,10 @@ class DeckPriceEstimator:
                             'source_type': source_type,
                             'unit_prices': price_data,
                             'total_prices': {
-                                'min_total': price_data['price_min'] * quantity,
-                                'max_total': price_data['price_max'] * quantity,
-                                'mean_total': price_data['price_mean'] * quantity,
-                                'median_total': price_data['price_median'] * quantity,
+                                'min_total': line_cents['min_price'] / 100,
+                                'max_total': line_cents['max_price'] / 100,
+                                'mean_total': line_cents['mean_price'] / 100,
+                                'median_total': line_cents['median_price'] / 100,
                                 'optimized_total': optimized_total
                             },
                             'optimized_strategy': {
@@ -375,14 +390,8 @@ class DeckPriceEstimator:
                         category_results['cards'][card_name] = card_estimation
 
                         # Add to category totals
-                        category_results['category_totals']['min_price'] += card_estimation['total_prices']['min_total']
-                        category_results['category_totals']['max_price'] += card_estimation['total_prices']['max_total']
-                        category_results['category_totals']['mean_price'] += card_estimation['total_prices'][
-                            'mean_total']
-                        category_results['category_totals']['median_price'] += card_estimation['total_prices'][
-                            'median_total']
-                        category_results['category_totals']['optimized_price'] += card_estimation['total_prices'][
-                            'optimized_total']
+                        for key, cents in line_cents.items():
+                            category_cents[key] += cents
 
                         # Add to purchase strategy
                         estimation_results['purchase_strategy'].append({
@@ -413,19 +422,22 @@ class DeckPriceEstimator:
                     })
                     estimation_results['total_estimation']['cards_not_found'] += 1
 
+            for key, cents in category_cents.items():
+                category_results['category_totals'][key] = cents / 100
+                total_cents[key] += cents
             estimation_results['categories'][category] = category_results
 
         # Calculate total estimation
-        for category_data in estimation_results['categories'].values():
-            estimation_results['total_estimation']['min_price'] += category_data['category_totals']['min_price']
-            estimation_results['total_estimation']['max_price'] += category_data['category_totals']['max_price']
-            estimation_results['total_estimation']['mean_price'] += category_data['category_totals']['mean_price']
-            estimation_results['total_estimation']['median_price'] += category_data['category_totals']['median_price']
-            estimation_results['total_estimation']['optimized_price'] += category_data['category_totals'][
-                'optimized_price']
+        for key, cents in total_cents.items():
+            estimation_results['total_estimation'][key] = cents / 100
 
         return estimation_results
 
+    @staticmethod
+    def _to_cents(price: float) -> int:
+        """Round a unit price in euros to whole cents."""
+        return round(price * 100)
+
     def find_card_match(self, target_card: str, available_cards: List[str], threshold: float = 0.6) -> Tuple[
         str, float]:
         """
@@ -545,10 +557,6 @@ def main():
     print("🃏 DECK PRICE ESTIMATOR")
     print("=" * 40)
 
-    # Get today's date for analysis
-    today = datetime.now().strftime('%Y-%m-%d')
-    print(f"Using analysis data from: {today}")
-
     # Initialize estimator
     estimator = DeckPriceEstimator("./output", "./decks")
 
@@ -558,11 +566,29 @@ def main():
         print("❌ No deck selected. Exiting.")
         return
 
+    estimate_deck_file(estimator, selected_deck_path)
+
+
+def estimate_deck_file(estimator: DeckPriceEstimator, selected_deck_path: str) -> bool:
+    """
+    Estimate a deck's price from today's data and save the estimates (no prompts)
+
+    Args:
+        estimator: Deck price estimator to use
+        selected_deck_path: Path to the deck YAML file
+
+    Returns:
+        True if estimates were saved, False otherwise
+    """
+    # Get today's date for analysis
+    today = datetime.now().strftime('%Y-%m-%d')
+    print(f"Using analysis data from: {today}")
+
     # Load deck from YAML
     deck_list = estimator.load_deck_from_yaml(selected_deck_path)
     if not deck_list:
         print("❌ Failed to load deck list. Exiting.")
-        return
+        return False
 
     # Get the cards section from YAML
     cards = deck_list.get('cards', {})
@@ -578,7 +604,7 @@ def main():
 
     if 'error' in analysis_data:
         print(f"❌ Error loading analysis data: {analysis_data['error']}")
-        return
+        return False
 
     print(f"✓ Loaded data from {analysis_data['total_excel_files']} Excel files")
 
@@ -633,6 +659,8 @@ def main():
     else:
         print(f"💡 English cards are cheaper by: €{abs(savings):.2f}")
 
+    return True
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
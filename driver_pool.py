@@ -0,0 +1,182 @@
+"""
+Warm pool of headless Chrome instances owned by the scraper.
+Launches one browser per worker with its own profile directory, keeps them
+running for the whole run and replaces any that die or grow too large.
+"""
+
+import os
+import threading
+from typing import Dict, List
+
+from web_driver_manager import WebDriverManager
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """
+    Get the resident memory of a process and all its descendants.
+
+    Reads /proc, so it only works on Linux; elsewhere it reports 0 and the
+    memory limit is never hit.
+
+    Args:
+        pid: Root process id
+
+    Returns:
+        Resident set size in megabytes
+    """
+    children: Dict[int, List[int]] = {}
+    rss_kb: Dict[int, int] = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return 0.0
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/status', 'r') as file:
+                fields = dict(line.split(':', 1) for line in file if ':' in line)
+        except OSError:
+            continue
+        ppid = int(fields.get('PPid', '0').strip() or 0)
+        children.setdefault(ppid, []).append(int(entry))
+        rss_kb[int(entry)] = int(fields.get('VmRSS', '0 kB').split()[0])
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total_kb += rss_kb.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+class DriverPool:
+    """
+    Headless Chrome instances launched and owned by the scraper.
+
+    Every instance is started (and has loaded a blank page) before the first
+    card, so startup cost is paid once per run. Between cards ensure_healthy()
+    restarts an instance that stopped answering or uses more than
+    max_memory_mb, reusing its profile directory.
+    """
+
+    def __init__(self, template: WebDriverManager, size: int, profile_root: str = 'chrome_profiles',
+                 max_memory_mb: float = 1500):
+        """
+        Args:
+            template: Manager whose readiness and blocking settings every instance uses;
+                it becomes the pool's first instance
+            size: Number of browser instances
+            profile_root: Directory holding one profile directory per instance
+            max_memory_mb: Restart an instance whose processes use more than this (0 for no limit)
+        """
+        self.template = template
+        self.size = max(1, size)
+        self.profile_root = profile_root
+        self.max_memory_mb = max_memory_mb
+        self.restarts = 0
+        self.managers: List[WebDriverManager] = [template]
+        for _ in range(1, max(1, size)):
+            manager = WebDriverManager()
+            manager.copy_settings(template)
+            self.managers.append(manager)
+
+        for index, manager in enumerate(self.managers):
+            manager.configure_launch(os.path.join(profile_root, f"worker-{index}"))
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """
+        Launch and warm up every instance.
+
+        Instances still running from an earlier run (a kept pool) are reused
+        with the template's current settings instead of being relaunched.
+
+        Returns:
+            True if at least one instance is ready (instances that fail are dropped)
+        """
+        running = [manager for manager in self.managers if manager.is_alive()]
+        for manager in running:
+            if manager is not self.template:
+                manager.copy_settings(self.template)
+        if running:
+            print(f"♨️ Reusing {len(running)} running Chrome instance(s)")
+        if len(running) < len(self.managers):
+            print(f"🚀 Launching {len(self.managers) - len(running)} headless Chrome instance(s)...")
+        ready = [manager for manager in self.managers if manager in running or self._launch(manager)]
+        if ready and len(ready) < len(self.managers):
+            print(f"⚠️ Only {len(ready)} of {len(self.managers)} Chrome instances started")
+        # The template stays first even if it failed, so CardScraper keeps its manager
+        self.managers = ready or self.managers[:1]
+        return bool(ready)
+
+    def _launch(self, manager: WebDriverManager) -> bool:
+        """Start one instance on its profile directory and load a blank page."""
+        os.makedirs(manager.profile_dir, exist_ok=True)
+        # A crashed Chrome leaves its profile lock behind and refuses to start
+        lock_file = os.path.join(manager.profile_dir, 'SingletonLock')
+        if os.path.lexists(lock_file):
+            os.remove(lock_file)
+
+        if not manager.create_driver():
+            return False
+        try:
+            manager.driver.get('about:blank')
+        except Exception as e:
+            print(f"  ⚠️ Chrome instance did not warm up: {e}")
+            manager.close_driver()
+            return False
+        return True
+
+    def memory_mb(self, manager: WebDriverManager) -> float:
+        """
+        Get the memory used by an instance's driver and browser processes.
+
+        Args:
+            manager: Pool instance
+
+        Returns:
+            Resident memory in megabytes (0 if unknown)
+        """
+        pid = manager.get_browser_pid()
+        return process_tree_rss_mb(pid) if pid else 0.0
+
+    def ensure_healthy(self, manager: WebDriverManager) -> bool:
+        """
+        Restart an instance if it died or uses too much memory.
+
+        Args:
+            manager: Pool instance about to be used
+
+        Returns:
+            True if the instance is ready for the next card
+        """
+        reason = None
+        if not manager.is_alive():
+            reason = "not responding"
+        elif self.max_memory_mb:
+            memory = self.memory_mb(manager)
+            if memory > self.max_memory_mb:
+                reason = f"using {memory:.0f} MB"
+
+        if reason is None:
+            return True
+
+        print(f"  ♻️ Restarting Chrome instance ({reason})")
+        with self._lock:
+            self.restarts += 1
+        manager.close_driver()
+        manager.driver = None
+        if self._launch(manager):
+            return True
+        print(f"  ❌ Failed to restart Chrome instance")
+        return False
+
+    def close(self):
+        """Shut down every instance."""
+        for manager in self.managers:
+            manager.close_driver()
+        if self.restarts:
+            print(f"♻️ Chrome instances restarted {self.restarts} time(s) during the run")
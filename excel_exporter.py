@@ -3,27 +3,72 @@ Excel export functionality for CardMarket scraping results.
 Handles creating Excel files with proper formatting and organization.
 """
 
-import pandas as pd
+import itertools
+import math
 import os
 from datetime import datetime
-from typing import Dict, List, Any
-from openpyxl.styles import Font
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils import get_column_letter
 
+from listing import LISTING_FIELDS, Listing, ListingBatch
+from snapshot_history import LAST_SCRAPED_MARKER, NOT_SCRAPED_MARKER, SCRAPE_FAILED_MARKER
+from stage_timer import StageTimer
+
+
+# Columns of a sheet, also written for cards without listings
+LISTING_COLUMNS = list(LISTING_FIELDS)
+
+# Data header starts at this row, below the URL and marker rows
+HEADER_ROW = 4
+
+# Rows the column widths are worked out from; the rest are written as they come
+WIDTH_SAMPLE_ROWS = 200
+
+# Header cell style, as pandas (2.x) to_excel writes DataFrame headers
+THIN = Side(style='thin')
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
 
 class ExcelExporter:
     """Exports scraped data to Excel files with proper formatting."""
 
     def __init__(self):
-        pass
+        self.timer = StageTimer()
+
+    def save_to_excel(self, scraped_data: Union[Dict[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]],
+                      list_name: str, summary: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """
+        Write a list's workbook, one sheet at a time.
 
-    def save_to_excel(self, scraped_data: Dict[str, Dict[str, Any]], list_name: str) -> bool:
+        Sheets go to a write-only workbook: each sheet is written out and
+        released before the next one is read, so scraped_data can be a
+        generator that loads every card's listings only when its sheet is due.
+
+        Args:
+            scraped_data: Sheet name to sheet data (listings, url and optionally
+                last_scraped or failure), as a dictionary or (sheet_name, sheet_data) pairs
+            list_name: Base name for the file
+            summary: Filled with each sheet's counts for print_summary (optional)
+
+        Returns:
+            True if the workbook was saved, False otherwise
+        """
         filename = self._generate_filename(list_name)
+        sheets = scraped_data.items() if isinstance(scraped_data, dict) else scraped_data
 
         try:
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                for sheet_name, sheet_data in scraped_data.items():
-                    self._create_sheet(writer, sheet_name, sheet_data)
+            with self.timer.time('save_to_excel'):
+                workbook = Workbook(write_only=True)
+                for sheet_name, sheet_data in sheets:
+                    sheet_summary = self._create_sheet(workbook, sheet_name, sheet_data)
+                    if summary is not None:
+                        summary[sheet_name] = sheet_summary
+                workbook.save(filename)
 
             print(f"✅ Data saved to {filename}")
             print(f"💡 Each sheet has a clickable URL in cell A1, data starts at row 4")
@@ -33,6 +78,31 @@ class ExcelExporter:
             print(f"❌ Error saving Excel file: {e}")
             return False
 
+    def get_journal_path(self, list_name: str) -> str:
+        """
+        Get the path of today's scrape journal for a list.
+        The journal lives next to the workbook it is assembled into.
+
+        Args:
+            list_name: Base name for the file
+
+        Returns:
+            Journal file path in the date-based output folder
+        """
+        return self._generate_filename(list_name).replace('.xlsx', '.journal.jsonl')
+
+    def get_timings_path(self, list_name: str) -> str:
+        """
+        Get the path of today's stage timing report for a list.
+
+        Args:
+            list_name: Base name for the file
+
+        Returns:
+            Report file path in the date-based output folder
+        """
+        return self._generate_filename(list_name).replace('.xlsx', '.timings.json')
+
     def _generate_filename(self, list_name: str) -> str:
         """
         Generate filename with date-based folder structure.
@@ -60,104 +130,190 @@ class ExcelExporter:
         # Return full path
         return os.path.join(output_dir, filename)
     
-    def _create_sheet(self, writer: pd.ExcelWriter, sheet_name: str, sheet_data: Dict[str, Any]):
+    def _create_sheet(self, workbook: Workbook, sheet_name: str, sheet_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a single sheet in the Excel file.
         
         Args:
-            writer: Excel writer object
+            workbook: Write-only workbook
             sheet_name: Name of the sheet
-            sheet_data: Dictionary containing listings and URL
+            sheet_data: Dictionary containing listings (a ListingBatch, or Listing records or
+                listing dictionaries as a list or any iterable) and URL
+            
+        Returns:
+            Summary of the sheet for print_summary
         """
-        listings = sheet_data['listings']
+        # One card's listings at a time; an iterator is consumed here, row by row
+        columns, rows = self._listing_rows(sheet_data['listings'])
         url = sheet_data['url']
+        worksheet = workbook.create_sheet(sheet_name)
         
-        if listings:
-            self._create_data_sheet(writer, sheet_name, listings, url)
+        # Widths have to be set before the first row, so they come from the first rows only
+        sample = list(itertools.islice(rows, WIDTH_SAMPLE_ROWS))
+        if sample:
+            with self.timer.time('format_columns'):
+                self._format_sheet_columns(worksheet, url, columns, sample)
+        
+        self._add_url_to_sheet(worksheet, url)
+        if sheet_data.get('last_scraped'):
+            self._add_last_scraped_marker(worksheet, sheet_data['last_scraped'])
+        elif sheet_data.get('failure'):
+            self._add_failure_marker(worksheet, sheet_data['failure'])
+        elif sheet_data.get('not_scraped'):
+            self._add_not_scraped_marker(worksheet, sheet_data['not_scraped'])
+        else:
+            worksheet.append([])
+        
+        # Write data starting at row 4 to leave room for URL
+        for _ in range(HEADER_ROW - 3):
+            worksheet.append([])
+        worksheet.append([self._header_cell(worksheet, column) for column in columns])
+        price_index = columns.index('price') if 'price' in columns else None
+        count = with_price = 0
+        for row in itertools.chain(sample, rows):
+            worksheet.append(row)
+            count += 1
+            if price_index is not None and row[price_index]:
+                with_price += 1
+        
+        if count:
+            print(f"  ✅ Created sheet '{sheet_name}' with {count} listings + URL")
         else:
-            self._create_empty_sheet(writer, sheet_name, url)
+            print(f"  ⚠️ Created empty sheet '{sheet_name}' with URL")
+        
+        return {
+            'listings': count,
+            'with_price': with_price,
+            'last_scraped': sheet_data.get('last_scraped'),
+            'failure': sheet_data.get('failure'),
+            'not_scraped': sheet_data.get('not_scraped'),
+        }
     
-    def _create_data_sheet(self, writer: pd.ExcelWriter, sheet_name: str, 
-                          listings: List[Dict[str, Any]], url: str):
+    def _listing_rows(self, listings: Iterable[Any]) -> Tuple[List[str], Iterator[Sequence[Any]]]:
         """
-        Create a sheet with listing data.
+        Turn listings into sheet rows.
+        
+        Parsed listings have the fixed listing columns, so their rows are
+        produced one at a time as they are written. Listing dictionaries
+        (e.g. read back from a sheet) may bring extra columns on any row and
+        are read in full first.
         
         Args:
-            writer: Excel writer object
-            sheet_name: Name of the sheet
-            listings: List of listing dictionaries
-            url: Source URL for the data
+            listings: ListingBatch, or Listing records or listing dictionaries
+                (a list or any iterable, including generators)
+            
+        Returns:
+            Tuple of (columns in first-seen order, iterator over one row of values per listing)
         """
-        # Create DataFrame
-        df = pd.DataFrame(listings)
+        if isinstance(listings, ListingBatch):
+            # Values straight from the column arrays
+            return LISTING_COLUMNS, listings.rows()
         
-        # Write data starting at row 4 to leave room for URL
-        df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=3)
+        listings = iter(listings)
+        first = next(listings, None)
+        if first is None:
+            return LISTING_COLUMNS, iter(())
+        listings = itertools.chain([first], listings)
+        if isinstance(first, Listing):
+            # Records, e.g. from DataParser.iter_listings
+            return LISTING_COLUMNS, (listing.as_tuple() if isinstance(listing, Listing)
+                                     else Listing.from_dict(listing).as_tuple() for listing in listings)
         
-        # Get worksheet and add formatting
-        worksheet = writer.sheets[sheet_name]
-        self._add_url_to_sheet(worksheet, url)
-        self._format_sheet_columns(worksheet)
+        listings = [listing.to_dict() if isinstance(listing, Listing) else listing for listing in listings]
+        columns = list(listings[0])
+        for listing in listings:
+            if len(listing) != len(columns) or any(key not in listing for key in columns):
+                columns.extend(key for key in listing if key not in columns)
         
-        print(f"  ✅ Created sheet '{sheet_name}' with {len(listings)} listings + URL")
+        rows = []
+        for listing in listings:
+            row = [listing.get(column) for column in columns]
+            # Missing values stay blank cells
+            rows.append([None if isinstance(value, float) and math.isnan(value) else value
+                         for value in row])
+        return columns, iter(rows)
+    
+    def _header_cell(self, worksheet, column: str) -> WriteOnlyCell:
+        """Create a styled column header cell."""
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = HEADER_FONT
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        return cell
     
-    def _create_empty_sheet(self, writer: pd.ExcelWriter, sheet_name: str, url: str):
+    def _add_url_to_sheet(self, worksheet, url: str):
         """
-        Create an empty sheet with headers and URL.
+        Add clickable URL to cell A1 (the sheet's first row).
         
         Args:
-            writer: Excel writer object
-            sheet_name: Name of the sheet
-            url: Source URL for the data
+            worksheet: Write-only worksheet
+            url: URL to add
         """
-        # Create empty DataFrame with headers
-        empty_df = pd.DataFrame(columns=[
-            'seller_username', 'seller_sales_count', 'condition',
-            'condition_badge', 'language', 'edition', 'price', 'quantity'
-        ])
-        
-        # Write headers starting at row 4
-        empty_df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=3)
+        cell = WriteOnlyCell(worksheet, value=url)
+        cell.hyperlink = url
+        cell.font = Font(color="0563C1", underline="single")
+        worksheet.append([cell])
+    
+    def _add_last_scraped_marker(self, worksheet, last_scraped: str):
+        """
+        Mark a sheet as carried over from an earlier snapshot in cell A2 (the sheet's second row).
         
-        # Add URL and formatting
-        worksheet = writer.sheets[sheet_name]
-        self._add_url_to_sheet(worksheet, url)
+        Args:
+            worksheet: Write-only worksheet
+            last_scraped: Date (YYYY-MM-DD) the listings were scraped
+        """
+        cell = WriteOnlyCell(worksheet, value=f"{LAST_SCRAPED_MARKER} {last_scraped} (not refreshed in this run)")
+        cell.font = Font(italic=True, color="808080")
+        worksheet.append([cell])
+    
+    def _add_failure_marker(self, worksheet, failure: str):
+        """
+        Mark a sheet whose card could not be scraped in cell A2 (the sheet's second row).
         
-        print(f"  ⚠️ Created empty sheet '{sheet_name}' with URL")
+        Args:
+            worksheet: Write-only worksheet
+            failure: Failure class of the last attempt (timeout, wrong_site, ...)
+        """
+        cell = WriteOnlyCell(worksheet, value=f"{SCRAPE_FAILED_MARKER} {failure} (listings unknown, not an empty card)")
+        cell.font = Font(italic=True, color="C00000")
+        worksheet.append([cell])
     
-    def _add_url_to_sheet(self, worksheet, url: str):
+    def _add_not_scraped_marker(self, worksheet, reason: str):
         """
-        Add clickable URL to cell A1.
+        Mark a sheet whose card was left for a later run in cell A2 (the sheet's second row).
         
         Args:
-            worksheet: Excel worksheet object
-            url: URL to add
+            worksheet: Write-only worksheet
+            reason: Why the card was not scraped (over max_cards, out of time budget)
         """
-        worksheet['A1'] = url
-        worksheet['A1'].hyperlink = url
-        worksheet['A1'].font = Font(color="0563C1", underline="single")
+        cell = WriteOnlyCell(worksheet, value=f"{NOT_SCRAPED_MARKER} {reason} (listings unknown, not an empty card)")
+        cell.font = Font(italic=True, color="808080")
+        worksheet.append([cell])
     
-    def _format_sheet_columns(self, worksheet):
+    def _format_sheet_columns(self, worksheet, url: str, columns: List[str], rows: List[Sequence[Any]]):
         """
         Auto-adjust column widths for better readability.
         
+        A write-only sheet needs its widths before any row is written, so
+        they are worked out from the first WIDTH_SAMPLE_ROWS rows about to be
+        written. Blank cells count as 4 characters, like openpyxl's 'None'.
+        
         Args:
-            worksheet: Excel worksheet object
+            worksheet: Write-only worksheet
+            url: URL written to cell A1
+            columns: Column headers
+            rows: Sample of the data rows
         """
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+        for index, column in enumerate(columns):
+            max_length = max(4, len(str(column)), len(url) if index == 0 else 0)
+            for row in rows:
+                value = row[index]
+                if value is not None and len(str(value)) > max_length:
+                    max_length = len(str(value))
             
             # Set width with padding, but cap at reasonable maximum
             adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+            worksheet.column_dimensions[get_column_letter(index + 1)].width = adjusted_width
     
     def clean_sheet_name(self, card_name: str) -> str:
         """
@@ -178,24 +334,27 @@ class ExcelExporter:
         
         return sheet_name
     
-    def print_summary(self, scraped_data: Dict[str, Dict[str, Any]]):
+    def print_summary(self, summary: Dict[str, Dict[str, Any]]):
         """
         Print summary statistics of the exported data.
 
         Args:
-            scraped_data: Dictionary containing all scraped data
+            summary: Per-sheet counts filled in by save_to_excel
         """
-        total_listings = sum(len(sheet_data['listings']) for sheet_data in scraped_data.values())
-        total_sheets = len(scraped_data)
+        total_listings = sum(sheet['listings'] for sheet in summary.values())
+        total_sheets = len(summary)
 
         print(f"\n📊 EXPORT SUMMARY:")
         print(f"   Total sheets: {total_sheets}")
         print(f"   Total listings: {total_listings}")
 
-        for sheet_name, sheet_data in scraped_data.items():
-            listings = sheet_data['listings']
-            if listings:
-                with_price = sum(1 for item in listings if item['price'])
-                print(f"   {sheet_name}: {len(listings)} listings ({with_price} with price)")
+        for sheet_name, sheet in summary.items():
+            carried = f" [last scraped {sheet['last_scraped']}]" if sheet['last_scraped'] else ""
+            if sheet['failure']:
+                carried = f" [scrape failed: {sheet['failure']}]"
+            elif sheet['not_scraped']:
+                carried = f" [not scraped yet: {sheet['not_scraped']}]"
+            if sheet['listings']:
+                print(f"   {sheet_name}: {sheet['listings']} listings ({sheet['with_price']} with price){carried}")
             else:
-                print(f"   {sheet_name}: 0 listings")
\ No newline at end of file
+                print(f"   {sheet_name}: 0 listings{carried}")
\ No newline at end of file
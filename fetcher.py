@@ -0,0 +1,293 @@
+"""
+Page fetching backends for the CardMarket scraper.
+Defines the Fetcher interface CardScraper depends on and the Selenium backend.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from browser_extractor import BrowserExtraction, LISTING_EXTRACTION_SCRIPT
+from driver_pool import DriverPool
+from listing import ListingBatch
+from stage_timer import StageTimer
+from web_driver_manager import WebDriverManager, TabSession
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single page."""
+
+    url: str
+    status: str = 'ok'
+    html: str = ''
+    final_url: str = ''
+    wait_seconds: float = 0.0
+    wait_mode: str = ''
+    error: str = ''
+    http_status: int = 0
+    bytes_transferred: int = 0
+    load_seconds: float = 0.0
+    listings: Optional[ListingBatch] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+def on_expected_site(final_url: str, requested_url: str) -> bool:
+    """
+    Check that a fetch ended up on CardMarket (or the host that was requested).
+
+    Args:
+        final_url: URL the fetch ended on, after redirects
+        requested_url: URL that was requested
+
+    Returns:
+        True if the final page is on the expected site
+    """
+    if not final_url:
+        return False
+    if 'cardmarket.com' in final_url:
+        return True
+    return urlparse(final_url).netloc == urlparse(requested_url).netloc
+
+
+class Fetcher:
+    """
+    Base class for page fetch backends.
+
+    Statuses reported in FetchResult:
+        ok                 Page fetched, HTML (or listings extracted in the page) available
+        navigation_failed  Request or page load failed
+        wrong_site         Ended up somewhere other than the requested site
+        empty              Page loaded but no HTML came back
+        not_cached         Page not in the page cache (cache-only fetching for --reparse)
+    """
+
+    name = 'base'
+
+    # Whether pages come from a browser session (kept open between runs with keep_browser)
+    uses_browser = False
+
+    def open(self) -> bool:
+        """
+        Prepare the backend for fetching.
+
+        Returns:
+            True if ready, False otherwise
+        """
+        return True
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+    def fetch(self, url: str, wait_time: int = 3) -> FetchResult:
+        """
+        Fetch a single page.
+
+        Args:
+            url: URL to fetch
+            wait_time: Render wait hint in seconds (ignored by backends that do not render)
+
+        Returns:
+            FetchResult for the page
+        """
+        raise NotImplementedError
+
+    def invalidate(self, url: str):
+        """
+        Forget anything kept for a URL, so the next fetch loads it afresh.
+
+        Args:
+            url: URL whose stored page is not to be served again
+        """
+
+    def fetch_many(self, urls: List[str], wait_time: int = 3) -> List[FetchResult]:
+        """
+        Fetch several pages, returning results in input order.
+
+        Args:
+            urls: URLs to fetch
+            wait_time: Render wait hint in seconds
+
+        Returns:
+            List of FetchResult in the same order as urls
+        """
+        return [self.fetch(url, wait_time) for url in urls]
+
+    def worker_fetchers(self, count: int) -> Tuple[List['Fetcher'], Callable[[], None]]:
+        """
+        Get fetchers for parallel workers.
+
+        Backends that are safe to call from several threads return themselves
+        once per worker.
+
+        Args:
+            count: Number of workers
+
+        Returns:
+            Tuple of (fetchers, cleanup function)
+        """
+        return [self] * count, lambda: None
+
+
+class SeleniumFetcher(Fetcher):
+    """Fetches fully rendered pages through a Chrome WebDriver session."""
+
+    name = 'selenium'
+    uses_browser = True
+
+    def __init__(self, session: Any, worker_mode: str = 'tabs',
+                 debugger_ports: Optional[List[int]] = None,
+                 extraction: Optional[BrowserExtraction] = None,
+                 pool: Optional[DriverPool] = None,
+                 timer: Optional[StageTimer] = None):
+        """
+        Args:
+            session: WebDriverManager or TabSession to fetch with
+            worker_mode: 'tabs' or 'drivers', used by worker_fetchers
+            debugger_ports: Debugging ports for 'drivers' mode
+            extraction: Extract listings inside the page instead of returning
+                the page source, None to always return the page source
+            pool: Launched Chrome instances to run on instead of an attached Chrome
+            timer: Collects navigate, wait and page_source timings
+        """
+        self.session = session
+        self.worker_mode = worker_mode
+        self.debugger_ports = debugger_ports or []
+        self.extraction = extraction
+        self.pool = pool
+        self.timer = timer or StageTimer()
+
+    def open(self) -> bool:
+        if self.pool:
+            return self.pool.start()
+        if isinstance(self.session, WebDriverManager) and not self.session.is_alive():
+            # A session kept from an earlier run may have been closed in the meantime
+            self.session.driver = None
+            return self.session.create_driver() is not None
+        return True
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+        elif isinstance(self.session, WebDriverManager):
+            self.session.close_driver()
+
+    def fetch(self, url: str, wait_time: int = 3) -> FetchResult:
+        result = FetchResult(url=url)
+
+        if self.pool and not self.pool.ensure_healthy(self.session):
+            result.status = 'navigation_failed'
+            result.error = "(browser unavailable)"
+            return result
+
+        with self.timer.time('navigate'):
+            navigated = self.session.navigate_to_url(url, wait_time)
+        result.wait_seconds = self.session.last_wait_seconds
+        result.wait_mode = self.session.last_wait_mode
+        self.timer.record('wait', result.wait_seconds)
+        if not navigated:
+            result.status = 'navigation_failed'
+            result.error = self.session.last_error
+            return result
+
+        result.final_url = self.session.get_current_url()
+        if not on_expected_site(result.final_url, url):
+            result.status = 'wrong_site'
+            return result
+
+        metrics = self.session.get_page_metrics()
+        result.bytes_transferred = int(metrics.get('bytes') or 0)
+        result.load_seconds = float(metrics.get('load_ms') or 0) / 1000
+
+        if self.extraction and self.extraction.enabled:
+            listings = self.session.run_script(LISTING_EXTRACTION_SCRIPT)
+            if isinstance(listings, list):
+                listings = ListingBatch(listings)
+                if not self.extraction.needs_parity_check():
+                    result.listings = listings
+                    return result
+                result.html = self._get_page_source()
+                if result.html:
+                    fallback = self.extraction.verify(listings, result.html)
+                    result.listings = listings if fallback is None else fallback
+                    return result
+            else:
+                print(f"  ⚠️ In-page extraction found no listing table or failed, falling back to page source")
+
+        if not result.html:
+            result.html = self._get_page_source()
+        if not result.html:
+            result.status = 'empty'
+        return result
+
+    def _get_page_source(self) -> str:
+        with self.timer.time('page_source'):
+            return self.session.get_page_source()
+
+    def worker_fetchers(self, count: int) -> Tuple[List[Fetcher], Callable[[], None]]:
+        manager = self.session
+        if self.pool:
+            # One launched instance per worker, all shut down with the pool
+            fetchers = [SeleniumFetcher(instance, extraction=self.extraction, pool=self.pool,
+                                        timer=self.timer)
+                        for instance in self.pool.managers[:count]]
+            return fetchers, lambda: None
+
+        if self.worker_mode == 'tabs':
+            handles = manager.open_tabs(count)
+            lock = threading.Lock()
+            fetchers = [SeleniumFetcher(TabSession(manager, handle, lock), extraction=self.extraction,
+                                        timer=self.timer)
+                        for handle in handles]
+            return fetchers, lambda: manager.close_tabs(handles)
+
+        # One independent driver per debugging port; the first one is ours
+        fetchers = [self]
+        extra_managers = []
+        for port in self.debugger_ports[1:count]:
+            extra = WebDriverManager(f"127.0.0.1:{port}")
+            extra.copy_settings(manager)
+            if extra.create_driver():
+                extra_managers.append(extra)
+                fetchers.append(SeleniumFetcher(extra, extraction=self.extraction, timer=self.timer))
+            else:
+                print(f"⚠️ Skipping worker on port {port}")
+
+        def cleanup():
+            for extra in extra_managers:
+                extra.close_driver()
+
+        return fetchers, cleanup
+
+
+def create_fetcher(backend: str, web_driver: WebDriverManager, **options) -> Fetcher:
+    """
+    Create a fetch backend by name.
+
+    Args:
+        backend: 'selenium' or 'http'
+        web_driver: Driver manager used by the Selenium backend
+        **options: Backend specific options
+
+    Returns:
+        Fetcher instance
+    """
+    if backend == 'http':
+        from http_fetcher import AsyncHTTPFetcher
+        return AsyncHTTPFetcher(
+            max_concurrency=options.get('http_concurrency', 4),
+            limit_per_host=options.get('max_per_domain', 2),
+        )
+
+    return SeleniumFetcher(
+        web_driver,
+        worker_mode=options.get('worker_mode', 'tabs'),
+        debugger_ports=options.get('debugger_ports'),
+        extraction=options.get('extraction'),
+        pool=options.get('driver_pool'),
+        timer=options.get('timer'),
+    )
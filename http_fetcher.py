@@ -0,0 +1,142 @@
+"""
+Asyncio HTTP fetch backend for the CardMarket scraper.
+Fetches raw page HTML over pooled keep-alive connections, without a browser.
+"""
+
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+import aiohttp
+
+from fetcher import Fetcher, FetchResult, on_expected_site
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class AsyncHTTPFetcher(Fetcher):
+    """
+    Fetches pages with an aiohttp client running on a background event loop.
+
+    One ClientSession is kept for the whole run, so connections are pooled and
+    reused. fetch() is thread-safe, which lets parallel scraping workers share
+    a single instance; the number of requests in flight is bounded by
+    max_concurrency overall and limit_per_host per host.
+    """
+
+    name = 'http'
+
+    def __init__(self, max_concurrency: int = 4, limit_per_host: int = 2,
+                 timeout: float = 30, headers: Optional[dict] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit_per_host = max(1, limit_per_host)
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+
+    def open(self) -> bool:
+        if self._loop:
+            return True
+
+        try:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever,
+                                            name="http-fetcher-loop", daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._start_session(), self._loop).result()
+            print(f"✅ HTTP fetcher ready (max {self.max_concurrency} concurrent, "
+                  f"{self.limit_per_host} per host)")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to start HTTP fetcher: {e}")
+            self.close()
+            return False
+
+    async def _start_session(self):
+        """Create the pooled client session on the fetcher's event loop."""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=30,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def close(self):
+        if not self._loop:
+            return
+
+        try:
+            if self._session:
+                asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        except Exception as e:
+            print(f"  ⚠️ Error closing HTTP session: {e}")
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            self._session = None
+            print("  🔒 HTTP fetcher closed")
+
+    async def _fetch_async(self, url: str) -> FetchResult:
+        """Fetch one page, waiting for a free concurrency slot first."""
+        result = FetchResult(url=url, wait_mode='http')
+        start_time = time.time()
+
+        async with self._semaphore:
+            try:
+                print(f"  📍 Fetching: {url}")
+                async with self._session.get(url) as response:
+                    result.final_url = str(response.url)
+                    result.http_status = response.status
+                    if response.status >= 400:
+                        result.status = 'navigation_failed'
+                        result.error = f"HTTP {response.status}"
+                        return result
+                    body = await response.read()
+                    result.bytes_transferred = response.content_length or len(body)
+                    result.html = body.decode(response.get_encoding(), errors='replace')
+            except Exception as e:
+                result.status = 'navigation_failed'
+                result.error = str(e) or type(e).__name__
+                return result
+            finally:
+                result.wait_seconds = time.time() - start_time
+                result.load_seconds = result.wait_seconds
+
+        if not on_expected_site(result.final_url, url):
+            result.status = 'wrong_site'
+        elif not result.html:
+            result.status = 'empty'
+        return result
+
+    def fetch(self, url: str, wait_time: int = 3) -> FetchResult:
+        if not self._loop:
+            return FetchResult(url=url, status='navigation_failed', error="HTTP fetcher not open")
+
+        return asyncio.run_coroutine_threadsafe(self._fetch_async(url), self._loop).result()
+
+    def fetch_many(self, urls: List[str], wait_time: int = 3) -> List[FetchResult]:
+        if not self._loop:
+            return [self.fetch(url, wait_time) for url in urls]
+
+        async def gather():
+            return await asyncio.gather(*(self._fetch_async(url) for url in urls))
+
+        return list(asyncio.run_coroutine_threadsafe(gather(), self._loop).result())
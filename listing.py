@@ -0,0 +1,285 @@
+"""
+Listing records shared by the parser, exporter and analyzers.
+A Listing holds one offer in fixed slots; a ListingBatch holds a page of
+offers column by column, with repeated strings interned and numbers in arrays.
+Prices are kept as scraped text and as integer euro cents.
+"""
+
+import math
+import re
+import sys
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Fields of a listing, in column order
+LISTING_FIELDS = ('seller_username', 'seller_sales_count', 'condition', 'condition_badge',
+                  'language', 'edition', 'price', 'price_cents', 'quantity')
+
+# Values of a listing before anything was extracted
+LISTING_DEFAULTS = ('', 0, '', '', '', '', '', None, 1)
+
+# Columns with few distinct values across offers, stored once per distinct string
+INTERNED_FIELDS = ('seller_username', 'condition', 'condition_badge', 'language', 'edition')
+
+# Integer columns, stored in arrays
+INTEGER_FIELDS = ('seller_sales_count', 'price_cents', 'quantity')
+
+# Currency symbols and spaces around a scraped price
+PRICE_NOISE = re.compile(r'[€$£\s]')
+
+
+def parse_price_cents(price: Any) -> Optional[int]:
+    """
+    Convert a price ("1.234,56", "0,50 €", 3.5) to whole euro cents.
+
+    A comma is the decimal separator; dots are thousands separators when a
+    comma is present too. Text is converted exactly, without going through
+    a float.
+
+    Args:
+        price: Price as scraped or as read back from a workbook
+
+    Returns:
+        Price in cents, None if it cannot be read
+    """
+    if isinstance(price, bool):
+        return None
+    if isinstance(price, int):
+        return price * 100
+    if isinstance(price, float):
+        return round(price * 100) if math.isfinite(price) else None
+
+    text = PRICE_NOISE.sub('', str(price or ''))
+    if '.' in text and ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    elif ',' in text:
+        text = text.replace(',', '.')
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return int((amount * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def listing_price_cents(listing: Any) -> Optional[int]:
+    """
+    Get a listing's price in cents, from price_cents or else its price text.
+
+    Args:
+        listing: Listing record or listing dictionary (e.g. from an older journal)
+
+    Returns:
+        Price in cents, None if it has no readable price
+    """
+    cents = listing.get('price_cents')
+    if type(cents) is int:
+        return cents
+    return parse_price_cents(listing.get('price'))
+
+
+class Listing:
+    """
+    One offer of a card page.
+
+    Fields are slots named after LISTING_FIELDS. get() and item access by
+    field name work as on the listing dictionaries used before, so code
+    reading either form stays the same.
+    """
+
+    __slots__ = LISTING_FIELDS
+
+    def __init__(self, *values: Any, **fields: Any):
+        """
+        Args:
+            values: Field values in LISTING_FIELDS order (defaults for the rest)
+            fields: Field values by name
+        """
+        for name, default in zip(LISTING_FIELDS, LISTING_DEFAULTS):
+            setattr(self, name, default)
+        for name, value in zip(LISTING_FIELDS, values):
+            setattr(self, name, value)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, listing: Dict[str, Any]) -> 'Listing':
+        """Create a listing from a listing dictionary, ignoring unknown keys."""
+        record = cls(**{name: listing[name] for name in LISTING_FIELDS if name in listing})
+        record.price_cents = listing_price_cents(listing)
+        return record
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get a field by name, default for names that are not fields."""
+        return getattr(self, name, default) if name in LISTING_FIELDS else default
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in LISTING_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name: str, value: Any):
+        if name not in LISTING_FIELDS:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Get the field values in LISTING_FIELDS order."""
+        return tuple(getattr(self, name) for name in LISTING_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the listing as a dictionary (for JSON and pandas)."""
+        return dict(zip(LISTING_FIELDS, self.as_tuple()))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Listing):
+            return self.as_tuple() == other.as_tuple()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Listing({', '.join(f'{name}={getattr(self, name)!r}' for name in LISTING_FIELDS)})"
+
+
+class ListingBatch:
+    """
+    The offers of a card page, stored column by column.
+
+    Seller, condition, language and edition strings are interned, so each
+    distinct value is kept once however many offers repeat it, and sales
+    counts, prices in cents and quantities are stored in integer arrays. Iterating or
+    indexing gives Listing records; exporters and analyzers read whole
+    columns with column() or rows().
+    """
+
+    __slots__ = LISTING_FIELDS
+
+    def __init__(self, listings: Iterable[Any] = ()):
+        """
+        Args:
+            listings: Listing records or listing dictionaries to start with
+        """
+        for name in LISTING_FIELDS:
+            setattr(self, name, array('q') if name in INTEGER_FIELDS else [])
+        self.extend(listings)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Any, ...]]) -> 'ListingBatch':
+        """Create a batch from value tuples in LISTING_FIELDS order (see rows())."""
+        batch = cls()
+        for row in rows:
+            batch._append_values(row)
+        return batch
+
+    def _append_values(self, values: Tuple[Any, ...]):
+        """Add one offer from its values in LISTING_FIELDS order."""
+        for name, value in zip(LISTING_FIELDS, values):
+            column = getattr(self, name)
+            if name in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            elif type(column) is array and type(value) is not int:
+                # Not a whole number (a missing price, a blank read back from a sheet); keep a list
+                column = list(column)
+                setattr(self, name, column)
+            column.append(value)
+
+    def append(self, listing: Any):
+        """
+        Add one offer.
+
+        Args:
+            listing: Listing record or listing dictionary
+        """
+        if isinstance(listing, Listing):
+            self._append_values(listing.as_tuple())
+        else:
+            # Dictionaries from older journals or in-page extraction have no price_cents yet
+            self._append_values(tuple(listing_price_cents(listing) if name == 'price_cents'
+                                      else listing.get(name, default)
+                                      for name, default in zip(LISTING_FIELDS, LISTING_DEFAULTS)))
+
+    def extend(self, listings: Iterable[Any]):
+        """Add offers from Listing records, listing dictionaries or another batch."""
+        if isinstance(listings, ListingBatch):
+            for name in LISTING_FIELDS:
+                column, values = getattr(self, name), getattr(listings, name)
+                if type(column) is array and type(values) is not array:
+                    column = list(column)
+                    setattr(self, name, column)
+                column.extend(values)
+            return
+        for listing in listings:
+            self.append(listing)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get all values of one field.
+
+        Args:
+            name: Field name, one of LISTING_FIELDS
+
+        Returns:
+            Values in offer order (an array for integer fields)
+        """
+        return getattr(self, name)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Yield each offer's values in LISTING_FIELDS order."""
+        return zip(*(getattr(self, name) for name in LISTING_FIELDS))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Get the offers as listing dictionaries (for JSON and pandas)."""
+        return [dict(zip(LISTING_FIELDS, row)) for row in self.rows()]
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def __iter__(self) -> Iterator[Listing]:
+        for row in self.rows():
+            yield Listing(*row)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ListingBatch.from_rows(list(self.rows())[index])
+        return Listing(*(getattr(self, name)[index] for name in LISTING_FIELDS))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ListingBatch):
+            return all(list(getattr(self, name)) == list(getattr(other, name)) for name in LISTING_FIELDS)
+        if isinstance(other, list):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ListingBatch({len(self)} listings)"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in LISTING_FIELDS)
+
+    def __setstate__(self, state: Tuple[Any, ...]):
+        for name, values in zip(LISTING_FIELDS, state):
+            if name in INTERNED_FIELDS:
+                # Interning is per process; restore shared strings after unpickling
+                values = [sys.intern(value) if type(value) is str else value for value in values]
+            setattr(self, name, values)
+
+
+def listing_dicts(listings: Optional[Iterable[Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Turn listings into plain dictionaries, e.g. before writing them as JSON.
+
+    Args:
+        listings: ListingBatch, Listing records or listing dictionaries (or None)
+
+    Returns:
+        List of listing dictionaries, None for None
+    """
+    if listings is None:
+        return None
+    if isinstance(listings, ListingBatch):
+        return listings.to_dicts()
+    return [listing.to_dict() if isinstance(listing, Listing) else listing for listing in listings]
@@ -0,0 +1,158 @@
+"""
+Local stand-in for CardMarket that serves saved product pages.
+Used to exercise the scraper's fetch backends without touching the live site.
+
+Pages are looked up by the last segment of the requested path, so a request for
+/en/YuGiOh/Products/Singles/Phantom-Darkness/Allure-of-Darkness-V-2?minCondition=2
+serves <pages_dir>/Allure-of-Darkness-V-2.html. If that file does not exist,
+<pages_dir>/_default.html is served when present, otherwise 404. In cycle mode
+unknown cards are instead spread over all saved pages, so synthetic lists of
+any size get a realistic mix of pages.
+
+Every response can be delayed by a fixed latency plus random jitter to mimic
+the live site.
+
+HOW TO RUN:
+    python local_cardmarket_server.py <pages_dir> [port] [latency] [jitter]
+
+Then point a card list at it:
+    base_url: "http://127.0.0.1:8000/en/YuGiOh/Products/Singles/"
+    fetcher: http
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlparse, unquote
+
+
+class SavedPageHandler(BaseHTTPRequestHandler):
+    """Serves saved HTML pages from the server's pages directory."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        delay = self.server.latency + random.uniform(-self.server.jitter, self.server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        page_path = self._resolve_page(urlparse(self.path).path)
+        if not page_path:
+            self.send_error(404, "No saved page for this product")
+            return
+
+        with open(page_path, 'rb') as file:
+            body = file.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _resolve_page(self, path: str) -> Optional[str]:
+        """Map a request path to a saved page file."""
+        pages_dir = self.server.pages_dir
+        card_name = os.path.basename(unquote(path).rstrip('/'))
+
+        if not card_name:
+            return None
+
+        candidate = os.path.join(pages_dir, f"{card_name}.html")
+        if os.path.isfile(candidate):
+            return candidate
+
+        corpus = self.server.corpus
+        if corpus:
+            return os.path.join(pages_dir, corpus[zlib.crc32(card_name.encode('utf-8')) % len(corpus)])
+
+        candidate = os.path.join(pages_dir, "_default.html")
+        return candidate if os.path.isfile(candidate) else None
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LocalCardMarketServer:
+    """Runs the stand-in server on a background thread."""
+
+    def __init__(self, pages_dir: str, host: str = '127.0.0.1', port: int = 0,
+                 verbose: bool = False, latency: float = 0.0, jitter: float = 0.0,
+                 cycle: bool = False):
+        """
+        Args:
+            pages_dir: Directory of saved product pages
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            verbose: Whether to log every request
+            latency: Seconds to delay every response
+            jitter: Random extra delay of up to +/- this many seconds
+            cycle: Serve unknown cards from all saved pages instead of _default.html
+        """
+        self.httpd = ThreadingHTTPServer((host, port), SavedPageHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.pages_dir = pages_dir
+        self.httpd.verbose = verbose
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.corpus = self.list_pages(pages_dir) if cycle else []
+        self._thread = None
+
+    @staticmethod
+    def list_pages(pages_dir: str) -> List[str]:
+        """
+        List the saved pages in a directory.
+
+        Args:
+            pages_dir: Directory of saved product pages
+
+        Returns:
+            Sorted file names of the .html pages
+        """
+        return sorted(name for name in os.listdir(pages_dir) if name.endswith('.html'))
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as a card list's base_url."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/en/YuGiOh/Products/Singles/"
+
+    def start(self) -> 'LocalCardMarketServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        name="local-cardmarket", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python local_cardmarket_server.py <pages_dir> [port] [latency] [jitter]")
+        sys.exit(1)
+
+    server = LocalCardMarketServer(sys.argv[1], port=int(sys.argv[2]) if len(sys.argv) > 2 else 8000,
+                                   verbose=True,
+                                   latency=float(sys.argv[3]) if len(sys.argv) > 3 else 0.0,
+                                   jitter=float(sys.argv[4]) if len(sys.argv) > 4 else 0.0)
+    print(f"🌐 Serving {sys.argv[1]} at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Server stopped")
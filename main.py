@@ -16,6 +16,10 @@ HOW TO RUN:
 4. Choose which script to run by entering 1, 2, or 3
 5. Press Enter to execute
 
+To run the scraper, analyzer and deck estimator unattended on a schedule
+(one warm process instead of this menu), use the scheduler daemon:
+    python main.py --daemon [card_lists/_schedule.yaml] [--once]
+
 REQUIREMENTS:
 -------------
 - Make sure all your script files exist in the same directory
@@ -50,6 +54,11 @@ def display_menu():
     print("   └── Uses data from Excel files")
     print("   └── File: deck_price_analyzer.py")
     print()
+    print("4. Scheduler Daemon")
+    print("   └── Runs options 1-3 on a schedule until stopped")
+    print("   └── Jobs from card_lists/_schedule.yaml")
+    print("   └── File: scheduler_daemon.py")
+    print()
     print("0. Exit")
     print("=" * 50)
 
@@ -102,13 +111,18 @@ def main():
             'name': 'Deck Price Analyzer',
             'path': 'deck_price_analyzer.py',
             'description': 'This will analyze total deck costs'
+        },
+        '4': {
+            'name': 'Scheduler Daemon',
+            'path': 'scheduler_daemon.py',
+            'description': 'This will keep running scheduled jobs until stopped with Ctrl+C'
         }
     }
 
     while True:
         display_menu()
 
-        choice = input("Enter your choice (0-3): ").strip()
+        choice = input("Enter your choice (0-4): ").strip()
 
         if choice == '0':
             print("\nGoodbye! 👋")
@@ -136,14 +150,18 @@ def main():
             input("\nPress Enter to return to menu...")
 
         else:
-            print("\n❌ Invalid choice! Please enter 0, 1, 2, or 3.")
+            print("\n❌ Invalid choice! Please enter 0, 1, 2, 3, or 4.")
             input("Press Enter to continue...")
 
 
 """
 1. Run the following in CMD to start a chrome debugging window:
 "C:\Program Files\Google\Chrome\Application\chrome.exe" --remote-debugging-port=9222 --user-data-dir="C:/chrome-dev"
+   (not needed with 'browser: launch' in the card list, which starts headless Chrome itself)
 """
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        from scheduler_daemon import main as run_daemon
+        sys.exit(run_daemon(sys.argv[2:]))
     main()
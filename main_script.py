@@ -4,11 +4,11 @@ Provides a simple command-line interface for users.
 """
 
 import sys
-import time
 
 import yaml
 import os
 from card_scraper import CardScraper
+from rate_limiter import AdaptiveRateLimiter
 
 
 # def get_user_input():
@@ -34,25 +34,33 @@ def show_instructions():
     print("\n📝 USAGE INSTRUCTIONS:")
     print("1. Make sure Chrome is running with remote debugging:")
     print("   chrome.exe --remote-debugging-port=9222 --user-data-dir=\"C:/chrome-dev\"")
+    print("   (or set 'browser: launch' in the list to let the scraper start headless Chrome itself)")
     print("2. Create a YAML config file with your card list")
     print("3. Run this script and enter the config file name")
     print("4. Results will be saved to an Excel file with timestamp")
     print()
 
 
-def scrape_yaml(yaml_file):
-    """Main function to run the scraper."""
-    try:
-        # Show instructions
-        show_instructions()
+def scrape_yaml(yaml_file, reparse=False, rate_limiter=None):
+    """
+    Main function to run the scraper.
 
-        # Confirm before starting
-        print(f"📁 Using config file: {yaml_file}")
-        time.sleep(5)
+    Args:
+        yaml_file: Path to the card list YAML file
+        reparse: Rebuild the Excel output from cached pages without scraping
+        rate_limiter: Request scheduler shared with the other lists of the run
+    """
+    try:
+        if reparse:
+            print(f"📁 Reparsing cached pages for: {yaml_file}")
+        else:
+            # Show instructions
+            show_instructions()
+            print(f"📁 Using config file: {yaml_file}")
 
         # Initialize and run scraper
-        scraper = CardScraper()
-        success = scraper.scrape_cards_from_config(yaml_file)
+        scraper = CardScraper(rate_limiter)
+        success = scraper.scrape_cards_from_config(yaml_file, reparse=reparse)
 
         if success:
             print("\n✅ Scraping completed successfully!")
@@ -93,6 +101,39 @@ def manual_scrape():
         print(f"... and {len(listings) - 5} more listings")
 
 
+def scrape_yaml_files(yaml_files, reparse=False, rate_limiter=None):
+    """
+    Scrape several card lists in one run with a single browser session.
+    Cards shared between lists are only fetched once.
+
+    Args:
+        yaml_files: Paths to the card list YAML files
+        reparse: Rebuild the Excel output from cached pages without scraping
+        rate_limiter: Request scheduler for the run
+
+    Returns:
+        Dictionary of YAML path to exit code (0 for success)
+    """
+    try:
+        if reparse:
+            print(f"📁 Reparsing cached pages for {len(yaml_files)} lists")
+        else:
+            show_instructions()
+
+        scraper = CardScraper(rate_limiter)
+        outcomes = scraper.scrape_lists(yaml_files, reparse=reparse)
+        return {yaml_file: 0 if outcomes.get(yaml_file) else 1 for yaml_file in yaml_files}
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️ Scraping cancelled by user")
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return {yaml_file: 1 for yaml_file in yaml_files}
+
+
 def load_yaml_list(list_file_path):
     """
     Load the list of YAML files to process from _list.yaml
@@ -118,10 +159,31 @@ def load_yaml_list(list_file_path):
         return []
 
 
-def process_yaml_list():
+def load_rate_limit_settings(list_file_path):
+    """
+    Load the optional rate_limit section from _list.yaml
+
+    Args:
+        list_file_path: Path to the _list.yaml file
+
+    Returns:
+        Dictionary of rate limiter settings (empty for defaults)
+    """
+    try:
+        with open(list_file_path, 'r', encoding='utf-8') as file:
+            data = yaml.safe_load(file) or {}
+            return data.get('rate_limit') or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+
+def process_yaml_list(reparse=False):
     """
     Process all YAML files listed in _list.yaml
 
+    Args:
+        reparse: Rebuild the Excel output from cached pages without scraping
+
     Returns:
         Overall exit code (0 if all successful, 1 if any failed)
     """
@@ -140,28 +202,24 @@ def process_yaml_list():
     failed_files = []
     successful_files = []
 
-    for yaml_file in yaml_files:
-        yaml_path = os.path.join('card_lists', yaml_file)
-
-        print(f"🔄 Processing: {yaml_file}")
-        print("-" * 50)
-
-        try:
-            exit_code = scrape_yaml(yaml_path)
+    # One scheduler paces every request of the run, across all lists
+    rate_limiter = AdaptiveRateLimiter.from_settings(load_rate_limit_settings(list_file))
 
-            if exit_code == 0:
-                successful_files.append(yaml_file)
-                print(f"✅ Successfully processed: {yaml_file}")
-            else:
-                failed_files.append(yaml_file)
-                print(f"❌ Failed to process: {yaml_file} (exit code: {exit_code})")
+    # All lists are planned together so shared cards are fetched once
+    yaml_paths = [os.path.join('card_lists', yaml_file) for yaml_file in yaml_files]
+    print("-" * 50)
+    exit_codes = scrape_yaml_files(yaml_paths, reparse, rate_limiter)
+    print("-" * 50)
+    print()
 
-        except Exception as e:
+    for yaml_file, yaml_path in zip(yaml_files, yaml_paths):
+        exit_code = exit_codes[yaml_path]
+        if exit_code == 0:
+            successful_files.append(yaml_file)
+            print(f"✅ Successfully processed: {yaml_file}")
+        else:
             failed_files.append(yaml_file)
-            print(f"❌ Exception while processing {yaml_file}: {e}")
-
-        print("-" * 50)
-        print()
+            print(f"❌ Failed to process: {yaml_file} (exit code: {exit_code})")
 
     # Print final summary
     print("📊 PROCESSING SUMMARY:")
@@ -175,6 +233,9 @@ def process_yaml_list():
     if failed_files:
         print(f"   ❌ Failed: {', '.join(failed_files)}")
 
+    if not reparse:
+        rate_limiter.print_summary()
+
     # Return overall exit code
     return 0 if len(failed_files) == 0 else 1
 
@@ -183,6 +244,9 @@ if __name__ == "__main__":
     # Check if manual mode is requested
     if len(sys.argv) > 1 and sys.argv[1] == "--manual":
         manual_scrape()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--reparse":
+        exit_code = process_yaml_list(reparse=True)
+        sys.exit(exit_code)
     else:
         exit_code = process_yaml_list()
         sys.exit(exit_code)
@@ -0,0 +1,233 @@
+"""
+Persistent raw-HTML page cache for the CardMarket scraper.
+Stores compressed pages on disk keyed by URL, with TTLs and LRU eviction.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fetcher import Fetcher, FetchResult
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages.
+
+    Each page is stored gzip-compressed under the SHA-256 of its URL. A small
+    SQLite index keeps the fetch time, last access time and size of every
+    page, which is used for TTL checks and least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: str = "page_cache", max_size_mb: float = 500):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(cache_dir, "pages"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY,"
+            " key TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Get the cache key (file name stem) for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "pages", f"{key}.html.gz")
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """
+        Get a cached page.
+
+        Args:
+            url: URL the page was fetched from
+            max_age: Maximum age in seconds, None to accept any age
+
+        Returns:
+            Tuple of (html, fetched_at timestamp) or None if missing or stale
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+
+            key, fetched_at = row
+            if max_age is not None and time.time() - fetched_at > max_age:
+                return None
+
+            try:
+                with gzip.open(self._path_for(key), 'rt', encoding='utf-8') as file:
+                    html = file.read()
+            except OSError:
+                # Page file went missing or is corrupt, forget about it
+                self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+            return html, fetched_at
+
+    def put(self, url: str, html: str, fetched_at: Optional[float] = None):
+        """
+        Store a page, evicting least recently used pages if over the size limit.
+
+        Args:
+            url: URL the page was fetched from
+            html: Raw page HTML
+            fetched_at: Fetch timestamp (defaults to now)
+        """
+        fetched_at = fetched_at or time.time()
+        key = self.key_for(url)
+        path = self._path_for(key)
+        temp_path = f"{path}.tmp"
+
+        with self._lock:
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as file:
+                file.write(html)
+            os.replace(temp_path, path)
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, key, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, key, fetched_at, time.time(), os.path.getsize(path))
+            )
+            self._evict()
+            self._db.commit()
+
+    def discard(self, url: str):
+        """
+        Remove a page from the cache.
+
+        Args:
+            url: URL the page was fetched from
+        """
+        with self._lock:
+            row = self._db.execute("SELECT key FROM pages WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return
+            try:
+                os.remove(self._path_for(row[0]))
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._db.commit()
+
+    def urls(self) -> List[str]:
+        """
+        List the URLs of all cached pages.
+
+        Returns:
+            Cached URLs, most recently fetched first
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT url FROM pages ORDER BY fetched_at DESC").fetchall()
+        return [url for (url,) in rows]
+
+    def _evict(self):
+        """Remove least recently used pages until the cache fits its size limit."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for url, key, size in self._db.execute(
+                "SELECT url, key, size FROM pages ORDER BY accessed_at ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path_for(key))
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+
+        print(f"  🧹 Evicted {evicted} cached pages (cache now {total / 1024 / 1024:.1f} MB)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CacheFetcher(Fetcher):
+    """
+    Serves pages from a PageCache, falling back to another fetcher.
+
+    Every page fetched by the inner fetcher is written to the cache. A cached
+    page is only served while it is younger than its URL's TTL. Without an
+    inner fetcher (reparse mode) every cached page is served regardless of
+    age and nothing touches the network.
+    """
+
+    def __init__(self, cache: PageCache, inner: Optional[Fetcher] = None,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0):
+        """
+        Args:
+            cache: Page cache to read and write
+            inner: Fetcher used on cache misses, None for cache-only
+            ttls: TTL in seconds per URL
+            default_ttl: TTL in seconds for URLs not in ttls
+        """
+        self.cache = cache
+        self.inner = inner
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.name = f"{inner.name}+cache" if inner else 'cache'
+        self.uses_browser = bool(inner and inner.uses_browser)
+
+    def open(self) -> bool:
+        return self.inner.open() if self.inner else True
+
+    def close(self):
+        if self.inner:
+            self.inner.close()
+
+    def invalidate(self, url: str):
+        # Cache-only (reparse) mode has nothing to refetch from; keep the page
+        if self.inner:
+            self.cache.discard(url)
+            self.inner.invalidate(url)
+
+    def fetch(self, url: str, wait_time: int = 3) -> FetchResult:
+        max_age = None if self.inner is None else self.ttls.get(url, self.default_ttl)
+
+        if max_age is None or max_age > 0:
+            cached = self.cache.get(url, max_age)
+            if cached:
+                html, fetched_at = cached
+                age_hours = (time.time() - fetched_at) / 3600
+                print(f"  💾 Using cached page ({age_hours:.1f}h old): {url}")
+                return FetchResult(url=url, html=html, final_url=url, wait_mode='cache')
+
+        if self.inner is None:
+            return FetchResult(url=url, status='not_cached', wait_mode='cache', error="Page not in cache")
+
+        result = self.inner.fetch(url, wait_time)
+        if result.ok and result.html:
+            self.cache.put(url, result.html)
+        return result
+
+    def worker_fetchers(self, count: int) -> Tuple[List[Fetcher], Callable[[], None]]:
+        if not self.inner:
+            return [self] * count, lambda: None
+
+        inner_fetchers, cleanup = self.inner.worker_fetchers(count)
+        fetchers = [CacheFetcher(self.cache, inner, self.ttls, self.default_ttl)
+                    for inner in inner_fetchers]
+        return fetchers, cleanup
@@ -0,0 +1,487 @@
+"""
+Parser benchmark and regression gate for the CardMarket scraper.
+Parses a corpus of saved product pages with every parser backend, checks
+the listings against golden outputs and reports rows per second and peak
+memory, failing when throughput drops below a stored baseline.
+
+Throughput is gated relative to a fixed calibration workload timed in the
+same run, so the baseline carries over between machines: a page's rows per
+second are divided by the calibration rate before they are stored or
+compared.
+
+HOW TO RUN:
+    python parser_benchmark.py [pages_dir] [--backends html.parser,lxml] [--repeat 5] [--processes 4]
+
+pages_dir defaults to parser_fixtures/ (small, typical, 1,000+ row and edge
+case pages). Pages may be .html or gzip-compressed .html.gz files.
+
+Golden outputs live in <pages_dir>/golden/, the throughput baseline in
+<pages_dir>/baseline.json:
+    python parser_benchmark.py --update-golden     # after an intended parser change
+    python parser_benchmark.py --save-baseline     # on the machine that runs the gate
+
+Exits with status 1 if a backend's listings differ from html.parser's or
+from the golden outputs, or if a page's calibrated throughput fell more
+than --tolerance below the baseline.
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from batch_parser import BatchParser
+from data_parser import DataParser, PARSER_BACKENDS
+from listing import listing_dicts
+
+
+DEFAULT_PAGES_DIR = 'parser_fixtures'
+
+# Pages with fewer listings parse in a few milliseconds, too noisy to gate on
+MIN_GATED_ROWS = 20
+
+# Markup for the calibration workload; fixed, and parsed with the standard
+# library only, so parser changes in this repo never move the calibration
+CALIBRATION_DOCUMENT = ''.join(
+    f'<div id="articleRow{index}" class="row g-0 article-row">'
+    f'<span class="seller-name"><a href="/Users/seller{index}">seller{index}</a></span>'
+    f'<span class="badge">NM</span><div class="price-container">{index},{index % 100:02d} €</div>'
+    f'<span class="item-count">{index % 7 + 1}</span></div>'
+    for index in range(250))
+
+# Calibration passes before every timed pass over the corpus
+CALIBRATION_PASSES = 3
+
+
+class _CalibrationParser(HTMLParser):
+    """Counts the tags of the calibration document."""
+
+    def __init__(self):
+        super().__init__()
+        self.tags = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.tags += len(attrs) + 1
+
+
+def load_pages(pages_dir: str) -> Dict[str, str]:
+    """
+    Read every saved page of a corpus.
+
+    Args:
+        pages_dir: Directory of saved product pages (.html or .html.gz)
+
+    Returns:
+        Page name (file name without extension) to page HTML, sorted by name
+    """
+    pages = {}
+    for file_name in sorted(os.listdir(pages_dir)):
+        path = os.path.join(pages_dir, file_name)
+        if file_name.endswith('.html.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                pages[file_name[:-len('.html.gz')]] = file.read()
+        elif file_name.endswith('.html'):
+            with open(path, encoding='utf-8') as file:
+                pages[file_name[:-len('.html')]] = file.read()
+    return pages
+
+
+def calibrate(passes: int) -> float:
+    """
+    Measure how fast this machine runs the calibration workload.
+
+    Like the page timings, the fastest of several passes counts.
+
+    Args:
+        passes: Number of passes
+
+    Returns:
+        Calibration documents parsed per second
+    """
+    fastest = float('inf')
+    for _ in range(passes):
+        start_time = time.perf_counter()
+        calibration_parser = _CalibrationParser()
+        calibration_parser.feed(CALIBRATION_DOCUMENT)
+        calibration_parser.close()
+        fastest = min(fastest, time.perf_counter() - start_time)
+    return 1 / fastest
+
+
+def parse_corpus(backend: str, pages: Dict[str, str], repeat: int) -> Dict[str, Any]:
+    """
+    Parse every page repeatedly with one backend, timing each page.
+
+    Per page the fastest pass counts, which keeps the numbers steady enough
+    to compare against a baseline on a busy machine. Every pass is preceded
+    by calibration passes, so the calibration rate is measured under the
+    same load as the pages.
+
+    Args:
+        backend: Parser backend
+        pages: Page name to page HTML
+        repeat: Number of passes over the corpus
+
+    Returns:
+        Dictionary with the backend, listings and layout per page, rows,
+        seconds (of the fastest pass) and rows per second per page and in
+        total, and the calibration rate
+    """
+    parser = DataParser(backend)
+    outputs = {}
+    per_page = {name: {'rows': 0, 'seconds': float('inf')} for name in pages}
+    calibration = 0.0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            calibration = max(calibration, calibrate(CALIBRATION_PASSES))
+            for name, html_content in pages.items():
+                start_time = time.perf_counter()
+                outputs[name] = parser.parse_page(html_content)
+                elapsed = time.perf_counter() - start_time
+                per_page[name]['seconds'] = min(per_page[name]['seconds'], elapsed)
+                per_page[name]['rows'] = len(outputs[name][0])
+
+    for timing in per_page.values():
+        timing['rows_per_second'] = timing['rows'] / timing['seconds'] if timing['seconds'] else 0.0
+    outputs = {name: (listing_dicts(listings), layout) for name, (listings, layout) in outputs.items()}
+
+    rows = sum(timing['rows'] for timing in per_page.values())
+    seconds = sum(timing['seconds'] for timing in per_page.values())
+    return {
+        'backend': parser.backend,
+        'outputs': outputs,
+        'pages': per_page,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else 0.0,
+        'pages_per_second': len(pages) / seconds if seconds else 0.0,
+        'calibration': calibration,
+    }
+
+
+def measure_peak_memory(backend: str, pages: Dict[str, str]) -> Dict[str, float]:
+    """
+    Measure the peak Python memory of parsing each page once.
+
+    Runs separately from the timed passes because tracing slows parsing down.
+
+    Args:
+        backend: Parser backend
+        pages: Page name to page HTML
+
+    Returns:
+        Page name to peak traced memory in MB
+    """
+    parser = DataParser(backend)
+    peaks = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name, html_content in pages.items():
+            tracemalloc.start()
+            try:
+                parser.parse_page(html_content)
+                peaks[name] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            finally:
+                tracemalloc.stop()
+    return peaks
+
+
+def parse_corpus_batch(backend: str, pages: Dict[str, str], repeat: int, processes: int) -> Dict[str, Any]:
+    """
+    Parse every page repeatedly with one backend on a pool of processes.
+
+    The pool is started before timing, so only parsing is measured.
+
+    Args:
+        backend: Parser backend
+        pages: Page name to page HTML
+        repeat: Number of passes over the corpus
+        processes: Number of worker processes
+
+    Returns:
+        Dictionary with the backend, listings and layout per page, rows,
+        seconds and rows per second in total
+    """
+    parser = BatchParser(processes, backend)
+    outputs = {}
+    rows = 0
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            parser.parse_batch((None, html_content) for html_content in list(pages.values())[:processes])
+            start_time = time.perf_counter()
+            batch = ((name, html_content) for _ in range(repeat) for name, html_content in pages.items())
+            for parsed in parser.iter_parse(batch):
+                outputs[parsed.key] = (listing_dicts(parsed.listings), parsed.layout)
+                rows += len(parsed.listings)
+            elapsed = time.perf_counter() - start_time
+    finally:
+        parser.close()
+
+    return {
+        'backend': f"{backend} x{processes}",
+        'outputs': outputs,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0,
+        'pages_per_second': len(pages) * repeat / elapsed if elapsed else 0.0,
+    }
+
+
+def compare_outputs(expected_outputs: Dict[str, Tuple[List[Dict[str, Any]], str]],
+                    outputs: Dict[str, Tuple[List[Dict[str, Any]], str]]) -> List[str]:
+    """
+    Find the pages where two parses disagree.
+
+    Args:
+        expected_outputs: Page name to (listings, layout) that is correct
+        outputs: Page name to (listings, layout) to check
+
+    Returns:
+        One description per differing page
+    """
+    differences = []
+    for name, (expected, expected_layout) in expected_outputs.items():
+        got, layout = outputs.get(name, ([], 'missing'))
+        if layout != expected_layout:
+            differences.append(f"{name}: layout '{layout}' instead of '{expected_layout}'")
+            continue
+        if got == expected:
+            continue
+        if len(got) != len(expected):
+            differences.append(f"{name}: {len(got)} listings instead of {len(expected)}")
+            continue
+        for index, (got_listing, expected_listing) in enumerate(zip(got, expected)):
+            if got_listing != expected_listing:
+                fields = sorted(key for key in set(expected_listing) | set(got_listing)
+                                if got_listing.get(key) != expected_listing.get(key))
+                differences.append(f"{name}: listing {index + 1} differs in {', '.join(fields)}")
+                break
+    return differences
+
+
+def golden_path(pages_dir: str, name: str) -> str:
+    """Get the golden output file of a page."""
+    return os.path.join(pages_dir, 'golden', f"{name}.json")
+
+
+def load_golden(pages_dir: str, names: List[str]) -> Dict[str, Tuple[List[Dict[str, Any]], str]]:
+    """
+    Read the golden outputs of the corpus pages that have one.
+
+    Args:
+        pages_dir: Corpus directory
+        names: Page names
+
+    Returns:
+        Page name to (listings, layout)
+    """
+    golden = {}
+    for name in names:
+        path = golden_path(pages_dir, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                record = json.load(file)
+            golden[name] = (record['listings'], record['layout'])
+    return golden
+
+
+def save_golden(pages_dir: str, outputs: Dict[str, Tuple[List[Dict[str, Any]], str]]):
+    """
+    Write the golden output of every page.
+
+    Args:
+        pages_dir: Corpus directory
+        outputs: Page name to (listings, layout)
+    """
+    os.makedirs(os.path.join(pages_dir, 'golden'), exist_ok=True)
+    for name, (listings, layout) in outputs.items():
+        with open(golden_path(pages_dir, name), 'w', encoding='utf-8') as file:
+            json.dump({'layout': layout, 'listings': listings}, file, indent=1, ensure_ascii=False)
+            file.write('\n')
+    print(f"💾 Golden outputs of {len(outputs)} pages written to {os.path.join(pages_dir, 'golden')}")
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Read a stored throughput baseline, None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, measurements: List[Dict[str, Any]], calibration: float):
+    """
+    Store the calibrated throughput of every backend and page as the new baseline.
+
+    Args:
+        path: Baseline file
+        measurements: Results of parse_corpus
+        calibration: Calibration rate of this run (from calibrate)
+    """
+    baseline = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration_per_second': round(calibration, 1),
+        'rows_per_calibration': {
+            measurement['backend']: {name: round(timing['rows_per_second'] / calibration, 3)
+                                     for name, timing in measurement['pages'].items() if timing['rows']}
+            for measurement in measurements
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2)
+        file.write('\n')
+    print(f"📈 Baseline saved to {path}")
+
+
+def expected_rows_per_second(baseline: Optional[Dict[str, Any]], backend: str,
+                             calibration: float) -> Dict[str, float]:
+    """
+    Scale a backend's baseline to this machine.
+
+    Args:
+        baseline: Stored baseline (or None)
+        backend: Parser backend
+        calibration: Calibration rate of this run
+
+    Returns:
+        Page name to the rows/second the baseline predicts for this run
+    """
+    relative = (baseline or {}).get('rows_per_calibration', {}).get(backend, {})
+    return {name: value * calibration for name, value in relative.items()}
+
+
+def check_baseline(baseline: Dict[str, Any], measurements: List[Dict[str, Any]],
+                   calibration: float, tolerance: float) -> List[str]:
+    """
+    Find the pages whose calibrated throughput fell below the baseline.
+
+    Only pages with at least MIN_GATED_ROWS listings are checked.
+
+    Args:
+        baseline: Stored baseline
+        measurements: Results of parse_corpus
+        calibration: Calibration rate of this run
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower is still fine)
+
+    Returns:
+        One description per regressed page
+    """
+    regressions = []
+    for measurement in measurements:
+        expected = expected_rows_per_second(baseline, measurement['backend'], calibration)
+        for name, timing in measurement['pages'].items():
+            if name not in expected or timing['rows'] < MIN_GATED_ROWS:
+                continue
+            floor = expected[name] * (1 - tolerance)
+            if timing['rows_per_second'] < floor:
+                regressions.append(f"{measurement['backend']} {name}: {timing['rows_per_second']:.0f} rows/s, "
+                                   f"baseline {expected[name]:.0f} scaled to this machine (floor {floor:.0f})")
+    return regressions
+
+
+def print_report(measurements: List[Dict[str, Any]], peaks: Dict[str, Dict[str, float]],
+                 baseline: Optional[Dict[str, Any]], calibration: float):
+    """Print rows/second, the scaled baseline and peak memory per backend and page."""
+    print(f"\n  {'backend':<14}{'page':<22}{'rows':>8}{'rows/s':>10}{'baseline':>10}{'peak MB':>9}")
+    for measurement in measurements:
+        expected = expected_rows_per_second(baseline, measurement['backend'], calibration)
+        for name, timing in measurement['pages'].items():
+            reference = f"{expected[name]:.0f}" if name in expected else '-'
+            print(f"  {measurement['backend']:<14}{name[:21]:<22}{timing['rows']:>8}"
+                  f"{timing['rows_per_second']:>10.0f}{reference:>10}"
+                  f"{peaks.get(measurement['backend'], {}).get(name, 0):>9.1f}")
+        print(f"  {measurement['backend']:<14}{'(all pages)':<22}{measurement['rows']:>8}"
+              f"{measurement['rows_per_second']:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and regression-check the HTML parser backends")
+    parser.add_argument('pages_dir', nargs='?', default=DEFAULT_PAGES_DIR,
+                        help=f"Directory of saved product pages (default: {DEFAULT_PAGES_DIR})")
+    parser.add_argument('--backends', default=','.join(PARSER_BACKENDS),
+                        help="Comma separated parser backends")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes over the corpus per backend")
+    parser.add_argument('--processes', type=int, default=0,
+                        help="Also parse on this many worker processes (batch parsing)")
+    parser.add_argument('--baseline', help="Throughput baseline file (default: <pages_dir>/baseline.json)")
+    parser.add_argument('--tolerance', type=float, default=0.35,
+                        help="Allowed rows/second drop below the baseline (default: 0.35)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run's throughput as the baseline")
+    parser.add_argument('--update-golden', action='store_true',
+                        help="Write html.parser's listings as the golden outputs")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak memory measurement")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir) if os.path.isdir(args.pages_dir) else {}
+    if not pages:
+        print(f"❌ No saved pages (.html) found in {args.pages_dir}")
+        sys.exit(1)
+
+    backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+    baseline_path = args.baseline or os.path.join(args.pages_dir, 'baseline.json')
+    print(f"🧪 Parser benchmark: {len(pages)} pages, {args.repeat} pass(es) per backend")
+
+    reference = parse_corpus('html.parser', pages, 1)['outputs']
+    if args.update_golden:
+        save_golden(args.pages_dir, reference)
+    golden = load_golden(args.pages_dir, list(pages))
+    problems = []
+    if golden:
+        print(f"🥇 Checking listings against {len(golden)} golden output(s)")
+    else:
+        print("⚠️ No golden outputs, only checking that backends agree (use --update-golden)")
+
+    measurements = []
+    peaks = {}
+    for backend in backends:
+        measurement = parse_corpus(backend, pages, max(1, args.repeat))
+        measurements.append(measurement)
+        if not args.no_memory:
+            peaks[measurement['backend']] = measure_peak_memory(backend, pages)
+        problems += [f"{measurement['backend']} vs html.parser: {difference}"
+                     for difference in compare_outputs(reference, measurement['outputs'])]
+        problems += [f"{measurement['backend']} vs golden: {difference}"
+                     for difference in compare_outputs(golden, measurement['outputs'])]
+
+    if args.processes > 1:
+        for backend in backends:
+            measurement = parse_corpus_batch(backend, pages, max(1, args.repeat), args.processes)
+            print(f"🧩 {measurement['backend']}: {measurement['rows_per_second']:.0f} rows/s, "
+                  f"{measurement['pages_per_second']:.1f} pages/s")
+            problems += [f"{measurement['backend']} vs html.parser: {difference}"
+                         for difference in compare_outputs(reference, measurement['outputs'])]
+
+    # The machine's best calibration rate of the whole run
+    calibration = max(measurement['calibration'] for measurement in measurements)
+    baseline = load_baseline(baseline_path)
+    print(f"⚖️ Calibration: {calibration:.0f} documents/s")
+    print_report(measurements, peaks, baseline, calibration)
+    if args.save_baseline:
+        save_baseline(baseline_path, measurements, calibration)
+    elif baseline and 'rows_per_calibration' in baseline:
+        problems += check_baseline(baseline, measurements, calibration, args.tolerance)
+    elif baseline:
+        print(f"\n⚠️ Baseline at {baseline_path} predates calibration, throughput not checked "
+              f"(use --save-baseline)")
+    else:
+        print(f"\n⚠️ No baseline at {baseline_path}, throughput not checked (use --save-baseline)")
+
+    if problems:
+        print(f"\n❌ {len(problems)} problem(s):")
+        for problem in problems:
+            print(f"   {problem}")
+        sys.exit(1)
+    print("\n✅ Listings match and throughput is within the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Process-wide request scheduling for the CardMarket scraper.
+A single adaptive token bucket paces every request of a run, across all lists.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fetcher import Fetcher, FetchResult
+
+
+# Titles of anti-bot challenge pages served instead of the product page
+CHALLENGE_TITLES = (
+    'just a moment',
+    'attention required',
+    'verify you are human',
+)
+
+# Markers only found on challenge pages; ordinary pages can mention a captcha
+# (a login form) or load Cloudflare's challenge-platform script
+CHALLENGE_MARKERS = (
+    'cf-browser-verification',
+    'window._cf_chl_opt',
+    'captcha-delivery.com',
+)
+
+PAGE_TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# HTTP statuses that mean we are being rate limited or blocked
+THROTTLE_STATUSES = (403, 429, 503)
+
+
+def is_throttled(result: FetchResult) -> bool:
+    """
+    Check whether a fetch result looks like the site pushing back.
+
+    Args:
+        result: Result of a fetch
+
+    Returns:
+        True for rate limit responses, challenge pages and redirects off-site
+    """
+    if result.http_status in THROTTLE_STATUSES:
+        return True
+    if result.status == 'wrong_site':
+        return True
+    if result.html:
+        head = result.html[:20000].lower()
+        title = PAGE_TITLE.search(head)
+        if title and any(title.group(1).strip().startswith(prefix) for prefix in CHALLENGE_TITLES):
+            return True
+        return any(marker in head for marker in CHALLENGE_MARKERS)
+    return False
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate adapts to how the site responds.
+
+    Every request takes a token. The refill rate grows additively while
+    requests succeed at normal latency, shrinks when latency climbs well above
+    the best seen, and is cut in half on errors that look like throttling,
+    which also pauses all requests for a cooldown that doubles on repeated
+    throttling.
+    """
+
+    def __init__(self, initial_rate: float = 0.5, min_rate: float = 0.05, max_rate: float = 2.0,
+                 burst: int = 1, increase_step: float = 0.05, cooldown: float = 30,
+                 max_cooldown: float = 300):
+        """
+        Args:
+            initial_rate: Starting requests per second
+            min_rate: Lowest requests per second
+            max_rate: Highest requests per second
+            burst: Tokens that may accumulate while idle
+            increase_step: Requests per second added after each healthy request
+            cooldown: Seconds to pause after the first throttling response
+            max_cooldown: Longest pause after repeated throttling
+        """
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1, burst)
+        self.increase_step = increase_step
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._cooldown = cooldown
+        self._latency_ewma: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'AdaptiveRateLimiter':
+        """
+        Create a limiter from a settings dictionary (e.g. the rate_limit section of _list.yaml).
+
+        Args:
+            settings: Keyword arguments for the constructor
+
+        Returns:
+            AdaptiveRateLimiter instance
+        """
+        allowed = ('initial_rate', 'min_rate', 'max_rate', 'burst',
+                   'increase_step', 'cooldown', 'max_cooldown')
+        return cls(**{key: value for key, value in (settings or {}).items() if key in allowed})
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until the next request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.requests += 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def record(self, result: FetchResult, latency: float):
+        """
+        Adapt the rate to the outcome of a request.
+
+        Args:
+            result: Result of the request
+            latency: Seconds the request took
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+
+            if is_throttled(result):
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._paused_until = time.monotonic() + self._cooldown
+                print(f"  🐢 Throttling detected, slowing to {self.rate:.2f} req/s "
+                      f"and pausing {self._cooldown:.0f}s")
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                return
+
+            if not result.ok:
+                self.errors += 1
+                self.rate = max(self.min_rate, self.rate * 0.8)
+                return
+
+            self._cooldown = self.base_cooldown
+            self._latency_ewma = latency if self._latency_ewma is None else \
+                0.8 * self._latency_ewma + 0.2 * latency
+            self._best_latency = self._latency_ewma if self._best_latency is None else \
+                min(self._best_latency, self._latency_ewma)
+
+            if self._latency_ewma > 2 * self._best_latency:
+                # Site is slowing down, back off gently before it starts refusing
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def print_summary(self):
+        """Print what the scheduler did during the run."""
+        latency = f"{self._latency_ewma:.2f}s" if self._latency_ewma is not None else "n/a"
+        print(f"🚦 Rate limiter: {self.requests} requests, {self.throttled} throttled, "
+              f"{self.errors} errors, final rate {self.rate:.2f} req/s, latency ~{latency}")
+
+
+class RateLimitedFetcher(Fetcher):
+    """Paces another fetcher's requests through a shared AdaptiveRateLimiter."""
+
+    def __init__(self, inner: Fetcher, limiter: AdaptiveRateLimiter):
+        self.inner = inner
+        self.limiter = limiter
+        self.name = inner.name
+        self.uses_browser = inner.uses_browser
+
+    def open(self) -> bool:
+        return self.inner.open()
+
+    def close(self):
+        self.inner.close()
+
+    def invalidate(self, url: str):
+        self.inner.invalidate(url)
+
+    def fetch(self, url: str, wait_time: int = 3) -> FetchResult:
+        self.limiter.acquire()
+        start_time = time.time()
+        result = self.inner.fetch(url, wait_time)
+        self.limiter.record(result, time.time() - start_time)
+        return result
+
+    def worker_fetchers(self, count: int) -> Tuple[List[Fetcher], Callable[[], None]]:
+        inner_fetchers, cleanup = self.inner.worker_fetchers(count)
+        return [RateLimitedFetcher(inner, self.limiter) for inner in inner_fetchers], cleanup
@@ -0,0 +1,96 @@
+"""
+Chooses which cards an incremental run refreshes.
+Scores each card by how old its last snapshot is and how much its price has
+moved historically, then picks the cards that are due within a budget.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from listing import listing_price_cents
+
+
+class RefreshPlanner:
+    """
+    Staleness- and volatility-aware selection of cards to scrape.
+
+    A card's score is its age in days, scaled up by its historical
+    volatility (the mean relative change of its cheapest price between
+    snapshots):
+
+        score = age_days * (1 + volatility_weight * volatility)
+
+    A card is due once its score reaches refresh_after_days. Cards without
+    any snapshot are always due and come first.
+    """
+
+    def __init__(self, refresh_after_days: float = 3, volatility_weight: float = 10,
+                 max_cards: int = 0):
+        """
+        Args:
+            refresh_after_days: Score at which a card is due
+            volatility_weight: How strongly volatility shortens the refresh interval
+            max_cards: Most cards to scrape per run (0 for no limit)
+        """
+        self.refresh_after_days = refresh_after_days
+        self.volatility_weight = volatility_weight
+        self.max_cards = max_cards
+
+    @staticmethod
+    def reference_price(listings: List[Dict[str, Any]]) -> Optional[float]:
+        """Get the cheapest listed price of a snapshot."""
+        prices = [listing_price_cents(listing) for listing in listings]
+        prices = [price for price in prices if price]
+        return min(prices) / 100 if prices else None
+
+    def volatility(self, snapshots: List[Dict[str, Any]]) -> float:
+        """
+        Mean relative change of the cheapest price between consecutive snapshots.
+
+        Args:
+            snapshots: Snapshots of a card, newest first
+
+        Returns:
+            Volatility as a fraction (0.1 = prices move 10% between snapshots)
+        """
+        prices = [self.reference_price(snapshot['listings']) for snapshot in reversed(snapshots)]
+        prices = [price for price in prices if price]
+        changes = [abs(new - old) / old for old, new in zip(prices, prices[1:])]
+        return sum(changes) / len(changes) if changes else 0.0
+
+    def score(self, snapshots: List[Dict[str, Any]], now: float) -> float:
+        """
+        Score how urgently a card needs refreshing.
+
+        Args:
+            snapshots: Snapshots of a card, newest first
+            now: Current timestamp
+
+        Returns:
+            Score in days (infinite for cards never scraped)
+        """
+        if not snapshots:
+            return float('inf')
+        age_days = max(0.0, (now - snapshots[0]['scraped_at']) / 86400)
+        return age_days * (1 + self.volatility_weight * self.volatility(snapshots))
+
+    def plan(self, card_names: List[str],
+             history: Dict[str, List[Dict[str, Any]]]) -> Tuple[List[str], Dict[str, float]]:
+        """
+        Pick the cards to scrape in this run.
+
+        Args:
+            card_names: Cards still pending in the list
+            history: Card name to its snapshots, newest first
+
+        Returns:
+            Tuple of (cards to scrape, most urgent first; score of every card)
+        """
+        now = time.time()
+        scores = {card_name: self.score(history.get(card_name, []), now) for card_name in card_names}
+        due = [card_name for card_name in card_names if scores[card_name] >= self.refresh_after_days]
+        due.sort(key=lambda card_name: scores[card_name], reverse=True)
+
+        if self.max_cards:
+            due = due[:self.max_cards]
+        return due, scores
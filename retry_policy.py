@@ -0,0 +1,247 @@
+"""
+Failure handling for card scrapes.
+Classifies why a card could not be scraped, retries it with exponential
+backoff per failure class, and pauses the whole run when failures spike.
+"""
+
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, Optional
+
+from fetcher import FetchResult
+
+
+# Failure classes, and how often / how patiently each one is retried by default
+TIMEOUT = 'timeout'                # page did not load in time
+NETWORK = 'network'                # request failed (connection error, HTTP error status, ...)
+WRONG_SITE = 'wrong_site'          # ended up off CardMarket (redirect, challenge, login)
+NO_CONTENT = 'no_content'          # page loaded but no HTML came back
+PARSE_FAILURE = 'parse_failure'    # HTML came back but the listing table was not recognized
+EMPTY = 'empty'                    # listing table present with no offers (a real result)
+NOT_CACHED = 'not_cached'          # reparse only: the page was never cached, nothing to fetch it from
+
+DEFAULT_RETRIES = {
+    TIMEOUT: {'max_retries': 3, 'base_delay': 5},
+    NETWORK: {'max_retries': 3, 'base_delay': 5},
+    WRONG_SITE: {'max_retries': 2, 'base_delay': 30},
+    NO_CONTENT: {'max_retries': 2, 'base_delay': 5},
+    PARSE_FAILURE: {'max_retries': 1, 'base_delay': 2},
+    EMPTY: {'max_retries': 0, 'base_delay': 0},
+    NOT_CACHED: {'max_retries': 0, 'base_delay': 0},
+}
+
+# Failure classes that say nothing about the site's health, left out of the circuit breaker
+NOT_COUNTED = (NOT_CACHED,)
+
+
+def classify_fetch_result(result: FetchResult) -> Optional[str]:
+    """
+    Get the failure class of a fetch.
+
+    Args:
+        result: Result of a fetch
+
+    Returns:
+        Failure class, None if the page was fetched
+    """
+    if result.status == 'navigation_failed':
+        error = result.error.lower()
+        if result.wait_mode == 'timeout' or 'timeout' in error or 'timed out' in error:
+            return TIMEOUT
+        return NETWORK
+    if result.status == 'wrong_site':
+        return WRONG_SITE
+    if result.status == 'not_cached':
+        return NOT_CACHED
+    if not result.ok:
+        return NO_CONTENT
+    return None
+
+
+def classify_exception(error: Exception) -> str:
+    """
+    Get the failure class of an exception raised while fetching.
+
+    Args:
+        error: Exception raised by the fetch backend
+
+    Returns:
+        TIMEOUT for timeout exceptions, NETWORK otherwise
+    """
+    text = f"{type(error).__name__} {error}".lower()
+    return TIMEOUT if 'timeout' in text or 'timed out' in text else NETWORK
+
+
+class RetryPolicy:
+    """
+    Bounded exponential backoff per failure class.
+
+    Retry n (counting from 0) of a class waits base_delay * 2**n seconds,
+    capped at max_delay and spread by +/-20% jitter so parallel workers do
+    not retry in lockstep.
+    """
+
+    def __init__(self, retries: Optional[Dict[str, Dict[str, float]]] = None, max_delay: float = 120):
+        """
+        Args:
+            retries: Per failure class overrides of max_retries and base_delay
+            max_delay: Longest wait before a retry, in seconds
+        """
+        self.retries = {kind: dict(settings) for kind, settings in DEFAULT_RETRIES.items()}
+        for kind, settings in (retries or {}).items():
+            if kind in self.retries and isinstance(settings, dict):
+                self.retries[kind].update(settings)
+        self.max_delay = max_delay
+        self.retried = Counter()
+        self.gave_up = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'RetryPolicy':
+        """
+        Create a policy from a settings dictionary (the retries section of a card list).
+
+        Args:
+            settings: Failure class to {max_retries, base_delay}, plus an optional max_delay
+
+        Returns:
+            RetryPolicy instance
+        """
+        settings = dict(settings or {})
+        max_delay = float(settings.pop('max_delay', 120))
+        return cls(settings, max_delay)
+
+    def max_retries(self, kind: str) -> int:
+        """Get how often a failure class is retried."""
+        return int(self.retries.get(kind, {}).get('max_retries', 0))
+
+    def delay(self, kind: str, attempt: int) -> Optional[float]:
+        """
+        Decide whether and when to retry after a failed attempt.
+
+        Args:
+            kind: Failure class of the attempt
+            attempt: Number of retries already made for the card
+
+        Returns:
+            Seconds to wait before retrying, None to give up
+        """
+        with self._lock:
+            if attempt >= self.max_retries(kind):
+                self.gave_up[kind] += 1
+                return None
+            self.retried[kind] += 1
+
+        base_delay = float(self.retries[kind].get('base_delay', 0))
+        return min(self.max_delay, base_delay * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+    def print_summary(self):
+        """Print the retries and failures of the run per class."""
+        if not self.retried and not self.gave_up:
+            return
+        kinds = sorted(set(self.retried) | set(self.gave_up))
+        details = ", ".join(f"{kind} {self.retried[kind]} retried/{self.gave_up[kind]} failed"
+                            for kind in kinds)
+        print(f"🔁 Retries: {details}")
+
+
+class CircuitBreaker:
+    """
+    Pauses the whole run when too many recent pages fail.
+
+    Outcomes of the last `window` attempts are kept. Once at least
+    min_samples are known and the failure rate reaches failure_rate, the
+    breaker opens: every fetch waits for pause_seconds. The first outcome
+    after the pause decides: a success closes the breaker, a failure opens it
+    again with a doubled pause (up to max_pause_seconds).
+    """
+
+    def __init__(self, failure_rate: float = 0.5, window: int = 20, min_samples: int = 10,
+                 pause_seconds: float = 60, max_pause_seconds: float = 900):
+        """
+        Args:
+            failure_rate: Fraction of failed attempts in the window that opens the breaker
+            window: Number of recent attempts considered
+            min_samples: Attempts needed before the breaker can open
+            pause_seconds: First pause when the breaker opens
+            max_pause_seconds: Longest pause after repeated openings
+        """
+        self.failure_rate = failure_rate
+        self.min_samples = min(min_samples, window)
+        self.pause_seconds = pause_seconds
+        self.max_pause_seconds = max_pause_seconds
+        self.openings = 0
+        self.paused_seconds = 0.0
+        self._outcomes = deque(maxlen=window)
+        self._open_until = 0.0
+        self._probing = False
+        self._next_pause = pause_seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'CircuitBreaker':
+        """
+        Create a breaker from a settings dictionary (the circuit_breaker section of a card list).
+
+        Args:
+            settings: Keyword arguments for the constructor
+
+        Returns:
+            CircuitBreaker instance
+        """
+        allowed = ('failure_rate', 'window', 'min_samples', 'pause_seconds', 'max_pause_seconds')
+        return cls(**{key: value for key, value in (settings or {}).items() if key in allowed})
+
+    def record(self, success: bool):
+        """
+        Add the outcome of one attempt.
+
+        Args:
+            success: True if the page was scraped (including genuinely empty pages)
+        """
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                # A page that was already loading when the breaker opened
+                return
+            if self._probing:
+                # First outcome after a pause
+                self._probing = False
+                if success:
+                    self._outcomes.clear()
+                    self._next_pause = self.pause_seconds
+                    print("🔌 Circuit breaker closed, pages are coming through again")
+                else:
+                    self._open("the first page after the pause failed")
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_samples and failures / len(self._outcomes) >= self.failure_rate:
+                self._open(f"{failures} of the last {len(self._outcomes)} pages failed")
+
+    def _open(self, reason: str):
+        """Open the breaker for the next pause (lock held)."""
+        pause = self._next_pause
+        self._open_until = time.monotonic() + pause
+        self._next_pause = min(self.max_pause_seconds, pause * 2)
+        self._probing = True
+        self.openings += 1
+        self.paused_seconds += pause
+        print(f"🔌 Circuit breaker open ({reason}), pausing the run for {pause:.0f}s")
+
+    def wait_if_open(self):
+        """Block while the breaker is open."""
+        while True:
+            with self._lock:
+                delay = self._open_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(min(delay, 1.0))
+
+    def print_summary(self):
+        """Print how often the run was paused."""
+        if self.openings:
+            print(f"🔌 Circuit breaker opened {self.openings} time(s), "
+                  f"run paused for {self.paused_seconds:.0f}s in total")
@@ -0,0 +1,554 @@
+"""
+Long-running scheduler for the scrape -> analyze -> deck-estimate pipeline.
+Keeps one warm process (modules imported, browser session open between runs)
+and starts jobs on cron-like schedules instead of through the interactive menu.
+
+HOW TO RUN:
+    python scheduler_daemon.py [card_lists/_schedule.yaml]
+    python scheduler_daemon.py --once      # run every job now, then exit
+
+The daemon writes its state to a status file (output/scheduler_status.json by
+default) that can be polled while it runs. Stop it with Ctrl+C or SIGTERM; the
+step that is running is finished first.
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+import yaml
+
+import card_price_analyzer
+from card_scraper import CardScraper
+from deck_price_analyzer import DeckPriceEstimator, estimate_deck_file
+from main_script import load_rate_limit_settings, load_yaml_list
+from rate_limiter import AdaptiveRateLimiter
+
+
+STEPS = ('scrape', 'analyze', 'deck')
+
+SCHEDULE_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+
+class CronSchedule:
+    """
+    Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept '*', numbers, ranges (1-5), lists (1,15) and steps (*/15,
+    0-30/10). Day of week runs from 0 (Sunday) to 6, 7 is also Sunday. As in
+    cron, when both day fields are restricted a day matching either one runs.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        """
+        Args:
+            expression: Cron expression or alias (@hourly, @daily, @weekly, @monthly)
+
+        Raises:
+            ValueError: If the expression cannot be parsed
+        """
+        self.expression = expression.strip()
+        fields = SCHEDULE_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"expected 5 fields, got {len(fields)} in '{expression}'")
+
+        parsed = [self._parse_field(text, low, high) for text, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(text: str, low: int, high: int) -> Set[int]:
+        """Expand one cron field to the set of values it allows."""
+        values = set()
+        for part in text.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"invalid step in '{text}'")
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(value) for value in part.split('-', 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"'{text}' is outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Check the month and both day fields."""
+        if moment.month not in self.months:
+            return False
+        day_ok = moment.day in self.days
+        # Python counts Monday as 0, cron counts Sunday as 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        """
+        Check whether the schedule fires in a given minute.
+
+        Args:
+            moment: Time to check (seconds are ignored)
+
+        Returns:
+            True if the schedule fires in that minute
+        """
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and self._day_matches(moment))
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """
+        Find the first minute after a given time at which the schedule fires.
+
+        Args:
+            moment: Time to search from
+
+        Returns:
+            Next firing time, None if the schedule never fires (e.g. 30 February)
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        return None
+
+
+@dataclass
+class ScheduledJob:
+    """One entry of the schedule file and its run state."""
+
+    name: str
+    schedule: CronSchedule
+    lists: List[str]
+    steps: List[str]
+    decks: List[str]
+    overlap: str = 'skip'
+    state: str = 'idle'
+    pending: bool = False
+    next_run: Optional[datetime] = None
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_started: Optional[datetime] = None
+    last_finished: Optional[datetime] = None
+    last_result: str = ''
+    last_duration: float = 0.0
+    last_steps: Dict[str, bool] = field(default_factory=dict)
+
+    def status(self) -> Dict[str, Any]:
+        """Get the job's state for the status file."""
+        def iso(moment: Optional[datetime]) -> Optional[str]:
+            return moment.isoformat(timespec='seconds') if moment else None
+
+        return {
+            'schedule': self.schedule.expression,
+            'lists': self.lists,
+            'steps': self.steps,
+            'overlap': self.overlap,
+            'state': self.state,
+            'pending': self.pending,
+            'next_run': iso(self.next_run),
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_started': iso(self.last_started),
+            'last_finished': iso(self.last_finished),
+            'last_result': self.last_result,
+            'last_duration_seconds': round(self.last_duration, 1),
+            'last_steps': self.last_steps,
+        }
+
+
+class SchedulerDaemon:
+    """
+    Runs scheduled jobs in one long-lived process.
+
+    Jobs are executed one at a time by a single worker thread, since they
+    share one CardScraper (and its browser session) and one rate limiter.
+    When a job comes due while it is still running or waiting, its overlap
+    policy decides what happens: 'skip' drops the new run, 'queue' keeps at
+    most one extra run waiting behind the current one.
+    """
+
+    def __init__(self, schedule_file: str = "card_lists/_schedule.yaml",
+                 list_file: str = "card_lists/_list.yaml",
+                 lists_dir: str = "card_lists", decks_dir: str = "decks"):
+        """
+        Args:
+            schedule_file: YAML file with the jobs to run
+            list_file: _list.yaml with the default lists and rate limit settings
+            lists_dir: Folder holding the card list YAML files
+            decks_dir: Folder holding the deck YAML files
+        """
+        self.schedule_file = schedule_file
+        self.list_file = list_file
+        self.lists_dir = lists_dir
+        self.decks_dir = decks_dir
+        self.status_file = os.path.join("output", "scheduler_status.json")
+        self.heartbeat_seconds = 30
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.started_at = datetime.now()
+        self.current: Optional[Dict[str, Any]] = None
+
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+
+        # Warm state shared by every job of the process
+        self.rate_limiter = AdaptiveRateLimiter.from_settings(load_rate_limit_settings(list_file))
+        self.scraper = CardScraper(self.rate_limiter, keep_browser=True)
+        self.estimator = None
+
+    def load_schedule(self) -> bool:
+        """
+        Load the jobs from the schedule file.
+
+        Invalid jobs are reported and left out.
+
+        Returns:
+            True if at least one job was loaded, False otherwise
+        """
+        try:
+            with open(self.schedule_file, 'r', encoding='utf-8') as file:
+                data = yaml.safe_load(file) or {}
+        except FileNotFoundError:
+            print(f"❌ Schedule file not found: {self.schedule_file}")
+            return False
+        except yaml.YAMLError as e:
+            print(f"❌ Error parsing schedule file {self.schedule_file}: {e}")
+            return False
+
+        self.status_file = data.get('status_file', self.status_file)
+        self.heartbeat_seconds = max(1, int(data.get('heartbeat_seconds', self.heartbeat_seconds)))
+
+        now = datetime.now()
+        for index, entry in enumerate(data.get('jobs') or [], 1):
+            job = self._parse_job(entry or {}, index)
+            if job:
+                job.next_run = job.schedule.next_after(now)
+                self.jobs[job.name] = job
+
+        if not self.jobs:
+            print(f"❌ No valid jobs in {self.schedule_file}")
+        return bool(self.jobs)
+
+    def _parse_job(self, entry: Dict[str, Any], index: int) -> Optional[ScheduledJob]:
+        """
+        Build a job from one schedule file entry.
+
+        Args:
+            entry: Job entry from the schedule file
+            index: Position of the entry (for the default name and messages)
+
+        Returns:
+            ScheduledJob, None if the entry is invalid
+        """
+        name = str(entry.get('name') or f"job-{index}")
+        try:
+            schedule = CronSchedule(str(entry.get('schedule', '')))
+        except ValueError as e:
+            print(f"❌ Job '{name}': invalid schedule ({e})")
+            return None
+        if schedule.next_after(datetime.now()) is None:
+            print(f"❌ Job '{name}': schedule '{schedule.expression}' never fires")
+            return None
+
+        steps = list(entry.get('steps') or STEPS)
+        unknown = [step for step in steps if step not in STEPS]
+        if unknown:
+            print(f"❌ Job '{name}': unknown steps {unknown} (use {', '.join(STEPS)})")
+            return None
+
+        overlap = entry.get('overlap', 'skip')
+        if overlap not in ('skip', 'queue'):
+            print(f"❌ Job '{name}': overlap must be 'skip' or 'queue'")
+            return None
+
+        if name in self.jobs:
+            print(f"❌ Job '{name}' is defined twice")
+            return None
+
+        lists = list(entry.get('lists') or load_yaml_list(self.list_file))
+        if 'scrape' in steps and not lists:
+            print(f"❌ Job '{name}': no card lists to scrape")
+            return None
+
+        # Decks default to the ones named like the job's lists
+        decks = entry.get('decks')
+        if decks is None:
+            decks = [list_name for list_name in lists
+                     if os.path.exists(os.path.join(self.decks_dir, list_name))]
+
+        return ScheduledJob(name=name, schedule=schedule, lists=lists, steps=steps,
+                            decks=list(decks), overlap=overlap)
+
+    def trigger(self, job: ScheduledJob):
+        """
+        Put a job in the run queue, applying its overlap policy.
+
+        Args:
+            job: Job that came due
+        """
+        with self._lock:
+            if job.state == 'queued' or (job.state == 'running' and (job.overlap == 'skip' or job.pending)):
+                job.skipped += 1
+                self._log(f"⏭️ Skipping '{job.name}', it is still {job.state}")
+                return
+            if job.state == 'running':
+                job.pending = True
+                self._log(f"⏳ '{job.name}' is still running, queued one more run")
+            else:
+                job.state = 'queued'
+            self._queue.put(job.name)
+        self.write_status()
+
+    def run(self, once: bool = False) -> int:
+        """
+        Run the scheduler until stopped.
+
+        Args:
+            once: Run every job immediately, one after the other, then exit
+
+        Returns:
+            Exit code (0 if no job failed in once mode)
+        """
+        if not self.jobs and not self.load_schedule():
+            return 1
+
+        self._install_signal_handlers()
+        self._worker = threading.Thread(target=self._work, name="scheduler-worker", daemon=True)
+        self._worker.start()
+
+        self._log(f"🕒 Scheduler started (pid {os.getpid()}), status file: {self.status_file}")
+        for job in self.jobs.values():
+            print(f"   - {job.name}: '{job.schedule.expression}' {' -> '.join(job.steps)} "
+                  f"({', '.join(job.lists) or 'no lists'}), next run {self._format(job.next_run)}")
+
+        try:
+            if once:
+                for job in self.jobs.values():
+                    self.trigger(job)
+                while not self._stop.is_set() and (self._queue.unfinished_tasks or self.current):
+                    self._stop.wait(1)
+            else:
+                self._loop()
+        finally:
+            self._stop.set()
+            self._log("🛑 Stopping scheduler...")
+            self._worker.join()
+            self.scraper.close_browser()
+            self.write_status(state='stopped')
+
+        if once:
+            return 0 if all(job.last_result == 'ok' for job in self.jobs.values()) else 1
+        return 0
+
+    def stop(self):
+        """Ask the scheduler to stop after the step that is running."""
+        self._stop.set()
+
+    def _loop(self):
+        """Trigger due jobs and keep the status file fresh until stopped."""
+        last_heartbeat = 0.0
+        while not self._stop.is_set():
+            now = datetime.now()
+            for job in self.jobs.values():
+                if job.next_run and now >= job.next_run:
+                    job.next_run = job.schedule.next_after(now)
+                    self.trigger(job)
+
+            if time.time() - last_heartbeat >= self.heartbeat_seconds:
+                self.write_status()
+                last_heartbeat = time.time()
+
+            # Wake up at the next minute boundary or heartbeat, whichever is first
+            seconds_to_minute = 60 - now.second - now.microsecond / 1_000_000
+            self._stop.wait(max(0.1, min(seconds_to_minute, self.heartbeat_seconds)))
+
+    def _work(self):
+        """Worker thread: run queued jobs one at a time."""
+        while not self._stop.is_set():
+            try:
+                name = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                self._run_job(self.jobs[name])
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: ScheduledJob):
+        """
+        Run a job's steps in order, stopping at the first failed step.
+
+        Args:
+            job: Job to run
+        """
+        with self._lock:
+            job.state = 'running'
+            job.pending = False
+            job.last_started = datetime.now()
+            job.last_steps = {}
+        self._log(f"▶️ Running '{job.name}': {' -> '.join(job.steps)}")
+
+        success = True
+        for step in job.steps:
+            if self._stop.is_set():
+                success = False
+                break
+            self.current = {'job': job.name, 'step': step,
+                            'started_at': datetime.now().isoformat(timespec='seconds')}
+            self.write_status()
+            try:
+                ok = bool(getattr(self, f"_step_{step}")(job))
+            except Exception as e:
+                self._log(f"❌ Step '{step}' of '{job.name}' raised an error: {e}")
+                ok = False
+            job.last_steps[step] = ok
+            if not ok:
+                success = False
+                break
+
+        with self._lock:
+            job.last_finished = datetime.now()
+            job.last_duration = (job.last_finished - job.last_started).total_seconds()
+            job.last_result = 'ok' if success else ('stopped' if self._stop.is_set() else 'failed')
+            job.runs += 1
+            job.failures += 0 if success else 1
+            job.state = 'queued' if job.pending else 'idle'
+            self.current = None
+        self._log(f"{'✅' if success else '❌'} '{job.name}' finished ({job.last_result}) "
+                  f"in {job.last_duration:.0f}s, next run {self._format(job.next_run)}")
+        self.write_status()
+
+    def _step_scrape(self, job: ScheduledJob) -> bool:
+        """
+        Scrape the job's lists with the shared scraper and browser session.
+
+        Every scheduled run starts a fresh journal: resuming would skip the
+        cards an earlier run of the same day already scraped, so a job that
+        runs several times a day would never refresh them.
+        """
+        config_files = [os.path.join(self.lists_dir, list_name) for list_name in job.lists]
+        outcomes = self.scraper.scrape_lists(config_files, resume=False)
+        self.rate_limiter.print_summary()
+        return bool(outcomes) and all(outcomes.values())
+
+    def _step_analyze(self, job: ScheduledJob) -> bool:
+        """Analyze today's workbooks."""
+        return card_price_analyzer.main()
+
+    def _step_deck(self, job: ScheduledJob) -> bool:
+        """Estimate the prices of the job's decks."""
+        if not job.decks:
+            self._log(f"⚠️ No decks to estimate for '{job.name}'")
+            return True
+        if self.estimator is None:
+            self.estimator = DeckPriceEstimator("./output", self.decks_dir)
+        results = [estimate_deck_file(self.estimator, os.path.join(self.decks_dir, deck))
+                   for deck in job.decks]
+        return all(results)
+
+    def write_status(self, state: Optional[str] = None):
+        """
+        Write the daemon's state to the status file.
+
+        The file is replaced atomically, so a poller never reads a partial file.
+
+        Args:
+            state: Daemon state to report (defaults to running/stopping)
+        """
+        with self._lock:
+            status = {
+                'pid': os.getpid(),
+                'state': state or ('stopping' if self._stop.is_set() else 'running'),
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'heartbeat': datetime.now().isoformat(timespec='seconds'),
+                'schedule_file': self.schedule_file,
+                'current': self.current,
+                'queued': self._queue.qsize(),
+                'jobs': {name: job.status() for name, job in self.jobs.items()},
+            }
+
+        temp_file = f"{self.status_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.status_file) or '.', exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                json.dump(status, file, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.status_file)
+        except OSError as e:
+            print(f"⚠️ Failed to write status file: {e}")
+
+    def _install_signal_handlers(self):
+        """Stop gracefully on SIGINT/SIGTERM; a second signal exits immediately."""
+        def handle(signum, frame):
+            if self._stop.is_set():
+                print("\n⏹️ Forced exit")
+                os._exit(1)
+            print(f"\n⏹️ Received signal {signum}, finishing the running step (repeat to force)...")
+            self._stop.set()
+
+        for signum in (signal.SIGINT, getattr(signal, 'SIGTERM', None)):
+            if signum is not None:
+                signal.signal(signum, handle)
+
+    @staticmethod
+    def _format(moment: Optional[datetime]) -> str:
+        """Format a run time for messages."""
+        return moment.strftime('%Y-%m-%d %H:%M') if moment else 'never'
+
+    @staticmethod
+    def _log(message: str):
+        """Print a message with the current time."""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run scrape, analysis and deck estimate jobs on a schedule")
+    parser.add_argument('schedule_file', nargs='?', default="card_lists/_schedule.yaml",
+                        help="YAML file with the jobs to run")
+    parser.add_argument('--once', action='store_true', help="Run every job now, then exit")
+    args = parser.parse_args(argv)
+
+    daemon = SchedulerDaemon(args.schedule_file)
+    return daemon.run(once=args.once)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Append-only journal of finished cards for resumable scraping.
+Each successfully scraped card is written as one JSON line and fsync'd.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from listing import listing_dicts
+
+class ScrapeJournal:
+    """
+    Crash-safe record of the cards a run has already scraped.
+
+    Records are appended one per line and flushed to disk before append()
+    returns, so a crash loses at most the card being scraped. A torn last
+    line from a crash mid-write is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load all finished cards from the journal.
+
+        Returns:
+            Ordered dictionary of card name to record (later records win)
+        """
+        records = OrderedDict()
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    records[record['card_name']] = record
+                except (ValueError, KeyError):
+                    print(f"  ⚠️ Skipping damaged journal line {line_number} in {self.path}")
+
+        return records
+
+    def index(self) -> Dict[str, int]:
+        """
+        Find where each finished card's record starts, without keeping any listings.
+
+        Returns:
+            Ordered dictionary of card name to byte offset of its record (later records win)
+        """
+        offsets = OrderedDict()
+        if not os.path.exists(self.path):
+            return offsets
+
+        with open(self.path, 'rb') as file:
+            offset = 0
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    try:
+                        offsets[json.loads(line)['card_name']] = offset
+                    except (ValueError, KeyError):
+                        print(f"  ⚠️ Skipping damaged journal line {line_number} in {self.path}")
+                offset += len(line)
+
+        return offsets
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """
+        Read one record found by index().
+
+        Args:
+            offset: Byte offset of the record
+
+        Returns:
+            Record dictionary (card_name, url, finished_at, listings)
+        """
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            return json.loads(file.readline())
+
+    def append(self, card_name: str, url: str, listings: List[Dict[str, Any]]):
+        """
+        Record a finished card and flush it to disk.
+
+        Args:
+            card_name: Name of the card
+            url: URL the card was scraped from
+            listings: Parsed listings for the card
+        """
+        record = {
+            'card_name': card_name,
+            'url': url,
+            'finished_at': time.time(),
+            'listings': listing_dicts(listings),
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def reset(self):
+        """Discard all records so the next run starts from scratch."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
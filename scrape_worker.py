@@ -0,0 +1,50 @@
+"""
+Queue worker for distributed scraping.
+Claims card pages from a work queue filled by a coordinator (a card list
+with a 'queue' setting), scrapes them and reports the listings back.
+
+HOW TO RUN (on any number of machines):
+    python scrape_worker.py sqlite:///work_queue.db
+    python scrape_worker.py redis://queue-host:6379/0 [--id NAME] [--idle-exit SECONDS]
+"""
+
+import argparse
+import os
+import socket
+import sys
+
+from card_scraper import CardScraper
+from rate_limiter import AdaptiveRateLimiter
+from main_script import load_rate_limit_settings
+from work_queue import open_work_queue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape card pages from a distributed work queue")
+    parser.add_argument('queue', help="Work queue URL (sqlite:///file.db or redis://host:port/db)")
+    parser.add_argument('--id', default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Worker id shown in results (default: host-pid)")
+    parser.add_argument('--idle-exit', type=float, default=0,
+                        help="Stop after this many seconds without jobs (default: keep waiting)")
+    parser.add_argument('--poll', type=float, default=2, help="Seconds between claims while idle")
+    parser.add_argument('--rate-limits', default='card_lists/_list.yaml',
+                        help="_list.yaml whose rate_limit section paces this worker")
+    args = parser.parse_args()
+
+    work_queue = open_work_queue(args.queue)
+    if work_queue is None:
+        sys.exit(1)
+
+    # Each worker paces its own requests; the browser stays open across runs
+    rate_limiter = AdaptiveRateLimiter.from_settings(load_rate_limit_settings(args.rate_limits))
+    scraper = CardScraper(rate_limiter, keep_browser=True)
+    try:
+        processed = scraper.work_queue_jobs(work_queue, args.id, args.idle_exit, args.poll)
+        print(f"✅ Worker {args.id} processed {processed} pages")
+    finally:
+        scraper.close_browser()
+        work_queue.close()
+
+
+if __name__ == "__main__":
+    main()
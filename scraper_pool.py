@@ -0,0 +1,187 @@
+"""
+Worker pool for scraping several cards at once.
+Handles sharding jobs across browser sessions, capping requests per domain and
+overlapping page fetches with parsing.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+
+class DomainLimiter:
+    """Caps the number of concurrent requests made to the same domain."""
+
+    def __init__(self, max_per_domain: int):
+        self.max_per_domain = max(1, max_per_domain)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Get (or create) the semaphore for the domain of a URL."""
+        domain = urlparse(url).netloc
+        with self._lock:
+            if domain not in self._semaphores:
+                self._semaphores[domain] = threading.BoundedSemaphore(self.max_per_domain)
+            return self._semaphores[domain]
+
+    @contextmanager
+    def limit(self, url: str):
+        """
+        Hold a slot for the URL's domain for the duration of the block.
+
+        Args:
+            url: URL about to be requested
+        """
+        semaphore = self._get_semaphore(url)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+class ScraperPool:
+    """Runs jobs across a fixed set of sessions, one worker thread per session."""
+
+    def __init__(self, sessions: Sequence[Any]):
+        self.sessions = list(sessions)
+
+    def map(self, jobs: Sequence[Any], worker_fn: Callable[[Any, int, Any], Any],
+            on_error: Optional[Callable[[int, Any, Exception], Any]] = None) -> List[Any]:
+        """
+        Process all jobs and return their results in input order.
+
+        Jobs are pulled from a shared queue, so a worker that finishes early
+        picks up the next job instead of idling behind a slow one.
+
+        Args:
+            jobs: Sequence of jobs to process
+            worker_fn: Called as worker_fn(session, index, job) for each job
+            on_error: Called as on_error(index, job, error) when worker_fn raises;
+                its return value becomes the job's result (None without it)
+
+        Returns:
+            List of results in the same order as jobs
+        """
+        job_queue = queue.Queue()
+        for index, job in enumerate(jobs):
+            job_queue.put((index, job))
+
+        results: List[Any] = [None] * len(jobs)
+
+        def run(session):
+            while True:
+                try:
+                    index, job = job_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = worker_fn(session, index, job)
+                except Exception as e:
+                    print(f"❌ Worker error on job {index + 1}: {e}")
+                    if on_error:
+                        results[index] = on_error(index, job, e)
+
+        threads = [
+            threading.Thread(target=run, args=(session,), name=f"scraper-worker-{i}", daemon=True)
+            for i, session in enumerate(self.sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+
+class StagePipeline:
+    """
+    Runs two stages over a sequence of jobs at the same time.
+
+    The produce stage (e.g. fetching pages) runs on a background thread and
+    hands its output to the consume stage (e.g. parsing) through a bounded
+    queue, so it works at most `depth` jobs ahead and memory stays flat
+    however many jobs there are.
+    """
+
+    _DONE = object()
+
+    def __init__(self, depth: int = 1):
+        self.depth = max(1, depth)
+
+    def run(self, jobs: Sequence[Any], produce_fn: Callable[[int, Any], Any],
+            consume_fn: Callable[[int, Any, Any], Any],
+            on_error: Optional[Callable[[int, Any, Exception], Any]] = None) -> List[Any]:
+        """
+        Process all jobs and return the consume stage's results in input order.
+
+        A job whose produce or consume stage raises is not passed on; its
+        result comes from on_error instead.
+
+        Args:
+            jobs: Sequence of jobs to process
+            produce_fn: Called as produce_fn(index, job) on the background thread
+            consume_fn: Called as consume_fn(index, job, produced) on the calling thread
+            on_error: Called as on_error(index, job, error) on the calling thread
+                when either stage raises; its return value becomes the job's
+                result (None without it)
+
+        Returns:
+            List of consume results in the same order as jobs
+        """
+        handoff = queue.Queue(maxsize=self.depth)
+        stop = threading.Event()
+        results: List[Any] = [None] * len(jobs)
+
+        def fail(index, job, error):
+            print(f"❌ Pipeline error on job {index + 1}: {error}")
+            if on_error:
+                results[index] = on_error(index, job, error)
+
+        def put(item) -> bool:
+            # Give up if the consumer has stopped, instead of blocking forever
+            while not stop.is_set():
+                try:
+                    handoff.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            for index, job in enumerate(jobs):
+                if stop.is_set():
+                    return
+                error = None
+                try:
+                    produced = produce_fn(index, job)
+                except Exception as e:
+                    # Reported from the calling thread, so on_error never runs concurrently
+                    produced, error = None, e
+                if not put((index, job, produced, error)):
+                    return
+            put(self._DONE)
+
+        producer = threading.Thread(target=produce, name="scraper-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = handoff.get()
+                if item is self._DONE:
+                    break
+                index, job, produced, error = item
+                if error is not None:
+                    fail(index, job, error)
+                    continue
+                try:
+                    results[index] = consume_fn(index, job, produced)
+                except Exception as e:
+                    fail(index, job, e)
+        finally:
+            stop.set()
+            producer.join()
+
+        return results
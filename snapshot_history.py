@@ -0,0 +1,173 @@
+"""
+Access to earlier scrape results of a card list.
+Reads the dated journals and workbooks in output/ back into per-card snapshots.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from openpyxl import load_workbook
+
+from listing import LISTING_FIELDS, parse_price_cents
+from scrape_journal import ScrapeJournal
+
+
+# Written to cell A2 of sheets filled from an earlier snapshot instead of a fresh scrape
+LAST_SCRAPED_MARKER = "Last scraped:"
+
+# Written to cell A2 of sheets whose card could not be scraped (listings unknown)
+SCRAPE_FAILED_MARKER = "Scrape failed:"
+
+# Written to cell A2 of sheets whose card was left for a later run (listings unknown)
+NOT_SCRAPED_MARKER = "Not scraped yet:"
+
+
+class SnapshotHistory:
+    """
+    Earlier snapshots of a list's cards, newest first.
+
+    Each day's journal is preferred because it holds exact listings and
+    scrape times; workbooks from before journals existed are read as a
+    fallback. Sheets that were themselves carried over from an older
+    snapshot are recognized by their marker and not counted as a new scrape.
+    """
+
+    def __init__(self, output_dir: str = "output", history_days: int = 60):
+        """
+        Args:
+            output_dir: Folder holding the YYYY-MM-DD output folders
+            history_days: How many days back to look
+        """
+        self.output_dir = output_dir
+        self.history_days = history_days
+
+    def _dated_folders(self) -> List[str]:
+        """Get the date folders within the history window, newest first (today excluded)."""
+        if not os.path.isdir(self.output_dir):
+            return []
+
+        today = datetime.now().date()
+        folders = []
+        for name in os.listdir(self.output_dir):
+            try:
+                day = datetime.strptime(name, "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            if 0 < (today - day).days <= self.history_days:
+                folders.append(name)
+        return sorted(folders, reverse=True)
+
+    def load(self, list_name: str, card_names: List[str],
+             sheet_names: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load every earlier snapshot of a list's cards.
+
+        Args:
+            list_name: Name of the list (as used in file names)
+            card_names: Cards of the list
+            sheet_names: Workbook sheet name of each card
+
+        Returns:
+            Card name to snapshots (newest first), each with
+            'date', 'scraped_at', 'url' and 'listings'
+        """
+        history: Dict[str, List[Dict[str, Any]]] = OrderedDict((card_name, []) for card_name in card_names)
+        seen = {card_name: set() for card_name in card_names}
+
+        for folder in self._dated_folders():
+            stem = os.path.join(self.output_dir, folder,
+                                f"{list_name}_{folder.replace('-', '_')}")
+            if os.path.exists(f"{stem}.journal.jsonl"):
+                snapshots = self._read_journal(f"{stem}.journal.jsonl", folder)
+            elif os.path.exists(f"{stem}.xlsx"):
+                snapshots = self._read_workbook(f"{stem}.xlsx", folder, card_names, sheet_names)
+            else:
+                continue
+
+            for card_name, snapshot in snapshots.items():
+                # A carried-over sheet repeats an older snapshot, keep only the original
+                if card_name in history and snapshot['date'] not in seen[card_name]:
+                    seen[card_name].add(snapshot['date'])
+                    history[card_name].append(snapshot)
+
+        for snapshots in history.values():
+            snapshots.sort(key=lambda snapshot: snapshot['scraped_at'], reverse=True)
+        return history
+
+    def _read_journal(self, path: str, folder: str) -> Dict[str, Dict[str, Any]]:
+        """Read one day's snapshots from its scrape journal."""
+        snapshots = {}
+        for card_name, record in ScrapeJournal(path).load().items():
+            snapshots[card_name] = {
+                'date': folder,
+                'scraped_at': record.get('finished_at') or self._timestamp(folder),
+                'url': record.get('url', ''),
+                'listings': record.get('listings') or [],
+            }
+        return snapshots
+
+    def _read_workbook(self, path: str, folder: str, card_names: List[str],
+                       sheet_names: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Read one day's snapshots from its workbook."""
+        try:
+            workbook = load_workbook(path, read_only=True)
+        except Exception as e:
+            print(f"  ⚠️ Could not read snapshot {path}: {e}")
+            return {}
+
+        snapshots = {}
+        try:
+            for card_name in card_names:
+                sheet_name = sheet_names.get(card_name)
+                if sheet_name not in workbook.sheetnames:
+                    continue
+                rows = list(workbook[sheet_name].iter_rows(values_only=True))
+                if len(rows) < 4:
+                    continue
+
+                url = rows[0][0] or ''
+                date = folder
+                marker = rows[1][0] if rows[1] else None
+                if isinstance(marker, str) and marker.startswith((SCRAPE_FAILED_MARKER, NOT_SCRAPED_MARKER)):
+                    # No snapshot that day, only a failed or skipped attempt
+                    continue
+                if isinstance(marker, str) and marker.startswith(LAST_SCRAPED_MARKER):
+                    found = re.search(r'\d{4}-\d{2}-\d{2}', marker)
+                    date = found.group(0) if found else folder
+
+                header = [str(cell) if cell is not None else '' for cell in rows[3]]
+                listings = []
+                for row in rows[4:]:
+                    if not any(cell is not None for cell in row):
+                        continue
+                    listing = dict(zip(header, row))
+                    listing = {field: '' if listing.get(field) is None else listing.get(field)
+                               for field in LISTING_FIELDS}
+                    if listing['price_cents'] == '':
+                        # Sheets written before prices were stored in cents
+                        cents = parse_price_cents(listing['price'])
+                        listing['price_cents'] = '' if cents is None else cents
+                    listings.append(listing)
+
+                snapshots[card_name] = {
+                    'date': date,
+                    'scraped_at': self._timestamp(date),
+                    'url': url,
+                    'listings': listings,
+                }
+        finally:
+            workbook.close()
+        return snapshots
+
+    @staticmethod
+    def _timestamp(date: str) -> float:
+        """Timestamp for the start of a YYYY-MM-DD date."""
+        return datetime.strptime(date, "%Y-%m-%d").timestamp()
+
+    @staticmethod
+    def latest(snapshots: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Get the newest snapshot, if any."""
+        return snapshots[0] if snapshots else None
@@ -0,0 +1,133 @@
+"""
+Per-stage latency collection for scraping runs.
+Records how long each hot-path stage takes and summarizes it as percentiles.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+# Stages in the order they happen for a card, used to order reports
+STAGE_ORDER = ('fetch', 'navigate', 'wait', 'page_source', 'parse', 'save_to_excel', 'format_columns')
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted samples.
+
+    Args:
+        sorted_samples: Samples in ascending order
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        Sample at that rank, 0 if there are no samples
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class StageTimer:
+    """Thread-safe collection of durations per named stage."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """
+        Add one duration to a stage.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """
+        Time the enclosed block as one sample of a stage.
+
+        Args:
+            stage: Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize every stage.
+
+        Returns:
+            Stage name to count, total, mean, p50, p95 and max (seconds)
+        """
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+
+        ordered = [stage for stage in STAGE_ORDER if stage in samples]
+        ordered += sorted(stage for stage in samples if stage not in STAGE_ORDER)
+
+        summary = {}
+        for stage in ordered:
+            values = samples[stage]
+            summary[stage] = {
+                'count': len(values),
+                'total': round(sum(values), 4),
+                'mean': round(sum(values) / len(values), 4),
+                'p50': round(percentile(values, 0.50), 4),
+                'p95': round(percentile(values, 0.95), 4),
+                'max': round(values[-1], 4),
+            }
+        return summary
+
+    def print_summary(self):
+        """Print the per-stage table."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f"\n⏱️ Stage timings (seconds):")
+        print(f"  {'stage':<15}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}{'total':>10}")
+        for stage, stats in summary.items():
+            print(f"  {stage:<15}{stats['count']:>7}{stats['p50']:>9.3f}{stats['p95']:>9.3f}"
+                  f"{stats['max']:>9.3f}{stats['total']:>10.2f}")
+
+    def write_report(self, path: str, details: Dict[str, Any]) -> bool:
+        """
+        Write the run's stage summary as JSON.
+
+        Args:
+            path: File to write
+            details: Extra run information to include (lists, card counts, ...)
+
+        Returns:
+            True if written, False otherwise
+        """
+        report = {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'duration_seconds': round(time.time() - self.started_at, 2),
+            **details,
+            'stages': self.summary(),
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2, ensure_ascii=False)
+            print(f"📈 Stage timings saved to {path}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save stage timings: {e}")
+            return False
@@ -0,0 +1,94 @@
+"""
+Tests for parsing pages on a pool of worker processes.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch_parser import BatchParser
+from data_parser import DataParser
+from listing import listing_dicts
+from stage_timer import StageTimer
+
+
+FIXTURES_DIR = os.path.join(ROOT, 'parser_fixtures')
+
+
+def load_fixture_pages():
+    """Every fixture page by file name."""
+    pages = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        path = os.path.join(FIXTURES_DIR, name)
+        if name.endswith('.html.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                pages[name] = file.read()
+        elif name.endswith('.html'):
+            with open(path, encoding='utf-8') as file:
+                pages[name] = file.read()
+    return pages
+
+
+class BatchParserTest(unittest.TestCase):
+    """BatchParser gives the same listings as parsing in-process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_fixture_pages()
+        parser = DataParser()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.expected = {name: (listing_dicts(listings), layout)
+                            for name, (listings, layout) in
+                            ((name, parser.parse_page(html)) for name, html in cls.pages.items())}
+        cls.parser = BatchParser(processes=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parser.close()
+
+    def parse_batch(self, pages):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            parsed = self.parser.parse_batch(pages)
+        return parsed, output.getvalue()
+
+    def test_matches_in_process_parsing(self):
+        parsed, _ = self.parse_batch(self.pages.items())
+
+        self.assertEqual([page.key for page in parsed], list(self.pages))
+        for page in parsed:
+            with self.subTest(page=page.key):
+                self.assertEqual((listing_dicts(page.listings), page.layout), self.expected[page.key])
+                self.assertGreater(page.seconds, 0)
+
+    def test_parse_page(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            listings, layout = self.parser.parse_page(self.pages['typical.html'])
+        self.assertEqual((listing_dicts(listings), layout), self.expected['typical.html'])
+
+    def test_worker_messages_reach_the_parent(self):
+        parsed, output = self.parse_batch([('typical', self.pages['typical.html']),
+                                           ('blank', '<html><body></body></html>')])
+
+        self.assertIn("Successfully parsed 50 listings", parsed[0].output)
+        self.assertIn("No main container found", parsed[1].output)
+        self.assertEqual(output, parsed[0].output + parsed[1].output)
+
+    def test_records_parse_times(self):
+        timer = StageTimer()
+        parser = BatchParser(processes=1, timer=timer)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                parser.parse_batch([(None, self.pages['small.html']), (None, self.pages['typical.html'])])
+        finally:
+            parser.close()
+        self.assertEqual(timer.summary()['parse']['count'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for analyzing card prices from exported workbooks and listing streams.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from card_price_analyzer import CardPriceAnalyzer
+from data_parser import DataParser
+from excel_exporter import ExcelExporter
+
+
+FIXTURE_PAGE = os.path.join(ROOT, 'parser_fixtures', 'typical.html')
+
+
+class AnalyzeWorkbookTest(unittest.TestCase):
+    """Streaming a workbook's sheets through analyze_listings."""
+
+    def setUp(self):
+        with open(FIXTURE_PAGE, encoding='utf-8') as file:
+            self.html = file.read()
+        self.parser = DataParser()
+        self.analyzer = CardPriceAnalyzer()
+
+        # The exporter writes to output/ under the working directory
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def export(self, scraped_data):
+        exporter = ExcelExporter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(exporter.save_to_excel(scraped_data, 'Test'))
+        return Path(exporter._generate_filename('Test'))
+
+    def quietly(self, function, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(*args)
+
+    def test_sheet_matches_listings_and_dataframe(self):
+        path = self.export({'Card': {'listings': self.parser.iter_listings(self.html),
+                                     'url': 'https://example.com/card'}})
+
+        results = self.quietly(self.analyzer.analyze_excel_file, path)
+        card = results['cards']['Card']
+        self.assertEqual(card['total_listings'], 50)
+        self.assertEqual(card, self.quietly(self.analyzer.analyze_listings,
+                                            self.parser.parse_page_data(self.html), 'Card'))
+        data_frame = pd.read_excel(path, sheet_name='Card')
+        self.assertEqual(card, self.quietly(self.analyzer.analyze_card_data, data_frame, 'Card'))
+        self.assertEqual(results['list_summary']['total_cards_with_data'], 1)
+
+    def test_marked_and_empty_sheets(self):
+        path = self.export({
+            'Failed': {'listings': [], 'url': 'https://example.com/failed', 'failure': 'timeout'},
+            'Later': {'listings': [], 'url': 'https://example.com/later', 'not_scraped': 'over max_cards'},
+            'Empty': {'listings': [], 'url': 'https://example.com/empty'},
+        })
+
+        results = self.quietly(self.analyzer.analyze_excel_file, path)
+        cards = results['cards']
+        self.assertTrue(cards['Failed']['scrape_failed'])
+        self.assertTrue(cards['Later']['not_scraped'])
+        self.assertEqual(cards['Empty'], self.analyzer._empty_card_analysis('Empty'))
+        summary = results['list_summary']
+        self.assertEqual((summary['total_cards_with_data'], summary['total_cards_failed'],
+                          summary['total_cards_not_scraped']), (0, 1, 1))
+
+    def test_sheets_without_price_cents(self):
+        # Workbooks written before prices were stored in cents
+        listings = [{'language': 'German', 'price': '1.234,56 €', 'quantity': 2},
+                    {'language': 'English', 'price': '0,99 €', 'quantity': 1},
+                    {'language': 'English', 'price': None, 'quantity': 1}]
+        path = self.export({'Card': {'listings': listings, 'url': 'https://example.com/card'}})
+
+        card = self.quietly(self.analyzer.analyze_excel_file, path)['cards']['Card']
+        self.assertEqual(card['total_listings'], 2)
+        self.assertEqual(card['languages']['German']['price_min'], 1234.56)
+        self.assertEqual(card['languages']['English']['price_max'], 0.99)
+
+
+if __name__ == '__main__':
+    unittest.main()
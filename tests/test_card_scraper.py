@@ -0,0 +1,158 @@
+"""
+Tests for how the scraper turns failed cards into workbook sheets.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import yaml
+from openpyxl import load_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from card_scraper import CardScraper
+from fetcher import Fetcher, FetchResult
+from snapshot_history import SCRAPE_FAILED_MARKER
+
+
+FIXTURES_DIR = os.path.join(ROOT, 'parser_fixtures')
+
+
+class FixtureFetcher(Fetcher):
+    """Serves fixture pages by card name; cards without a page time out."""
+
+    name = 'fixtures'
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def fetch(self, url, wait_time=3):
+        self.requests.append(url)
+        for card_name, page in self.pages.items():
+            if f"/{card_name}" in url:
+                with open(os.path.join(FIXTURES_DIR, page), encoding='utf-8') as file:
+                    return FetchResult(url, html=file.read(), final_url=url)
+        return FetchResult(url, status='navigation_failed', wait_mode='timeout',
+                           error="Timed out waiting for the page", final_url=url)
+
+
+class FixtureScraper(CardScraper):
+    """CardScraper fetching through a FixtureFetcher."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.fixture_fetcher = FixtureFetcher(pages)
+
+    def _create_fetcher(self, config, workers, jobs, reparse):
+        return self.fixture_fetcher
+
+
+class ScraperTestCase(unittest.TestCase):
+    """Runs one-list scrapes in a temporary working directory."""
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def scrape(self, pages, cards, resume=None):
+        """Scrape a one-list run and return each sheet's A2 cell and number of data rows."""
+        config = {
+            'name': 'Test',
+            'base_url': 'https://www.cardmarket.com/en/YuGiOh/Products/Singles/',
+            'cards': {card_name: {'set': 'Test-Set'} for card_name in cards},
+            'retries': {kind: {'base_delay': 0}
+                        for kind in ('timeout', 'network', 'wrong_site', 'no_content', 'parse_failure')},
+            'circuit_breaker': False,
+        }
+        with open('list.yaml', 'w', encoding='utf-8') as file:
+            yaml.safe_dump(config, file)
+
+        self.scraper = FixtureScraper(pages)
+        with contextlib.redirect_stdout(io.StringIO()):
+            outcomes = self.scraper.scrape_lists(['list.yaml'], resume=resume)
+            filename = self.scraper.excel_exporter._generate_filename('Test')
+        self.assertTrue(outcomes['list.yaml'])
+
+        workbook = load_workbook(filename, read_only=True)
+        try:
+            sheets = {}
+            for worksheet in workbook.worksheets:
+                rows = list(worksheet.iter_rows(values_only=True))
+                sheets[worksheet.title] = (rows[1][0] if len(rows) > 1 and rows[1] else None, len(rows) - 4)
+        finally:
+            workbook.close()
+        return sheets
+
+    def requests_for(self, card_name):
+        """Number of times the last scrape fetched a card's page."""
+        return sum(f"/{card_name}" in url for url in self.scraper.fixture_fetcher.requests)
+
+
+class FailedCardSheetTest(ScraperTestCase):
+    """Failed cards are marked in their sheet instead of looking like cards without offers."""
+
+    def test_timeout_is_marked_failed(self):
+        sheets = self.scrape({'Good-Card': 'typical.html'}, ['Good-Card', 'Slow-Card'])
+
+        marker, rows = sheets['Slow Card']
+        self.assertTrue(marker.startswith(f"{SCRAPE_FAILED_MARKER} timeout"), marker)
+        self.assertEqual(rows, 0)
+        # One try plus the default 3 timeout retries
+        self.assertEqual(self.requests_for('Slow-Card'), 4)
+
+        marker, rows = sheets['Good Card']
+        self.assertIsNone(marker)
+        self.assertEqual(rows, 50)
+
+    def test_page_without_listing_table_is_marked_failed(self):
+        sheets = self.scrape({'Odd-Card': 'not_a_product_page.html', 'Sold-Out-Card': 'no_offers.html'},
+                             ['Odd-Card', 'Sold-Out-Card'])
+
+        marker, _ = sheets['Odd Card']
+        self.assertTrue(marker.startswith(f"{SCRAPE_FAILED_MARKER} parse_failure"), marker)
+        # A listing table without offers is a genuine empty card
+        marker, rows = sheets['Sold Out Card']
+        self.assertIsNone(marker)
+        self.assertEqual(rows, 0)
+
+
+class ResumeTest(ScraperTestCase):
+    """Resuming a list from today's scrape journal."""
+
+    def test_resume_skips_journaled_cards(self):
+        self.scrape({'Good-Card': 'typical.html'}, ['Good-Card', 'Slow-Card'])
+        self.assertEqual(self.requests_for('Good-Card'), 1)
+
+        # The second run only fetches the card that failed, the other sheet comes from the journal
+        sheets = self.scrape({'Good-Card': 'typical.html', 'Slow-Card': 'typical.html'},
+                             ['Good-Card', 'Slow-Card'])
+        self.assertEqual(self.requests_for('Good-Card'), 0)
+        self.assertEqual(self.requests_for('Slow-Card'), 1)
+        self.assertEqual(sheets['Good Card'], (None, 50))
+        self.assertEqual(sheets['Slow Card'], (None, 50))
+
+    def test_no_resume_resets_the_journal(self):
+        pages = {'Good-Card': 'typical.html', 'Other-Card': 'typical.html'}
+        self.scrape(pages, ['Good-Card', 'Other-Card'])
+        self.scrape(pages, ['Good-Card'], resume=False)
+        self.assertEqual(self.requests_for('Good-Card'), 1)
+
+        # The reset journal only holds the card of the second run
+        self.scrape(pages, ['Good-Card', 'Other-Card'])
+        self.assertEqual(self.requests_for('Good-Card'), 0)
+        self.assertEqual(self.requests_for('Other-Card'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
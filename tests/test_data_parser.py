@@ -0,0 +1,132 @@
+"""
+Tests for finding and parsing the listing table with both parser backends.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import re
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_parser import PARSER_BACKENDS, DataParser
+from listing import listing_dicts
+
+
+FIXTURE_PAGE = os.path.join(ROOT, 'parser_fixtures', 'typical.html')
+
+
+class ParserTestCase(unittest.TestCase):
+    """Parses the typical fixture page with every backend."""
+
+    def setUp(self):
+        with open(FIXTURE_PAGE, encoding='utf-8') as file:
+            self.html = file.read()
+
+    def parse(self, parser, html):
+        """Parse a page, returning its listing dictionaries, layout and the parser's messages."""
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            listings, layout = parser.parse_page(html)
+        return listing_dicts(listings), layout, output.getvalue()
+
+
+class TableLocationTest(ParserTestCase):
+    """The listing table is only accepted in its place on a product page."""
+
+    def test_backends_agree(self):
+        results = {backend: self.parse(DataParser(backend), self.html)[:2] for backend in PARSER_BACKENDS}
+        listings, layout = results['html.parser']
+        self.assertEqual((len(listings), layout), (50, 'ok'))
+        for backend, result in results.items():
+            with self.subTest(backend=backend):
+                self.assertEqual(result, results['html.parser'])
+
+    def test_table_outside_main_container(self):
+        html = self.html.replace('<main class="container"', '<main class="sidebar"', 1)
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                listings, layout, output = self.parse(DataParser(backend), html)
+                self.assertEqual((listings, layout), ([], 'no_table'))
+                self.assertIn("No main container found", output)
+
+    def test_table_outside_main_content(self):
+        html = self.html.replace('id="mainContent"', 'id="sideContent"', 1)
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                listings, layout, output = self.parse(DataParser(backend), html)
+                self.assertEqual((listings, layout), ([], 'no_table'))
+                self.assertIn("No mainContent found", output)
+
+
+class TablePlanTest(ParserTestCase):
+    """Learned table plans are reused for pages of the same layout and relearned when it changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.expected = self.parse(DataParser(), self.html)[:2]
+
+    def variant(self, transform):
+        """Apply a transform to the page above the table body, leaving the rows alone."""
+        head, rows = self.html.split('<div class="table-body"', 1)
+        return transform(head) + '<div class="table-body"' + rows
+
+    def test_same_layout_reuses_the_plan(self):
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                parser = DataParser(backend)
+                self.assertIn("Page layout", self.parse(parser, self.html)[2])
+                plan = parser._table_plans[0]
+
+                listings, layout, output = self.parse(parser, self.html)
+                self.assertEqual((listings, layout), self.expected)
+                self.assertNotIn("Page layout", output)
+                self.assertEqual(parser._table_plans, [plan])
+                self.assertTrue(plan.rows_are_children)
+
+    def test_whitespace_between_tags_keeps_the_layout(self):
+        minified = self.variant(lambda head: re.sub(r'>\s+<', '><', head))
+        indented = self.variant(lambda head: head.replace(
+            '<section id="table"', '\n    <!-- offers -->\n    <section id="table"', 1))
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                parser = DataParser(backend)
+                self.parse(parser, self.html)
+                for html in (minified, indented):
+                    listings, layout, output = self.parse(parser, html)
+                    self.assertEqual((listings, layout), self.expected)
+                    self.assertNotIn("Page layout", output)
+                self.assertEqual(len(parser._table_plans), 1)
+
+    def test_changed_layout_falls_back_to_the_search(self):
+        banner = self.variant(lambda head: head.replace(
+            '<section id="table"', '<div class="banner"></div><section id="table"', 1))
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                parser = DataParser(backend)
+                self.parse(parser, self.html)
+                first_plan = parser._table_plans[0]
+
+                listings, layout, output = self.parse(parser, banner)
+                self.assertEqual((listings, layout), self.expected)
+                self.assertIn("Page layout changed", output)
+                self.assertEqual(len(parser._table_plans), 2)
+
+                # Both layouts are known now
+                self.assertNotIn("Page layout", self.parse(parser, self.html)[2])
+                self.assertIn(first_plan, parser._table_plans)
+
+    def test_page_without_table_is_not_matched_by_a_plan(self):
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                parser = DataParser(backend)
+                self.parse(parser, self.html)
+                no_table = self.html.replace('<section id="table"', '<section id="reviews"', 1)
+                self.assertEqual(self.parse(parser, no_table)[:2], ([], 'no_table'))
+
+
+if __name__ == '__main__':
+    unittest.main()
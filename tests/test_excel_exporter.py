@@ -0,0 +1,93 @@
+"""
+Tests for writing listings to Excel workbooks.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+from openpyxl import load_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_parser import DataParser
+from excel_exporter import ExcelExporter, HEADER_ROW, LISTING_COLUMNS, WIDTH_SAMPLE_ROWS
+
+
+FIXTURE_PAGE = os.path.join(ROOT, 'parser_fixtures', 'typical.html')
+LARGE_FIXTURE_PAGE = os.path.join(ROOT, 'parser_fixtures', 'large.html.gz')
+
+
+class SaveToExcelTest(unittest.TestCase):
+    """save_to_excel with the listing forms the parser hands out."""
+
+    def setUp(self):
+        with open(FIXTURE_PAGE, encoding='utf-8') as file:
+            self.html = file.read()
+        self.parser = DataParser()
+        # Empty strings come back from the workbook as blank cells
+        self.expected = [[None if value == '' else value for value in row]
+                         for row in self.parser.parse_page_data(self.html).rows()]
+
+        # The exporter writes to output/ under the working directory
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.temp_dir.cleanup()
+
+    def save(self, listings):
+        """Save one sheet with the given listings and return its rows below the header."""
+        exporter = ExcelExporter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            saved = exporter.save_to_excel({'Card': {'listings': listings, 'url': 'https://example.com/card'}},
+                                           'Test')
+            filename = exporter._generate_filename('Test')
+        self.assertTrue(saved)
+
+        workbook = load_workbook(filename, read_only=True)
+        try:
+            rows = [list(row) for row in workbook['Card'].iter_rows(min_row=HEADER_ROW, values_only=True)]
+        finally:
+            workbook.close()
+        self.assertEqual(rows[0], LISTING_COLUMNS)
+        return rows[1:]
+
+    def test_iter_listings_stream(self):
+        listings = self.parser.iter_listings(self.html)
+        self.assertEqual(self.save(listings), self.expected)
+
+    def test_listing_records(self):
+        listings = list(self.parser.iter_listings(self.html))
+        self.assertEqual(self.save(listings), self.expected)
+
+    def test_listing_batch(self):
+        self.assertEqual(self.save(self.parser.parse_page_data(self.html)), self.expected)
+
+    def test_listing_dictionaries(self):
+        listings = self.parser.parse_page_data(self.html).to_dicts()
+        self.assertEqual(self.save(listings), self.expected)
+
+    def test_stream_longer_than_width_sample(self):
+        with gzip.open(LARGE_FIXTURE_PAGE, 'rt', encoding='utf-8') as file:
+            html = file.read()
+        expected = [[None if value == '' else value for value in row]
+                    for row in self.parser.parse_page_data(html).rows()]
+        self.assertGreater(len(expected), WIDTH_SAMPLE_ROWS)
+
+        self.assertEqual(self.save(self.parser.iter_listings(html)), expected)
+
+    def test_empty_stream(self):
+        self.assertEqual(self.save(iter(())), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
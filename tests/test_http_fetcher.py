@@ -0,0 +1,97 @@
+"""
+Tests for the HTTP fetch backend against the local CardMarket stand-in.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_parser import DataParser
+from http_fetcher import AsyncHTTPFetcher
+from listing import listing_dicts
+from local_cardmarket_server import LocalCardMarketServer
+
+
+FIXTURES_DIR = os.path.join(ROOT, 'parser_fixtures')
+
+
+class AsyncHTTPFetcherTest(unittest.TestCase):
+    """Pages fetched over HTTP parse like the saved pages they were served from."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Port 0 picks a free port
+        cls.server = LocalCardMarketServer(FIXTURES_DIR, latency=0.05).start()
+        cls.pages = [name[:-len('.html')] for name in LocalCardMarketServer.list_pages(FIXTURES_DIR)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.fetcher = AsyncHTTPFetcher(max_concurrency=4, limit_per_host=4, timeout=10)
+        self.parser = DataParser()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.fetcher.open())
+
+    def tearDown(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.fetcher.close()
+
+    def url(self, page):
+        return f"{self.server.base_url}Test-Set/{page}?language=1"
+
+    def parse(self, html):
+        with contextlib.redirect_stdout(io.StringIO()):
+            listings, layout = self.parser.parse_page(html)
+        return listing_dicts(listings), layout
+
+    def expected(self, page):
+        with open(os.path.join(FIXTURES_DIR, f"{page}.html"), encoding='utf-8') as file:
+            return self.parse(file.read())
+
+    def check(self, page, result):
+        self.assertEqual(result.status, 'ok', result.error)
+        self.assertEqual(result.http_status, 200)
+        self.assertGreater(result.bytes_transferred, 0)
+        self.assertEqual(self.parse(result.html), self.expected(page))
+
+    def test_fetch(self):
+        url = self.url('typical')
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.fetcher.fetch(url)
+        self.assertEqual(result.final_url, url)
+        self.check('typical', result)
+
+    def test_fetch_many_keeps_input_order(self):
+        urls = [self.url(page) for page in self.pages]
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = self.fetcher.fetch_many(urls)
+
+        self.assertEqual([result.url for result in results], urls)
+        for page, result in zip(self.pages, results):
+            with self.subTest(page=page):
+                self.check(page, result)
+
+    def test_missing_page(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok, missing = self.fetcher.fetch_many([self.url('small'), self.url('Unknown-Card')])
+        self.check('small', ok)
+        self.assertEqual((missing.status, missing.http_status, missing.error),
+                         ('navigation_failed', 404, "HTTP 404"))
+
+    def test_closed_fetcher(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.fetcher.close()
+        results = self.fetcher.fetch_many([self.url('small')])
+        self.assertEqual((results[0].status, results[0].error), ('navigation_failed', "HTTP fetcher not open"))
+
+
+if __name__ == '__main__':
+    unittest.main()
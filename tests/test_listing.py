@@ -0,0 +1,56 @@
+"""
+Tests for converting scraped prices to integer cents.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from listing import Listing, listing_price_cents, parse_price_cents
+
+
+class ParsePriceCentsTest(unittest.TestCase):
+    """parse_price_cents on scraped text and on values read back from workbooks."""
+
+    def test_scraped_text(self):
+        cases = [
+            ("1.234,56", 123456),
+            ("1.234,56 €", 123456),
+            ("0,99", 99),
+            ("0,50 €", 50),
+            ("12,5", 1250),
+            ("€ 3", 300),
+            ("1.000.000,00 €", 100000000),
+            # Without a comma the dot is the decimal point
+            ("12.50", 1250),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(parse_price_cents(text), expected)
+
+    def test_numbers(self):
+        self.assertEqual(parse_price_cents(3), 300)
+        self.assertEqual(parse_price_cents(3.5), 350)
+        # 0.29 * 100 is 28.999999999999996 as a float
+        self.assertEqual(parse_price_cents(0.29), 29)
+        self.assertEqual(parse_price_cents("0,005"), 1)
+
+    def test_junk(self):
+        for value in ("", None, "N/A", "price on request", "1,2,3", "€", "nan", "inf",
+                      float('nan'), float('inf'), True):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_price_cents(value))
+
+    def test_listing_price_cents(self):
+        self.assertEqual(listing_price_cents({'price': "1,50 €"}), 150)
+        self.assertEqual(listing_price_cents({'price': "1,50 €", 'price_cents': 149}), 149)
+        self.assertIsNone(listing_price_cents({'price': "-"}))
+        self.assertEqual(listing_price_cents(Listing(price="2,00 €", price_cents=200)), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Tests for the on-disk page cache and the fetcher serving from it.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fetcher import Fetcher, FetchResult
+from page_cache import CacheFetcher, PageCache
+
+
+def random_page(size=400_000):
+    """A page that barely compresses (about 200 KB gzipped)."""
+    return os.urandom(size // 2).hex()
+
+
+class CountingFetcher(Fetcher):
+    """Returns a fixed page and counts the requests."""
+
+    name = 'counting'
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, url, wait_time=3):
+        self.requests.append(url)
+        return FetchResult(url, html=f"<html>{url}</html>", final_url=url)
+
+
+class PageCacheTest(unittest.TestCase):
+    """TTL checks and least-recently-used eviction of PageCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.temp_dir.name, max_size_mb=0.5)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get('https://example.com/a'))
+        self.cache.put('https://example.com/a', '<html>a</html>', fetched_at=1000)
+        self.assertEqual(self.cache.get('https://example.com/a'), ('<html>a</html>', 1000))
+
+    def test_ttl(self):
+        self.cache.put('https://example.com/old', '<html>old</html>', fetched_at=time.time() - 3600)
+        self.cache.put('https://example.com/new', '<html>new</html>')
+
+        self.assertIsNone(self.cache.get('https://example.com/old', max_age=1800))
+        self.assertIsNotNone(self.cache.get('https://example.com/old', max_age=7200))
+        self.assertIsNotNone(self.cache.get('https://example.com/old'))
+        self.assertIsNotNone(self.cache.get('https://example.com/new', max_age=1800))
+
+    def test_evicts_least_recently_used(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.cache.put('https://example.com/a', random_page())
+            time.sleep(0.01)
+            self.cache.put('https://example.com/b', random_page())
+            time.sleep(0.01)
+            # Reading a page makes it recently used
+            self.assertIsNotNone(self.cache.get('https://example.com/a'))
+            time.sleep(0.01)
+            self.cache.put('https://example.com/c', random_page())
+
+        self.assertEqual(sorted(self.cache.urls()), ['https://example.com/a', 'https://example.com/c'])
+        self.assertIsNone(self.cache.get('https://example.com/b'))
+        self.assertIn("Evicted 1 cached pages", output.getvalue())
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir.name, 'pages'))), 2)
+
+    def test_missing_page_file_is_forgotten(self):
+        self.cache.put('https://example.com/a', '<html>a</html>')
+        os.remove(self.cache._path_for(PageCache.key_for('https://example.com/a')))
+        self.assertIsNone(self.cache.get('https://example.com/a'))
+        self.assertEqual(self.cache.urls(), [])
+
+    def test_discard(self):
+        self.cache.put('https://example.com/a', '<html>a</html>')
+        self.cache.discard('https://example.com/a')
+        self.cache.discard('https://example.com/unknown')
+        self.assertEqual(self.cache.urls(), [])
+
+
+class CacheFetcherTest(unittest.TestCase):
+    """Serving pages from the cache within their TTL."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.temp_dir.name)
+        self.inner = CountingFetcher()
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def fetch(self, fetcher, url):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fetcher.fetch(url)
+
+    def test_serves_fresh_pages_from_cache(self):
+        fetcher = CacheFetcher(self.cache, self.inner, ttls={'https://example.com/a': 3600})
+        first = self.fetch(fetcher, 'https://example.com/a')
+        second = self.fetch(fetcher, 'https://example.com/a')
+
+        self.assertEqual(self.inner.requests, ['https://example.com/a'])
+        self.assertEqual(second.html, first.html)
+        self.assertEqual(second.wait_mode, 'cache')
+
+    def test_refetches_stale_pages(self):
+        self.cache.put('https://example.com/a', '<html>stale</html>', fetched_at=time.time() - 7200)
+        fetcher = CacheFetcher(self.cache, self.inner, ttls={'https://example.com/a': 3600})
+        self.assertEqual(self.fetch(fetcher, 'https://example.com/a').html, '<html>https://example.com/a</html>')
+        self.assertEqual(self.cache.get('https://example.com/a')[0], '<html>https://example.com/a</html>')
+
+    def test_zero_ttl_always_fetches(self):
+        fetcher = CacheFetcher(self.cache, self.inner)
+        self.fetch(fetcher, 'https://example.com/a')
+        self.fetch(fetcher, 'https://example.com/a')
+        self.assertEqual(len(self.inner.requests), 2)
+
+    def test_cache_only_serves_any_age(self):
+        self.cache.put('https://example.com/a', '<html>a</html>', fetched_at=1000)
+        fetcher = CacheFetcher(self.cache)
+        self.assertEqual(self.fetch(fetcher, 'https://example.com/a').html, '<html>a</html>')
+        self.assertEqual(self.fetch(fetcher, 'https://example.com/b').status, 'not_cached')
+
+        # Nothing to refetch from, so invalidating keeps the page
+        fetcher.invalidate('https://example.com/a')
+        self.assertIsNotNone(self.cache.get('https://example.com/a'))
+
+    def test_invalidate_refetches(self):
+        fetcher = CacheFetcher(self.cache, self.inner, default_ttl=3600)
+        self.fetch(fetcher, 'https://example.com/a')
+        fetcher.invalidate('https://example.com/a')
+        self.fetch(fetcher, 'https://example.com/a')
+        self.assertEqual(len(self.inner.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
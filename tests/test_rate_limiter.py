@@ -0,0 +1,70 @@
+"""
+Tests for telling throttling and challenge pages apart from ordinary pages.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fetcher import FetchResult
+from rate_limiter import is_throttled
+
+
+FIXTURE_PAGE = os.path.join(ROOT, 'parser_fixtures', 'typical.html')
+
+CLOUDFLARE_CHALLENGE = """<!DOCTYPE html><html lang="en-US"><head><title>Just a moment...</title>
+<meta http-equiv="refresh" content="390"></head><body><div class="main-wrapper">
+<script>(function(){window._cf_chl_opt={cvId: '3', cZone: "www.cardmarket.com"};}());</script>
+</div></body></html>"""
+
+
+def page(html, http_status=200, status='ok'):
+    return FetchResult('https://www.cardmarket.com/en/YuGiOh/Products/Singles/Set/Card', status=status,
+                       html=html, http_status=http_status)
+
+
+class IsThrottledTest(unittest.TestCase):
+    """is_throttled on statuses, challenge pages and ordinary pages."""
+
+    def test_throttle_statuses(self):
+        for http_status in (403, 429, 503):
+            with self.subTest(http_status=http_status):
+                self.assertTrue(is_throttled(page('', http_status, 'navigation_failed')))
+        self.assertFalse(is_throttled(page('', 404, 'navigation_failed')))
+        self.assertTrue(is_throttled(page('<html></html>', status='wrong_site')))
+
+    def test_challenge_pages(self):
+        pages = [
+            CLOUDFLARE_CHALLENGE,
+            "<html><head><title>Attention Required! | Cloudflare</title></head><body></body></html>",
+            "<html><head>\n<TITLE>\n  Verify you are human\n</TITLE></head></html>",
+            '<html><head><title>cardmarket.com</title></head><body>'
+            '<iframe src="https://geo.captcha-delivery.com/captcha/?initialCid=x"></iframe></body></html>',
+        ]
+        for html in pages:
+            with self.subTest(html=html[:60]):
+                self.assertTrue(is_throttled(page(html)))
+
+    def test_ordinary_pages(self):
+        with open(FIXTURE_PAGE, encoding='utf-8') as file:
+            product_page = file.read()
+        pages = [
+            product_page,
+            # A login form with a captcha near the top of an ordinary page
+            product_page.replace('</head>', '</head><form id="login"><div class="g-recaptcha"></div></form>', 1),
+            # Cloudflare adds its challenge-platform script to ordinary pages too
+            product_page.replace('</head>', '<script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js">'
+                                            '</script></head>', 1),
+            "<html><head><title>Captcha Card | Cardmarket</title></head><body></body></html>",
+        ]
+        for index, html in enumerate(pages):
+            with self.subTest(page=index):
+                self.assertFalse(is_throttled(page(html)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for choosing which cards an incremental run refreshes.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from refresh_planner import RefreshPlanner
+
+
+DAY = 86400
+
+
+def snapshot(days_ago, *prices):
+    """A snapshot scraped some days ago with listings at the given prices."""
+    return {'scraped_at': time.time() - days_ago * DAY,
+            'listings': [{'price': price} for price in prices]}
+
+
+class RefreshPlannerTest(unittest.TestCase):
+    """Scoring cards and picking the ones due within the budget."""
+
+    def test_volatility(self):
+        planner = RefreshPlanner()
+        self.assertEqual(planner.volatility([]), 0.0)
+        self.assertEqual(planner.volatility([snapshot(1, '1,00 €')]), 0.0)
+        # Cheapest prices 1,00 -> 1,10 -> 0,99: both moves are 10%
+        snapshots = [snapshot(1, '0,99 €', '5,00 €'), snapshot(2, '1,10 €'), snapshot(3, '2,00 €', '1,00 €')]
+        self.assertAlmostEqual(planner.volatility(snapshots), 0.1)
+
+    def test_score(self):
+        planner = RefreshPlanner(volatility_weight=10)
+        now = time.time()
+        self.assertEqual(planner.score([], now), float('inf'))
+        self.assertAlmostEqual(planner.score([snapshot(2, '1,00 €'), snapshot(4, '1,00 €')], now), 2, places=3)
+        # 10% volatility doubles the score
+        self.assertAlmostEqual(planner.score([snapshot(2, '1,10 €'), snapshot(4, '1,00 €')], now), 4, places=3)
+
+    def test_plans_due_cards_most_urgent_first(self):
+        planner = RefreshPlanner(refresh_after_days=3)
+        history = {
+            'Fresh': [snapshot(1, '1,00 €'), snapshot(2, '1,00 €')],
+            'Old': [snapshot(5, '1,00 €'), snapshot(6, '1,00 €')],
+            'Older': [snapshot(8, '1,00 €')],
+            # Only 2 days old, but moving 50% between snapshots
+            'Volatile': [snapshot(2, '1,50 €'), snapshot(3, '1,00 €')],
+        }
+        due, scores = planner.plan(['Fresh', 'Old', 'Older', 'Volatile', 'New'], history)
+
+        self.assertEqual(due, ['New', 'Volatile', 'Older', 'Old'])
+        self.assertEqual(set(scores), {'Fresh', 'Old', 'Older', 'Volatile', 'New'})
+        self.assertLess(scores['Fresh'], 3)
+
+    def test_over_budget_keeps_the_most_urgent(self):
+        planner = RefreshPlanner(refresh_after_days=3, max_cards=2)
+        history = {
+            'Old': [snapshot(5, '1,00 €')],
+            'Older': [snapshot(8, '1,00 €')],
+            'Oldest': [snapshot(20, '1,00 €')],
+        }
+        due, scores = planner.plan(['Old', 'Older', 'Oldest', 'New'], history)
+        self.assertEqual(due, ['New', 'Oldest'])
+        # Cards left out of the budget are still scored
+        self.assertEqual(len(scores), 4)
+
+    def test_nothing_due(self):
+        planner = RefreshPlanner(refresh_after_days=3)
+        due, _ = planner.plan(['Fresh'], {'Fresh': [snapshot(1, '1,00 €')]})
+        self.assertEqual(due, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
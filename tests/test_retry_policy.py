@@ -0,0 +1,140 @@
+"""
+Tests for failure classification, retry backoff and the circuit breaker.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fetcher import FetchResult
+from retry_policy import (DEFAULT_RETRIES, EMPTY, NETWORK, NO_CONTENT, NOT_CACHED, PARSE_FAILURE, TIMEOUT,
+                          WRONG_SITE, CircuitBreaker, RetryPolicy, classify_exception, classify_fetch_result)
+
+
+class ClassifyTest(unittest.TestCase):
+    """Failure classes of fetch results and exceptions."""
+
+    def test_fetch_results(self):
+        cases = [
+            (FetchResult('u', html='<html></html>'), None),
+            (FetchResult('u', status='navigation_failed', wait_mode='timeout'), TIMEOUT),
+            (FetchResult('u', status='navigation_failed', error='Read timed out'), TIMEOUT),
+            (FetchResult('u', status='navigation_failed', error='HTTP 503'), NETWORK),
+            (FetchResult('u', status='wrong_site'), WRONG_SITE),
+            (FetchResult('u', status='empty'), NO_CONTENT),
+            (FetchResult('u', status='not_cached'), NOT_CACHED),
+        ]
+        for result, expected in cases:
+            with self.subTest(status=result.status, error=result.error):
+                self.assertEqual(classify_fetch_result(result), expected)
+
+    def test_exceptions(self):
+        self.assertEqual(classify_exception(TimeoutError("read")), TIMEOUT)
+        self.assertEqual(classify_exception(RuntimeError("page load timed out")), TIMEOUT)
+        self.assertEqual(classify_exception(ConnectionResetError("reset by peer")), NETWORK)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """Backoff and retry limits per failure class."""
+
+    def test_every_class_backs_off_until_its_limit(self):
+        policy = RetryPolicy(max_delay=1000)
+        for kind, settings in DEFAULT_RETRIES.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(policy.max_retries(kind), settings['max_retries'])
+                for attempt in range(settings['max_retries']):
+                    expected = settings['base_delay'] * 2 ** attempt
+                    delay = policy.delay(kind, attempt)
+                    self.assertIsNotNone(delay)
+                    # +/-20% jitter
+                    self.assertGreaterEqual(delay, expected * 0.8)
+                    self.assertLessEqual(delay, expected * 1.2)
+                self.assertIsNone(policy.delay(kind, settings['max_retries']))
+
+    def test_genuine_results_are_not_retried(self):
+        policy = RetryPolicy()
+        self.assertIsNone(policy.delay(EMPTY, 0))
+        self.assertIsNone(policy.delay(NOT_CACHED, 0))
+
+    def test_delay_is_capped(self):
+        policy = RetryPolicy({WRONG_SITE: {'max_retries': 10}}, max_delay=45)
+        self.assertLessEqual(policy.delay(WRONG_SITE, 5), 45 * 1.2)
+
+    def test_settings_override_defaults(self):
+        policy = RetryPolicy.from_settings({PARSE_FAILURE: {'max_retries': 3, 'base_delay': 1},
+                                            'unknown': {'max_retries': 9}, 'max_delay': 2})
+        self.assertEqual(policy.max_retries(PARSE_FAILURE), 3)
+        self.assertEqual(policy.max_retries(TIMEOUT), DEFAULT_RETRIES[TIMEOUT]['max_retries'])
+        self.assertEqual(policy.max_retries('unknown'), 0)
+        self.assertLessEqual(policy.delay(PARSE_FAILURE, 2), 2 * 1.2)
+
+    def test_counts_retries_and_give_ups(self):
+        policy = RetryPolicy()
+        policy.delay(PARSE_FAILURE, 0)
+        policy.delay(PARSE_FAILURE, 1)
+        self.assertEqual(policy.retried[PARSE_FAILURE], 1)
+        self.assertEqual(policy.gave_up[PARSE_FAILURE], 1)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """Opening on a failure spike, probing after the pause and closing again."""
+
+    def make_breaker(self, pause_seconds=0.05):
+        return CircuitBreaker(failure_rate=0.5, window=4, min_samples=4,
+                              pause_seconds=pause_seconds, max_pause_seconds=0.15)
+
+    def is_open(self, breaker):
+        start_time = time.monotonic()
+        breaker.wait_if_open()
+        return time.monotonic() - start_time > 0.02
+
+    def test_stays_closed_below_min_samples_and_rate(self):
+        breaker = self.make_breaker()
+        # All failures, but fewer than min_samples
+        for success in (False, False, False):
+            breaker.record(success)
+        self.assertEqual(breaker.openings, 0)
+
+        breaker = self.make_breaker()
+        for success in (False, True, True, True, True):
+            breaker.record(success)
+        self.assertEqual(breaker.openings, 0)
+
+    def test_trips_and_resets(self):
+        breaker = self.make_breaker()
+        for success in (True, False, True, False):
+            breaker.record(success)
+        self.assertEqual(breaker.openings, 1)
+        # Outcomes of pages already loading while open are ignored
+        breaker.record(False)
+        self.assertEqual(breaker.openings, 1)
+        self.assertTrue(self.is_open(breaker))
+
+        # A success after the pause closes the breaker and forgets the old failures
+        breaker.record(True)
+        self.assertFalse(self.is_open(breaker))
+        for success in (False, True, True):
+            breaker.record(success)
+        self.assertEqual(breaker.openings, 1)
+
+    def test_failed_probe_doubles_the_pause(self):
+        breaker = self.make_breaker()
+        for _ in range(4):
+            breaker.record(False)
+        breaker.wait_if_open()
+        breaker.record(False)
+        self.assertEqual(breaker.openings, 2)
+        self.assertAlmostEqual(breaker.paused_seconds, 0.05 + 0.1)
+        breaker.wait_if_open()
+        breaker.record(False)
+        # Capped at max_pause_seconds
+        self.assertAlmostEqual(breaker.paused_seconds, 0.05 + 0.1 + 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
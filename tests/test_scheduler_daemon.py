@@ -0,0 +1,133 @@
+"""
+Tests for cron schedules and the overlap policies of scheduled jobs.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scheduler_daemon import CronSchedule, ScheduledJob, SchedulerDaemon
+
+
+class CronScheduleTest(unittest.TestCase):
+    """Parsing cron expressions and finding the next firing time."""
+
+    def next_after(self, expression, moment):
+        return CronSchedule(expression).next_after(moment)
+
+    def test_next_after(self):
+        cases = [
+            # Always the next whole minute, even from exactly a firing time
+            ('* * * * *', datetime(2024, 1, 1, 10, 0, 30), datetime(2024, 1, 1, 10, 1)),
+            ('*/15 * * * *', datetime(2024, 1, 1, 10, 15), datetime(2024, 1, 1, 10, 30)),
+            ('@hourly', datetime(2024, 1, 1, 23, 59), datetime(2024, 1, 2, 0, 0)),
+            ('30 6 * * *', datetime(2024, 1, 1, 7, 0), datetime(2024, 1, 2, 6, 30)),
+            ('0 9-17/4 * * *', datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 13, 0)),
+            ('@monthly', datetime(2024, 1, 31, 12, 0), datetime(2024, 2, 1, 0, 0)),
+            # 1 January 2024 is a Monday
+            ('0 8 * * 1-5', datetime(2024, 1, 5, 9, 0), datetime(2024, 1, 8, 8, 0)),
+            ('0 0 * * 7', datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 7, 0, 0)),
+            # Either day field matches when both are restricted
+            ('0 0 15 * 3', datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 3, 0, 0)),
+            ('0 0 29 2 *', datetime(2024, 3, 1, 0, 0), datetime(2028, 2, 29, 0, 0)),
+        ]
+        for expression, moment, expected in cases:
+            with self.subTest(expression=expression, moment=moment):
+                self.assertEqual(self.next_after(expression, moment), expected)
+
+    def test_never_fires(self):
+        self.assertIsNone(self.next_after('0 0 30 2 *', datetime(2024, 1, 1)))
+
+    def test_invalid_expressions(self):
+        for expression in ('* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *', 'a * * * *'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    CronSchedule(expression)
+
+    def test_matches(self):
+        schedule = CronSchedule('0,30 12 * * *')
+        self.assertTrue(schedule.matches(datetime(2024, 1, 1, 12, 30, 45)))
+        self.assertFalse(schedule.matches(datetime(2024, 1, 1, 12, 15)))
+
+
+class StubDaemon(SchedulerDaemon):
+    """Daemon whose scrape step runs a callback instead of scraping."""
+
+    on_scrape = None
+
+    def _step_scrape(self, job):
+        if self.on_scrape:
+            self.on_scrape(job)
+        return True
+
+
+class OverlapTest(unittest.TestCase):
+    """The skip and queue policies for jobs that come due while busy."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.daemon = StubDaemon(schedule_file=os.path.join(self.temp_dir.name, 'schedule.yaml'),
+                                 list_file=os.path.join(self.temp_dir.name, '_list.yaml'),
+                                 lists_dir=self.temp_dir.name, decks_dir=self.temp_dir.name)
+        self.daemon.status_file = os.path.join(self.temp_dir.name, 'status.json')
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def add_job(self, overlap):
+        job = ScheduledJob(name='job', schedule=CronSchedule('@hourly'), lists=['list.yaml'],
+                           steps=['scrape'], decks=[], overlap=overlap)
+        self.daemon.jobs[job.name] = job
+        return job
+
+    def queued(self):
+        return self.daemon._queue.qsize()
+
+    def test_idle_job_is_queued_once(self):
+        job = self.add_job('queue')
+        self.daemon.trigger(job)
+        self.assertEqual((job.state, self.queued()), ('queued', 1))
+        # Already waiting to run, another trigger adds nothing
+        self.daemon.trigger(job)
+        self.assertEqual((job.skipped, self.queued()), (1, 1))
+
+    def test_skip_drops_runs_while_running(self):
+        job = self.add_job('skip')
+        self.daemon.on_scrape = self.daemon.trigger
+        self.daemon._run_job(job)
+
+        self.assertEqual((job.state, job.pending, job.skipped), ('idle', False, 1))
+        self.assertEqual(self.queued(), 0)
+        self.assertEqual((job.runs, job.last_result), (1, 'ok'))
+
+    def test_queue_keeps_one_run_behind_the_current_one(self):
+        job = self.add_job('queue')
+
+        def come_due_twice(job):
+            self.daemon.trigger(job)
+            self.daemon.trigger(job)
+        self.daemon.on_scrape = come_due_twice
+        self.daemon._run_job(job)
+
+        self.assertEqual((job.state, job.pending, job.skipped), ('queued', True, 1))
+        self.assertEqual(self.queued(), 1)
+
+        # The queued run starts fresh
+        self.daemon.on_scrape = None
+        self.daemon._run_job(job)
+        self.assertEqual((job.state, job.pending, job.runs), ('idle', False, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the scrape journal used to resume interrupted runs.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrape_journal import ScrapeJournal
+
+
+LISTING = {'seller': 'Seller', 'price': '1,00 €', 'quantity': '1'}
+
+
+class ScrapeJournalTest(unittest.TestCase):
+    """Appending, reading back and resetting journal records."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'journal', 'list.jsonl')
+        self.journal = ScrapeJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        self.temp_dir.cleanup()
+
+    def test_missing_journal_is_empty(self):
+        self.assertEqual(self.journal.load(), {})
+        self.assertEqual(self.journal.index(), {})
+
+    def test_records_survive_a_new_journal(self):
+        self.journal.append('Card A', 'https://example.com/a', [LISTING])
+        self.journal.append('Card B', 'https://example.com/b', [])
+        self.journal.close()
+
+        journal = ScrapeJournal(self.path)
+        records = journal.load()
+        self.assertEqual(list(records), ['Card A', 'Card B'])
+        self.assertEqual(records['Card A']['url'], 'https://example.com/a')
+        self.assertEqual(records['Card A']['listings'], [LISTING])
+
+        offsets = journal.index()
+        self.assertEqual(list(offsets), ['Card A', 'Card B'])
+        self.assertEqual(journal.read(offsets['Card B'])['listings'], [])
+
+    def test_later_records_win(self):
+        self.journal.append('Card A', 'https://example.com/a', [])
+        self.journal.append('Card A', 'https://example.com/a', [LISTING])
+        self.assertEqual(self.journal.load()['Card A']['listings'], [LISTING])
+        self.assertEqual(self.journal.read(self.journal.index()['Card A'])['listings'], [LISTING])
+
+    def test_torn_last_line_is_skipped(self):
+        self.journal.append('Card A', 'https://example.com/a', [LISTING])
+        self.journal.close()
+        # A crash in the middle of writing the next record
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{"card_name": "Card B", "url": "https://exa')
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(list(self.journal.load()), ['Card A'])
+            self.assertEqual(list(self.journal.index()), ['Card A'])
+        self.assertIn("damaged journal line 2", output.getvalue())
+
+    def test_reset(self):
+        self.journal.append('Card A', 'https://example.com/a', [LISTING])
+        self.journal.reset()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.journal.load(), {})
+
+        # The journal keeps working after a reset
+        self.journal.append('Card B', 'https://example.com/b', [])
+        self.assertEqual(list(self.journal.load()), ['Card B'])
+
+
+if __name__ == '__main__':
+    unittest.main()
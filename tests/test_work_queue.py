@@ -0,0 +1,151 @@
+"""
+Tests for the SQLite-backed work queue.
+Run from the repository root with: python -m pytest tests (or python -m unittest discover tests)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from work_queue import SQLiteWorkQueue, open_work_queue
+
+
+LISTING = {'seller': 'Seller', 'price': '1,00 €', 'quantity': '1'}
+
+
+class SQLiteWorkQueueTest(unittest.TestCase):
+    """Leases, retries and the result log of SQLiteWorkQueue."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = SQLiteWorkQueue(os.path.join(self.temp_dir.name, 'queue.db'))
+
+    def tearDown(self):
+        self.queue.close()
+        self.temp_dir.cleanup()
+
+    def add_run(self, urls, lease_seconds=120, max_attempts=3):
+        jobs = [{'url': url, 'card_name': url.rsplit('/', 1)[-1], 'wait_time': 3} for url in urls]
+        return self.queue.add_run('run', {'fetcher': 'http'}, jobs,
+                                  lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+    def expire(self, job):
+        """Let a job's lease run out."""
+        time.sleep(job['lease_seconds'] + 0.01)
+
+    def test_add_run_and_claim(self):
+        self.assertEqual(self.add_run(['https://example.com/a', 'https://example.com/b']), 2)
+        # Jobs already queued for the run are not added twice
+        self.assertEqual(self.add_run(['https://example.com/a']), 0)
+        self.assertEqual(self.queue.run_settings('run'), {'fetcher': 'http'})
+        self.assertIsNone(self.queue.run_settings('other'))
+
+        first = self.queue.claim('w1')
+        second = self.queue.claim('w2')
+        self.assertEqual((first['url'], first['card_name'], first['attempts'], first['wait_time']),
+                         ('https://example.com/a', 'a', 1, 3))
+        self.assertEqual(second['url'], 'https://example.com/b')
+        self.assertIsNone(self.queue.claim('w3'))
+
+    def test_expired_lease_returns_job_to_pending(self):
+        self.add_run(['https://example.com/a'], lease_seconds=0.05)
+        job = self.queue.claim('w1')
+        self.assertIsNone(self.queue.claim('w2'))
+
+        self.expire(job)
+        retried = self.queue.claim('w2')
+        self.assertEqual(retried['id'], job['id'])
+        self.assertEqual(retried['attempts'], 2)
+        self.assertEqual(self.queue.results('run'), ([], 0))
+
+    def test_renew_keeps_the_lease(self):
+        self.add_run(['https://example.com/a'], lease_seconds=1)
+        job = self.queue.claim('w1')
+        time.sleep(0.6)
+        self.assertTrue(self.queue.renew(job, 'w1'))
+        # Past the first lease period, within the renewed one
+        time.sleep(0.6)
+        self.assertIsNone(self.queue.claim('w2'))
+        self.assertFalse(self.queue.renew(job, 'w2'))
+
+    def test_fails_after_max_attempts(self):
+        self.add_run(['https://example.com/a'], max_attempts=2)
+        job = self.queue.claim('w1')
+        self.assertTrue(self.queue.fail(job, 'w1', "timeout"))
+        # Back in the queue for the second attempt
+        job = self.queue.claim('w2')
+        self.assertEqual(job['attempts'], 2)
+        self.assertEqual(self.queue.results('run'), ([], 0))
+
+        self.assertTrue(self.queue.fail(job, 'w2', "timeout again"))
+        self.assertIsNone(self.queue.claim('w3'))
+        results, _ = self.queue.results('run')
+        self.assertEqual(results, [{'url': 'https://example.com/a', 'status': 'failed', 'listings': [],
+                                    'error': "timeout again", 'worker': 'w2'}])
+
+    def test_expired_lease_on_last_attempt_fails_the_job(self):
+        self.add_run(['https://example.com/a'], lease_seconds=0.05, max_attempts=1)
+        job = self.queue.claim('w1')
+        self.expire(job)
+        self.queue.expire_leases()
+
+        results, _ = self.queue.results('run')
+        self.assertEqual([(result['status'], result['error'], result['worker']) for result in results],
+                         [('failed', "lease expired", 'w1')])
+        self.assertIsNone(self.queue.claim('w2'))
+
+    def test_lost_lease_is_not_recorded(self):
+        self.add_run(['https://example.com/a'], lease_seconds=0.05)
+        slow_job = self.queue.claim('slow')
+        self.expire(slow_job)
+        job = self.queue.claim('fast')
+
+        self.assertFalse(self.queue.complete(slow_job, 'slow', [LISTING]))
+        self.assertFalse(self.queue.fail(slow_job, 'slow', "too late"))
+        self.assertFalse(self.queue.renew(slow_job, 'slow'))
+        self.assertEqual(self.queue.results('run'), ([], 0))
+
+        self.assertTrue(self.queue.complete(job, 'fast', [LISTING]))
+        # Finished jobs cannot be completed twice
+        self.assertFalse(self.queue.complete(job, 'fast', [LISTING]))
+        results, _ = self.queue.results('run')
+        self.assertEqual([(result['status'], result['worker']) for result in results], [('done', 'fast')])
+
+    def test_results_cursor(self):
+        self.add_run(['https://example.com/a', 'https://example.com/b', 'https://example.com/c'])
+        self.queue.complete(self.queue.claim('w1'), 'w1', [LISTING])
+        self.queue.complete(self.queue.claim('w1'), 'w1', [])
+
+        results, cursor = self.queue.results('run')
+        self.assertEqual([result['url'] for result in results], ['https://example.com/a', 'https://example.com/b'])
+        self.assertEqual(results[0]['listings'], [LISTING])
+        self.assertEqual(results[1]['listings'], [])
+        # Nothing new since the cursor
+        self.assertEqual(self.queue.results('run', cursor), ([], cursor))
+
+        self.queue.complete(self.queue.claim('w1'), 'w1', [LISTING])
+        results, next_cursor = self.queue.results('run', cursor)
+        self.assertEqual([result['url'] for result in results], ['https://example.com/c'])
+        self.assertGreater(next_cursor, cursor)
+
+    def test_delete_run(self):
+        self.add_run(['https://example.com/a', 'https://example.com/b'])
+        self.queue.complete(self.queue.claim('w1'), 'w1', [LISTING])
+        self.queue.delete_run('run')
+        self.assertIsNone(self.queue.run_settings('run'))
+        self.assertIsNone(self.queue.claim('w1'))
+        self.assertEqual(self.queue.results('run'), ([], 0))
+
+    def test_open_work_queue(self):
+        queue = open_work_queue(f"sqlite:///{os.path.join(self.temp_dir.name, 'other.db')}")
+        self.assertIsInstance(queue, SQLiteWorkQueue)
+        queue.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,8 +11,8 @@ class URLBuilder:
     
     BASE_URL = "https://www.cardmarket.com/en/YuGiOh/Products/Singles/"
     
-    def __init__(self):
-        pass
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
     
     def build_url(self, card_name: str, card_config: Dict[str, Any]) -> str:
         """
@@ -44,7 +44,7 @@ class URLBuilder:
         Returns:
             Base URL string
         """
-        url = self.BASE_URL
+        url = self.base_url
         
         set_name = card_config.get('set', '')
         if set_name:
@@ -3,20 +3,152 @@ Web driver management for Chrome browser automation.
 Handles creating, configuring, and managing Chrome driver instances.
 """
 
+import os
 import time
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from typing import Optional
+from typing import Any, Optional, List, Callable, Dict
+
+
+# Counts listing rows (div#articleRow<N>) inside the article table
+ROW_COUNT_SCRIPT = (
+    "return Array.from(document.querySelectorAll('section#table [id^=\"articleRow\"]'))"
+    ".filter(function (el) { return /^articleRow\\d+$/.test(el.id); }).length;"
+)
+
+# Bytes transferred and load time of the current page, from the Resource Timing API.
+# Cross-origin resources without Timing-Allow-Origin report a transferSize of 0.
+PAGE_METRICS_SCRIPT = (
+    "var nav = performance.getEntriesByType('navigation')[0];"
+    "var resources = performance.getEntriesByType('resource');"
+    "var bytes = nav ? nav.transferSize : 0;"
+    "for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }"
+    "var end = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || performance.now()) : 0;"
+    "return {bytes: bytes, requests: resources.length + 1, load_ms: nav ? end - nav.startTime : 0};"
+)
+
+# URL patterns blocked by the lean scraping profile; only the article table DOM is needed
+BLOCKED_URL_PATTERNS = [
+    # Images
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Analytics, ads and other third-party scripts
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*adservice.google.*', '*facebook.net*',
+    '*hotjar.com*', '*clarity.ms*',
+]
+
+
+def wait_for_stable_rows(count_rows: Callable[[], int], timeout: float,
+                         quiet_period: float, poll_interval: float = 0.1) -> bool:
+    """
+    Wait until listing rows are present and their count stops changing.
+    
+    Args:
+        count_rows: Returns the current number of listing rows
+        timeout: Maximum seconds to wait
+        quiet_period: Seconds the row count must stay unchanged
+        poll_interval: Seconds between row counts
+        
+    Returns:
+        True if rows settled before the timeout, False otherwise
+    """
+    deadline = time.time() + timeout
+    last_count = -1
+    stable_since = time.time()
+    
+    while time.time() < deadline:
+        count = count_rows()
+        now = time.time()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif count > 0 and now - stable_since >= quiet_period:
+            return True
+        time.sleep(poll_interval)
+    
+    return False
 
 
 class WebDriverManager:
     """Manages Chrome WebDriver instances and browser interactions."""
     
-    def __init__(self):
+    READINESS_MODES = ('rows', 'fixed')
+    
+    def __init__(self, debugger_address: str = "127.0.0.1:9222"):
         self.driver = None
+        self.debugger_address = debugger_address
+        self.readiness = 'rows'
+        self.quiet_period = 0.5
+        self.last_wait_seconds = 0.0
+        self.last_wait_mode = ''
+        self.last_error = ''
+        self.blocked_patterns: List[str] = []
+        self.profile_dir: Optional[str] = None
+    
+    def configure_launch(self, profile_dir: str):
+        """
+        Launch and own a headless Chrome instead of attaching to a running one.
+        
+        Args:
+            profile_dir: User data directory for this instance's Chrome profile
+        """
+        self.profile_dir = profile_dir
+    
+    def copy_settings(self, other: 'WebDriverManager'):
+        """
+        Use the same readiness and resource blocking settings as another manager.
+        
+        Args:
+            other: Manager to copy settings from
+        """
+        self.configure_readiness(other.readiness, other.quiet_period)
+        self.configure_resource_blocking(other.blocked_patterns)
+    
+    def configure_resource_blocking(self, patterns: List[str]):
+        """
+        Block requests matching URL patterns in every tab of this driver.
+        
+        Uses the Chrome DevTools Protocol (Network.setBlockedURLs) through the
+        Selenium driver, so images, fonts and tracking scripts are never
+        downloaded. Patterns may use '*' wildcards.
+        
+        Args:
+            patterns: URL patterns to block (empty to block nothing)
+        """
+        self.blocked_patterns = list(patterns)
+        if self.driver:
+            self._apply_resource_blocking()
+    
+    def _apply_resource_blocking(self):
+        """Apply the blocked URL patterns to the current tab."""
+        if not self.blocked_patterns:
+            return
+        
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_patterns})
+        except Exception as e:
+            print(f"  ⚠️ Failed to enable resource blocking: {e}")
+    
+    def configure_readiness(self, readiness: str, quiet_period: float):
+        """
+        Choose how page readiness is detected after navigation.
+        
+        Args:
+            readiness: 'rows' to return once listing rows settle, 'fixed' to always sleep
+            quiet_period: Seconds the row count must stay unchanged in 'rows' mode
+        """
+        if readiness not in self.READINESS_MODES:
+            print(f"⚠️ Unknown readiness mode '{readiness}', using 'rows'")
+            readiness = 'rows'
+        self.readiness = readiness
+        self.quiet_period = quiet_period
     
     def create_driver(self) -> Optional[webdriver.Chrome]:
         """
@@ -27,11 +159,19 @@ class WebDriverManager:
         """
         try:
             chrome_options = Options()
-            chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+            if self.profile_dir:
+                chrome_options.add_argument("--headless=new")
+                chrome_options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+                chrome_options.add_argument("--window-size=1920,1080")
+                chrome_options.add_argument("--no-first-run")
+                chrome_options.add_argument("--no-default-browser-check")
+            else:
+                chrome_options.add_experimental_option("debuggerAddress", self.debugger_address)
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
             
             self.driver = webdriver.Chrome(options=chrome_options)
+            self._apply_resource_blocking()
             return self.driver
         except Exception as e:
             print(f"❌ Failed to create Chrome driver: {e}")
@@ -52,6 +192,7 @@ class WebDriverManager:
             print("❌ No driver available for navigation")
             return False
         
+        self.last_error = ''
         try:
             print(f"  📍 Navigating to: {url}")
             self.driver.get(url)
@@ -67,18 +208,24 @@ class WebDriverManager:
             
         except Exception as e:
             print(f"  ❌ Navigation failed: {e}")
+            self.last_error = f"{type(e).__name__}: {e}"
             return False
     
     def _wait_for_page_load(self, additional_wait: int) -> bool:
         """
         Wait for page to fully load.
         
+        In 'rows' readiness mode this returns as soon as the listing rows have
+        settled; the fixed sleep is only used when they never appear. The time
+        actually spent waiting is kept in last_wait_seconds.
+        
         Args:
             additional_wait: Additional wait time in seconds
             
         Returns:
             True if page loaded successfully
         """
+        start_time = time.time()
         try:
             # Wait for body element
             WebDriverWait(self.driver, 15).until(
@@ -90,15 +237,38 @@ class WebDriverManager:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "main.container"))
             )
             
-            # Additional wait for dynamic content
-            time.sleep(additional_wait + 1)
-            
+            self._wait_for_dynamic_content(
+                lambda: self.driver.execute_script(ROW_COUNT_SCRIPT), additional_wait + 1
+            )
+            self.last_wait_seconds = time.time() - start_time
             return True
             
         except Exception as e:
+            self.last_wait_seconds = time.time() - start_time
+            self.last_wait_mode = 'timeout'
             print(f"  ⚠️ Page load timeout: {e}")
             return False
     
+    def _wait_for_dynamic_content(self, count_rows: Callable[[], int], fixed_wait: float):
+        """
+        Wait for the article table to render, falling back to a fixed sleep.
+        
+        Args:
+            count_rows: Returns the current number of listing rows
+            fixed_wait: Seconds to sleep in 'fixed' mode, and the most 'rows' mode will wait
+        """
+        if self.readiness == 'rows':
+            if wait_for_stable_rows(count_rows, fixed_wait, self.quiet_period):
+                self.last_wait_mode = 'rows'
+            else:
+                # Rows never appeared (empty or slow page); the whole budget is spent
+                self.last_wait_mode = 'fallback'
+            return
+        
+        # Additional wait for dynamic content
+        time.sleep(fixed_wait)
+        self.last_wait_mode = 'fixed'
+    
     def get_page_source(self) -> str:
         """
         Get the current page's HTML source.
@@ -115,6 +285,41 @@ class WebDriverManager:
             print(f"  ❌ Failed to get page source: {e}")
             return ""
     
+    def get_page_metrics(self) -> Dict[str, float]:
+        """
+        Get bytes transferred and load time for the current page.
+        
+        Returns:
+            Dictionary with 'bytes', 'requests' and 'load_ms', zeros if failed
+        """
+        if not self.driver:
+            return {'bytes': 0, 'requests': 0, 'load_ms': 0}
+        
+        try:
+            return self.driver.execute_script(PAGE_METRICS_SCRIPT)
+        except Exception as e:
+            print(f"  ⚠️ Failed to read page metrics: {e}")
+            return {'bytes': 0, 'requests': 0, 'load_ms': 0}
+    
+    def run_script(self, script: str) -> Any:
+        """
+        Run JavaScript on the current page and return its result.
+        
+        Args:
+            script: Script body, as for execute_script
+            
+        Returns:
+            Script result, None if failed
+        """
+        if not self.driver:
+            return None
+        
+        try:
+            return self.driver.execute_script(script)
+        except Exception as e:
+            print(f"  ⚠️ Failed to run page script: {e}")
+            return None
+    
     def get_current_url(self) -> str:
         """
         Get the current page URL.
@@ -131,6 +336,82 @@ class WebDriverManager:
             print(f"  ❌ Failed to get current URL: {e}")
             return ""
     
+    def open_tabs(self, count: int) -> List[str]:
+        """
+        Make sure the browser has at least `count` tabs for parallel scraping.
+        
+        The currently active tab is always the first one returned.
+        
+        Args:
+            count: Number of tabs needed
+            
+        Returns:
+            List of window handles, empty if failed
+        """
+        if not self.driver:
+            print("❌ No driver available for opening tabs")
+            return []
+        
+        try:
+            handles = [self.driver.current_window_handle]
+            for _ in range(count - 1):
+                self.driver.switch_to.new_window('tab')
+                self._apply_resource_blocking()
+                handles.append(self.driver.current_window_handle)
+            self.driver.switch_to.window(handles[0])
+            return handles
+        except Exception as e:
+            print(f"❌ Failed to open browser tabs: {e}")
+            return []
+    
+    def close_tabs(self, handles: List[str]):
+        """
+        Close tabs previously opened with open_tabs, keeping the first one.
+        
+        Args:
+            handles: Window handles returned by open_tabs
+        """
+        if not self.driver or not handles:
+            return
+        
+        try:
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            print(f"  ⚠️ Error closing tabs: {e}")
+    
+    def is_alive(self) -> bool:
+        """
+        Check that the browser still answers.
+        
+        Returns:
+            True if the driver can run a script, False otherwise
+        """
+        if not self.driver:
+            return False
+        
+        try:
+            return self.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+    
+    def get_browser_pid(self) -> Optional[int]:
+        """
+        Get the process id of the chromedriver that owns a launched browser.
+        
+        Returns:
+            Process id, or None when attached to a browser started elsewhere
+        """
+        if not self.driver or not self.profile_dir:
+            return None
+        
+        try:
+            return self.driver.service.process.pid
+        except Exception:
+            return None
+    
     def close_driver(self):
         """Close the driver and clean up resources."""
         if self.driver:
@@ -150,3 +431,173 @@ class WebDriverManager:
         """
         current_url = self.get_current_url()
         return 'cardmarket.com' in current_url if current_url else False
+
+
+class TabSession:
+    """
+    A single browser tab of a shared WebDriverManager.
+    
+    Exposes the same navigation methods as WebDriverManager so scraping code
+    can use either. Every driver call is serialized through a lock shared by
+    all tabs of the same driver, but navigation itself does not block, so
+    several tabs can load pages at the same time.
+    """
+    
+    POLL_INTERVAL = 0.25
+    
+    def __init__(self, manager: WebDriverManager, handle: str, lock: threading.Lock):
+        self.manager = manager
+        self.handle = handle
+        self.lock = lock
+        self.last_wait_seconds = 0.0
+        self.last_wait_mode = ''
+        self.last_error = ''
+    
+    def _call(self, action):
+        """Run a driver action with this tab focused."""
+        with self.lock:
+            driver = self.manager.driver
+            if driver.current_window_handle != self.handle:
+                driver.switch_to.window(self.handle)
+            return action(driver)
+    
+    def navigate_to_url(self, url: str, wait_time: int = 3) -> bool:
+        """
+        Start loading a URL in this tab and wait for it to load.
+        
+        Args:
+            url: URL to navigate to
+            wait_time: Additional wait time after page load
+            
+        Returns:
+            True if navigation successful, False otherwise
+        """
+        if not self.manager.driver:
+            print("❌ No driver available for navigation")
+            return False
+        
+        self.last_error = ''
+        try:
+            print(f"  📍 Navigating to: {url}")
+            # Flag the old document so its container is not mistaken for the new one
+            self._call(lambda driver: driver.execute_script(
+                "window.__scraperStale = true; window.location.href = arguments[0];", url
+            ))
+            
+            success = self._wait_for_page_load(wait_time)
+            if success:
+                print(f"  ✅ Page loaded successfully")
+            else:
+                print(f"  ⚠️ Page load may be incomplete")
+            
+            return success
+            
+        except Exception as e:
+            print(f"  ❌ Navigation failed: {e}")
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+    
+    def _wait_for_page_load(self, additional_wait: int, timeout: int = 25) -> bool:
+        """
+        Poll this tab until the main container is present, then wait for the
+        article table using the shared manager's readiness mode.
+        
+        Args:
+            additional_wait: Additional wait time in seconds
+            timeout: Maximum seconds to wait for the container
+            
+        Returns:
+            True if page loaded successfully
+        """
+        start_time = time.time()
+        deadline = start_time + timeout
+        while time.time() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            ready = self._call(lambda driver: driver.execute_script(
+                "return !window.__scraperStale && document.readyState !== 'loading' && "
+                "document.querySelector('main.container') !== null;"
+            ))
+            if ready:
+                fixed_wait = additional_wait + 1
+                if self.manager.readiness == 'rows':
+                    settled = wait_for_stable_rows(
+                        lambda: self._call(lambda driver: driver.execute_script(ROW_COUNT_SCRIPT)),
+                        fixed_wait, self.manager.quiet_period, self.POLL_INTERVAL
+                    )
+                    self.last_wait_mode = 'rows' if settled else 'fallback'
+                else:
+                    # Additional wait for dynamic content
+                    time.sleep(fixed_wait)
+                    self.last_wait_mode = 'fixed'
+                self.last_wait_seconds = time.time() - start_time
+                return True
+        
+        self.last_wait_seconds = time.time() - start_time
+        self.last_wait_mode = 'timeout'
+        print(f"  ⚠️ Page load timeout after {timeout}s")
+        return False
+    
+    def get_page_source(self) -> str:
+        """
+        Get this tab's HTML source.
+        
+        Returns:
+            HTML source code as string, empty if failed
+        """
+        try:
+            return self._call(lambda driver: driver.page_source)
+        except Exception as e:
+            print(f"  ❌ Failed to get page source: {e}")
+            return ""
+    
+    def get_page_metrics(self) -> Dict[str, float]:
+        """
+        Get bytes transferred and load time for this tab's page.
+        
+        Returns:
+            Dictionary with 'bytes', 'requests' and 'load_ms', zeros if failed
+        """
+        try:
+            return self._call(lambda driver: driver.execute_script(PAGE_METRICS_SCRIPT))
+        except Exception as e:
+            print(f"  ⚠️ Failed to read page metrics: {e}")
+            return {'bytes': 0, 'requests': 0, 'load_ms': 0}
+    
+    def run_script(self, script: str) -> Any:
+        """
+        Run JavaScript on this tab's page and return its result.
+        
+        Args:
+            script: Script body, as for execute_script
+            
+        Returns:
+            Script result, None if failed
+        """
+        try:
+            return self._call(lambda driver: driver.execute_script(script))
+        except Exception as e:
+            print(f"  ⚠️ Failed to run page script: {e}")
+            return None
+    
+    def get_current_url(self) -> str:
+        """
+        Get this tab's current URL.
+        
+        Returns:
+            Current URL as string, empty if failed
+        """
+        try:
+            return self._call(lambda driver: driver.current_url)
+        except Exception as e:
+            print(f"  ❌ Failed to get current URL: {e}")
+            return ""
+    
+    def is_on_cardmarket(self) -> bool:
+        """
+        Check if this tab is on a CardMarket page.
+        
+        Returns:
+            True if on CardMarket, False otherwise
+        """
+        current_url = self.get_current_url()
+        return 'cardmarket.com' in current_url if current_url else False
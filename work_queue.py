@@ -0,0 +1,620 @@
+"""
+Durable work queue for spreading a scrape over several worker processes or machines.
+A coordinator adds one job per card page; workers claim jobs under a lease,
+fetch and parse the page, and hand the listings back through the queue.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from listing import listing_dicts
+
+try:
+    import redis
+except ImportError:
+    # Only needed for redis:// queues
+    redis = None
+
+
+class WorkQueue:
+    """
+    Base class for work queue backends.
+
+    Jobs move from 'pending' to 'leased' when a worker claims them. A worker
+    that finishes in time completes (or fails) its job; a lease that runs out
+    puts the job back to 'pending' for another worker until the run's
+    max_attempts are used up. Every finished job adds one entry to the run's
+    result log, which the coordinator reads with a cursor.
+
+    Delivery is at-least-once: a slow worker whose lease expired may finish a
+    page another worker also scrapes, so readers keep the first result per URL.
+    """
+
+    name = 'base'
+
+    def add_run(self, run_id: str, settings: Dict[str, Any], jobs: List[Dict[str, Any]],
+                lease_seconds: float = 120, max_attempts: int = 3) -> int:
+        """
+        Register a run and queue its jobs.
+
+        Args:
+            run_id: Unique id of the run
+            settings: Run-wide list settings the workers fetch with (fetcher, readiness, ...)
+            jobs: Jobs with 'url', 'card_name' and any extra payload (wait_time, ttl, card_config)
+            lease_seconds: How long a worker may hold a job
+            max_attempts: How often a job is tried before it counts as failed
+
+        Returns:
+            Number of jobs queued
+        """
+        raise NotImplementedError
+
+    def run_settings(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the settings a run was added with.
+
+        Args:
+            run_id: Run id
+
+        Returns:
+            Settings dictionary, None if the run is unknown
+        """
+        raise NotImplementedError
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest pending job, first returning expired leases to the queue.
+
+        Args:
+            worker_id: Id of the claiming worker
+
+        Returns:
+            Job with 'id', 'run_id', 'url', 'card_name', 'attempts', 'lease_seconds'
+            and its payload, None if nothing is pending
+        """
+        raise NotImplementedError
+
+    def expire_leases(self):
+        """
+        Return jobs whose lease ran out to the queue, or fail them when out of attempts.
+
+        claim() does this too; the coordinator calls it on every poll so jobs
+        of workers that died still finish (as failed) when no worker is left
+        to claim anything.
+        """
+        raise NotImplementedError
+
+    def renew(self, job: Dict[str, Any], worker_id: str) -> bool:
+        """
+        Extend a job's lease by another lease period.
+
+        Args:
+            job: Job returned by claim
+            worker_id: Id of the worker holding the lease
+
+        Returns:
+            True if the worker still holds the lease, False otherwise
+        """
+        raise NotImplementedError
+
+    def complete(self, job: Dict[str, Any], worker_id: str, listings: List[Dict[str, Any]]) -> bool:
+        """
+        Finish a job with its parsed listings.
+
+        Args:
+            job: Job returned by claim
+            worker_id: Id of the worker holding the lease
+            listings: Parsed listings of the page
+
+        Returns:
+            True if recorded, False if the lease was lost in the meantime
+        """
+        raise NotImplementedError
+
+    def fail(self, job: Dict[str, Any], worker_id: str, error: str) -> bool:
+        """
+        Give a job back after a failed attempt; it is retried until max_attempts.
+
+        Args:
+            job: Job returned by claim
+            worker_id: Id of the worker holding the lease
+            error: What went wrong
+
+        Returns:
+            True if recorded, False if the lease was lost in the meantime
+        """
+        raise NotImplementedError
+
+    def results(self, run_id: str, cursor: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read the run's finished jobs after a cursor.
+
+        Args:
+            run_id: Run id
+            cursor: Cursor returned by the previous call (0 to start)
+
+        Returns:
+            Tuple of (results with 'url', 'status' ('done' or 'failed'), 'listings',
+            'error' and 'worker'; cursor for the next call)
+        """
+        raise NotImplementedError
+
+    def delete_run(self, run_id: str):
+        """
+        Remove a run and everything queued for it.
+
+        Args:
+            run_id: Run id
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the connection to the backend."""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue in a SQLite database file.
+
+    Claims run in an immediate transaction, so any number of worker processes
+    on the machine (or on machines sharing the file over a filesystem with
+    working locks) never lease the same job twice.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            settings TEXT NOT NULL,
+            lease_seconds REAL NOT NULL,
+            max_attempts INTEGER NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            card_name TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_until REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            UNIQUE (run_id, url)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+        CREATE TABLE IF NOT EXISTS results (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL,
+            listings TEXT,
+            error TEXT,
+            worker TEXT,
+            finished_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_run ON results (run_id, seq);
+    """
+
+    def __init__(self, path: str = "work_queue.db"):
+        """
+        Args:
+            path: Database file (created if missing)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Autocommit mode, transactions are started explicitly where needed
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def add_run(self, run_id, settings, jobs, lease_seconds=120, max_attempts=3):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO runs (run_id, settings, lease_seconds, max_attempts, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, json.dumps(settings), lease_seconds, max_attempts, time.time()))
+            queued = 0
+            for job in jobs:
+                payload = {key: value for key, value in job.items() if key not in ('url', 'card_name')}
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO jobs (run_id, url, card_name, payload) VALUES (?, ?, ?, ?)",
+                    (run_id, job['url'], job['card_name'], json.dumps(payload)))
+                queued += cursor.rowcount
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return queued
+
+    def run_settings(self, run_id):
+        row = self.connection.execute("SELECT settings FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row['settings']) if row else None
+
+    def claim(self, worker_id):
+        connection = self.connection
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_leases(now)
+            row = connection.execute(
+                "SELECT jobs.*, runs.lease_seconds FROM jobs JOIN runs USING (run_id) "
+                "WHERE jobs.state = 'pending' ORDER BY jobs.id LIMIT 1").fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE id = ?", (worker_id, now + row['lease_seconds'], row['id']))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        job = json.loads(row['payload'])
+        job.update(id=row['id'], run_id=row['run_id'], url=row['url'], card_name=row['card_name'],
+                   attempts=row['attempts'] + 1, lease_seconds=row['lease_seconds'])
+        return job
+
+    def expire_leases(self):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_leases(time.time())
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _expire_leases(self, now: float):
+        """Return jobs whose lease ran out to the queue (inside a transaction)."""
+        expired = self.connection.execute(
+            "SELECT jobs.id, jobs.run_id, jobs.url, jobs.worker, jobs.attempts, runs.max_attempts "
+            "FROM jobs JOIN runs USING (run_id) "
+            "WHERE jobs.state = 'leased' AND jobs.lease_until < ?", (now,)).fetchall()
+        for row in expired:
+            if row['attempts'] >= row['max_attempts']:
+                self._finish(row['id'], row['run_id'], row['url'], 'failed', None,
+                             "lease expired", row['worker'])
+            else:
+                self.connection.execute(
+                    "UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL, "
+                    "error = 'lease expired' WHERE id = ?", (row['id'],))
+
+    def _finish(self, job_id: int, run_id: str, url: str, status: str,
+                listings: Optional[List[Dict[str, Any]]], error: str, worker_id: str):
+        """Mark a job finished and append it to the run's result log (inside a transaction)."""
+        self.connection.execute(
+            "UPDATE jobs SET state = ?, lease_until = NULL, error = ? WHERE id = ?",
+            (status, error, job_id))
+        self.connection.execute(
+            "INSERT INTO results (run_id, url, status, listings, error, worker, finished_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, url, status, json.dumps(listing_dicts(listings)) if listings is not None else None,
+             error, worker_id, time.time()))
+
+    def _holds_lease(self, job: Dict[str, Any], worker_id: str) -> Optional[sqlite3.Row]:
+        """Get the job's row if the worker still holds its lease (inside a transaction)."""
+        row = self.connection.execute(
+            "SELECT jobs.*, runs.max_attempts FROM jobs JOIN runs USING (run_id) WHERE jobs.id = ?",
+            (job['id'],)).fetchone()
+        if row is None or row['state'] != 'leased' or row['worker'] != worker_id:
+            return None
+        return row
+
+    def renew(self, job, worker_id):
+        cursor = self.connection.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+            (time.time() + job['lease_seconds'], job['id'], worker_id))
+        return cursor.rowcount == 1
+
+    def complete(self, job, worker_id, listings):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._holds_lease(job, worker_id)
+            if row is not None:
+                self._finish(row['id'], row['run_id'], row['url'], 'done', listings, None, worker_id)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def fail(self, job, worker_id, error):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._holds_lease(job, worker_id)
+            if row is not None and row['attempts'] >= row['max_attempts']:
+                self._finish(row['id'], row['run_id'], row['url'], 'failed', None, error, worker_id)
+            elif row is not None:
+                connection.execute(
+                    "UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL, error = ? "
+                    "WHERE id = ?", (error, row['id']))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def results(self, run_id, cursor=0):
+        rows = self.connection.execute(
+            "SELECT * FROM results WHERE run_id = ? AND seq > ? ORDER BY seq", (run_id, cursor)).fetchall()
+        results = [{
+            'url': row['url'],
+            'status': row['status'],
+            'listings': json.loads(row['listings']) if row['listings'] else [],
+            'error': row['error'] or '',
+            'worker': row['worker'] or '',
+        } for row in rows]
+        return results, rows[-1]['seq'] if rows else cursor
+
+    def delete_run(self, run_id):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        for table in ('results', 'jobs', 'runs'):
+            connection.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        connection.execute("COMMIT")
+
+    def close(self):
+        self.connection.close()
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Work queue on a Redis-compatible server, for workers on several machines.
+
+    Uses only plain list, hash, set and sorted set commands plus
+    WATCH/MULTI transactions (no scripting), so any Redis-compatible server
+    can serve it. Pending job ids sit in one list, leases in a sorted set
+    scored by expiry. Every change of a job's state (claim, expiry, renewal,
+    completion) is one transaction on the watched job, so a worker dying
+    half way leaves the job where it was, and of several clients racing for
+    the same job only one succeeds.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", prefix: str = "cardmarket"):
+        """
+        Args:
+            url: Server URL (redis://host:port/db)
+            prefix: Prefix for every key used by the queue
+        """
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def _key(self, *parts: Any) -> str:
+        """Build a key under the queue's prefix."""
+        return ':'.join([self.prefix, *(str(part) for part in parts)])
+
+    def add_run(self, run_id, settings, jobs, lease_seconds=120, max_attempts=3):
+        self.client.hset(self._key('run', run_id), mapping={
+            'settings': json.dumps(settings),
+            'lease_seconds': lease_seconds,
+            'max_attempts': max_attempts,
+        })
+        queued = 0
+        for job in jobs:
+            job_id = self.client.incr(self._key('next_job_id'))
+            if not self.client.hsetnx(self._key('urls', run_id), job['url'], job_id):
+                continue
+            payload = {key: value for key, value in job.items() if key not in ('url', 'card_name')}
+            with self.client.pipeline() as pipe:
+                # The job is only visible once both its hash and its pending entry exist
+                pipe.hset(self._key('job', job_id), mapping={
+                    'run_id': run_id, 'url': job['url'], 'card_name': job['card_name'],
+                    'payload': json.dumps(payload), 'state': 'pending', 'worker': '', 'attempts': 0,
+                })
+                pipe.rpush(self._key('pending'), job_id)
+                pipe.execute()
+            queued += 1
+        return queued
+
+    def run_settings(self, run_id):
+        settings = self.client.hget(self._key('run', run_id), 'settings')
+        return json.loads(settings) if settings else None
+
+    def _run_limits(self, run_id: str) -> Tuple[float, int]:
+        """Get a run's lease length and attempt limit."""
+        lease_seconds, max_attempts = self.client.hmget(self._key('run', run_id),
+                                                        'lease_seconds', 'max_attempts')
+        return float(lease_seconds or 120), int(max_attempts or 3)
+
+    def claim(self, worker_id):
+        now = time.time()
+        self._expire_leases(now)
+
+        pending = self._key('pending')
+        while True:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(pending)
+                    job_id = pipe.lindex(pending, 0)
+                    if job_id is None:
+                        return None
+                    key = self._key('job', job_id)
+                    pipe.watch(key)
+                    fields = pipe.hgetall(key)
+                    if fields.get('state') != 'pending':
+                        # Left over from a deleted run
+                        pipe.multi()
+                        pipe.lpop(pending)
+                        pipe.execute()
+                        continue
+
+                    lease_seconds, _ = self._run_limits(fields['run_id'])
+                    attempts = int(fields.get('attempts', 0)) + 1
+                    pipe.multi()
+                    pipe.lpop(pending)
+                    pipe.hset(key, mapping={'state': 'leased', 'worker': worker_id,
+                                            'lease_until': now + lease_seconds, 'attempts': attempts})
+                    pipe.zadd(self._key('leases'), {job_id: now + lease_seconds})
+                    pipe.execute()
+                except redis.WatchError:
+                    # Another worker took the head of the queue first
+                    continue
+
+            job = json.loads(fields['payload'])
+            job.update(id=job_id, run_id=fields['run_id'], url=fields['url'], card_name=fields['card_name'],
+                       attempts=attempts, lease_seconds=lease_seconds)
+            return job
+
+    def _update_job(self, job_id: str, update: Callable[[Dict[str, str], Any], bool]) -> Optional[Dict[str, str]]:
+        """
+        Change a job in one transaction.
+
+        The job's hash is watched while its fields are read; update(fields, pipe)
+        then queues the changes on the transaction. If another client changed
+        the job in the meantime, nothing is applied.
+
+        Args:
+            job_id: Job id
+            update: Queues the changes and returns True, or returns False to leave the job alone
+
+        Returns:
+            The job's fields as read if the changes were applied, None otherwise
+        """
+        key = self._key('job', job_id)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                fields = pipe.hgetall(key)
+                pipe.multi()
+                if not update(fields, pipe):
+                    return None
+                pipe.execute()
+                return fields
+            except redis.WatchError:
+                return None
+
+    def expire_leases(self):
+        self._expire_leases(time.time())
+
+    def _expire_leases(self, now: float):
+        """Return jobs whose lease ran out to the queue, or fail them when out of attempts."""
+        def expire(job_id, fields, pipe):
+            if fields.get('state') != 'leased':
+                # Stale lease of a finished or deleted job
+                pipe.zrem(self._key('leases'), job_id)
+                return True
+            if float(fields.get('lease_until') or 0) >= now:
+                # Renewed since the lease entry was read
+                return False
+            pipe.zrem(self._key('leases'), job_id)
+            _, max_attempts = self._run_limits(fields['run_id'])
+            if int(fields.get('attempts', 0)) >= max_attempts:
+                self._finish(pipe, job_id, fields, 'failed', None, "lease expired", fields.get('worker', ''))
+            else:
+                pipe.hset(self._key('job', job_id), mapping={
+                    'state': 'pending', 'worker': '', 'error': "lease expired"})
+                pipe.rpush(self._key('pending'), job_id)
+            return True
+
+        for job_id in self.client.zrangebyscore(self._key('leases'), '-inf', now):
+            # Of several clients expiring the same lease, only one transaction goes through
+            self._update_job(job_id, lambda fields, pipe: expire(job_id, fields, pipe))
+
+    def _finish(self, pipe: Any, job_id: str, fields: Dict[str, str], status: str,
+                listings: Optional[List[Dict[str, Any]]], error: str, worker_id: str):
+        """Mark a job finished and append it to the run's result log (queued on a transaction)."""
+        pipe.hset(self._key('job', job_id), mapping={'state': status, 'error': error or ''})
+        pipe.rpush(self._key('results', fields['run_id']), json.dumps({
+            'url': fields['url'], 'status': status, 'listings': listing_dicts(listings) or [],
+            'error': error or '', 'worker': worker_id,
+        }))
+
+    def _holds_lease(self, fields: Dict[str, str], worker_id: str) -> bool:
+        """Check whether the worker holds the lease of a job with these fields."""
+        return fields.get('state') == 'leased' and fields.get('worker') == worker_id
+
+    def renew(self, job, worker_id):
+        lease_until = time.time() + job['lease_seconds']
+
+        def extend(fields, pipe):
+            if not self._holds_lease(fields, worker_id):
+                return False
+            pipe.hset(self._key('job', job['id']), 'lease_until', lease_until)
+            pipe.zadd(self._key('leases'), {job['id']: lease_until})
+            return True
+
+        return self._update_job(job['id'], extend) is not None
+
+    def complete(self, job, worker_id, listings):
+        def finish(fields, pipe):
+            if not self._holds_lease(fields, worker_id):
+                return False
+            pipe.zrem(self._key('leases'), job['id'])
+            self._finish(pipe, job['id'], fields, 'done', listings, '', worker_id)
+            return True
+
+        return self._update_job(job['id'], finish) is not None
+
+    def fail(self, job, worker_id, error):
+        def give_back(fields, pipe):
+            if not self._holds_lease(fields, worker_id):
+                return False
+            pipe.zrem(self._key('leases'), job['id'])
+            _, max_attempts = self._run_limits(fields['run_id'])
+            if int(fields.get('attempts', 0)) >= max_attempts:
+                self._finish(pipe, job['id'], fields, 'failed', None, error, worker_id)
+            else:
+                pipe.hset(self._key('job', job['id']), mapping={
+                    'state': 'pending', 'worker': '', 'error': error})
+                pipe.rpush(self._key('pending'), job['id'])
+            return True
+
+        return self._update_job(job['id'], give_back) is not None
+
+    def results(self, run_id, cursor=0):
+        entries = self.client.lrange(self._key('results', run_id), cursor, -1)
+        return [json.loads(entry) for entry in entries], cursor + len(entries)
+
+    def delete_run(self, run_id):
+        job_ids = self.client.hvals(self._key('urls', run_id))
+        for job_id in job_ids:
+            self.client.zrem(self._key('leases'), job_id)
+        keys = [self._key('job', job_id) for job_id in job_ids]
+        keys += [self._key('run', run_id), self._key('urls', run_id), self._key('results', run_id)]
+        self.client.delete(*keys)
+
+    def close(self):
+        self.client.close()
+
+
+def open_work_queue(url: str) -> Optional[WorkQueue]:
+    """
+    Open the work queue a URL points to.
+
+    Args:
+        url: sqlite:///path/to/queue.db (relative path) or sqlite:////absolute/path.db,
+            or redis://host:port/db
+
+    Returns:
+        WorkQueue instance, None if the URL is not supported or the backend is unavailable
+    """
+    try:
+        if url.startswith('sqlite:///'):
+            return SQLiteWorkQueue(url[len('sqlite:///'):])
+        if url.startswith(('redis://', 'rediss://')):
+            if redis is None:
+                print("❌ redis:// work queues need the redis package (pip install redis)")
+                return None
+            work_queue = RedisWorkQueue(url)
+            work_queue.client.ping()
+            return work_queue
+    except Exception as e:
+        print(f"❌ Could not open work queue {url}: {e}")
+        return None
+
+    print(f"❌ Unsupported work queue URL: {url} (use sqlite:///file.db or redis://host:port/db)")
+    return None